@@ -0,0 +1,300 @@
+# fakes.py
+"""
+Offline stand-ins for everything the pipeline normally reaches over the
+network: arXiv RSS (feedparser), Google Scholar (scholarly), the Semantic
+Scholar Graph API and the OpenAI chat completions endpoint. Data is generated deterministically from a seed
+so benchmark runs are comparable between commits.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+import json, random, threading, time, zlib
+from unittest import mock
+
+from feedparser import FeedParserDict
+
+WORDS = ("learning graph model optimal transport routing supply chain neural "
+         "stochastic policy agent planning inference robust scalable convex "
+         "language vision benchmark dataset sparse attention").split()
+
+
+# Synthetic papers and feeds
+def synthetic_papers(n: int, seed: int = 0, start: Optional[datetime] = None,
+                     category: str = "cs.AI", author_pool: int = 5000) -> Iterator[Dict]:
+    """Yield n paper dicts in the format add_or_update_paper expects"""
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 1)
+    for i in range(n):
+        yield {
+            'id': f"oai:arXiv.org:{2500 + i // 100000}.{i % 100000:05d}v1",
+            'title': ' '.join(rng.choices(WORDS, k=8)).title(),
+            'authors': [f"Author {rng.randrange(author_pool)}" for _ in range(rng.randint(1, 8))],
+            'abstract': ' '.join(rng.choices(WORDS, k=rng.randint(120, 250))),
+            'updated': (start + timedelta(minutes=i)).isoformat(),
+            'category': category
+        }
+
+
+def synthetic_feed(n: int, seed: int = 0, start: Optional[datetime] = None,
+                   category: str = "cs.AI") -> FeedParserDict:
+    """A FeedParserDict shaped like feedparser.parse() output for an arXiv RSS feed"""
+    entries = []
+    for paper in synthetic_papers(n, seed, start, category):
+        parsed = datetime.fromisoformat(paper['updated']).timetuple()
+        entries.append(FeedParserDict(
+            id=paper['id'],
+            title=paper['title'],
+            summary=paper['abstract'],
+            # arXiv lists the whole lineup in one dc:creator
+            authors=[FeedParserDict(name=', '.join(paper['authors']))],
+            published_parsed=parsed,
+            updated_parsed=parsed,
+        ))
+    return FeedParserDict(entries=entries, feed=FeedParserDict(title=f"{category} updates"))
+
+
+@contextmanager
+def fake_feedparser(feeds: Dict[str, FeedParserDict]):
+    """Patch feedparser.parse to serve the given feeds by category (URL suffix)"""
+    def parse(url, *args, **kwargs):
+        return feeds.get(url.rstrip('/').rsplit('/', 1)[-1], FeedParserDict(entries=[]))
+    with mock.patch('feedparser.parse', parse):
+        yield
+
+
+def populate_db(db, n: int, seed: int = 0, batch_size: int = 10000):
+    """Bulk-load n synthetic papers straight into SQLite (much faster than add_or_update_paper)"""
+    import sqlite3
+    with sqlite3.connect(db.db_path) as conn:
+        papers = synthetic_papers(n, seed)
+        while True:
+            batch = [p for _, p in zip(range(batch_size), papers)]
+            if not batch:
+                break
+            conn.executemany('''
+                INSERT INTO papers (arxiv_id, title, abstract, arxiv_timestamp, category)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(p['id'], p['title'], p['abstract'],
+                   p['updated'].replace('T', ' '), p['category']) for p in batch])
+            conn.executemany('''
+                INSERT OR IGNORE INTO authors (paper_id, name)
+                SELECT local_id, ? FROM papers WHERE arxiv_id = ?
+            ''', [(a, p['id']) for p in batch for a in p['authors']])
+        conn.commit()
+
+
+# Google Scholar
+class FakeAuthor:
+    def __init__(self, name: str):
+        h = zlib.crc32(name.encode())
+        self.name = name
+        self.hindex = h % 80
+        self.citedby = self.hindex * (50 + h % 200)
+        self.affiliation = ("Google Research", "Stanford University",
+                            "MIT", "Institute of Science")[h % 4]
+
+    def fill(self):
+        return self
+
+
+class FakeScholarly:
+    """Replacement for the scholarly module object with optional latency"""
+
+    def __init__(self, latency: float = 0.0, miss_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.miss_rate = miss_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def search_author(self, name: str):
+        with self._lock:
+            self.calls += 1
+            miss = self._rng.random() < self.miss_rate
+        if self.latency:
+            time.sleep(self.latency)
+        return iter(() if miss else (FakeAuthor(name),))
+
+    def use_proxy(self, *args, **kwargs):
+        return True
+
+
+@contextmanager
+def fake_scholar(latency: float = 0.0, miss_rate: float = 0.0, semantic_scholar: bool = False):
+    """
+    Patch the evaluator to use FakeScholarly: no proxy discovery, no rate
+    limit sleeps. Yields the fake so callers can inspect call counts.
+    Semantic Scholar stays out of the source chain unless semantic_scholar
+    is set (pair it with FakeSemanticScholarServer).
+    """
+    from src.arxiv import author_lineup_evaluator as module
+    fake = FakeScholarly(latency, miss_rate)
+    sources = module.DEFAULT_AUTHOR_SOURCES if semantic_scholar else ('google_scholar',)
+    with mock.patch.object(module, 'scholarly', fake), \
+         mock.patch.object(module, 'DEFAULT_AUTHOR_SOURCES', sources), \
+         mock.patch.object(module, 'ProxyGenerator', mock.MagicMock()), \
+         mock.patch.object(module.AuthorLineupEvaluator, '_init_proxy', lambda self: None), \
+         mock.patch.object(module.AuthorLineupEvaluator, '_enforce_rate_limit', lambda self: None):
+        yield fake
+
+
+# Semantic Scholar
+class _PaperBatchHandler(BaseHTTPRequestHandler):
+    papers: Dict[str, List[str]] = {}
+    requests: List[List[str]] = []
+    latency = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        ids = json.loads(self.rfile.read(length) or b'{}').get('ids', [])
+        self.requests.append(ids)
+        if self.latency:
+            time.sleep(self.latency)
+        results = []
+        for paper_id in ids:
+            names = self.papers.get(paper_id)
+            if names is None:
+                results.append(None)
+                continue
+            authors = []
+            for name in names:
+                author = FakeAuthor(name)
+                authors.append({'authorId': str(zlib.crc32(name.encode())), 'name': name,
+                                'hIndex': author.hindex, 'citationCount': author.citedby,
+                                'affiliations': [author.affiliation]})
+            results.append({'paperId': paper_id, 'authors': authors})
+        body = json.dumps(results).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeSemanticScholarServer:
+    """
+    Local stand-in for POST /graph/v1/paper/batch. papers maps arxiv_id to
+    author names; papers not listed come back as null (unknown to S2).
+    Author metrics match FakeAuthor, so both sources agree.
+    """
+
+    def __init__(self, papers: Dict[str, List[str]], latency: float = 0.0):
+        from src.arxiv.semantic_scholar import s2_paper_id
+        handler = type('Handler', (_PaperBatchHandler,), {
+            'papers': {s2_paper_id(arxiv_id): names for arxiv_id, names in papers.items()},
+            'requests': [],
+            'latency': latency
+        })
+        self.requests = handler.requests
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/graph/v1"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# OpenAI
+class _CompletionsHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    tail_latency = 0.0
+    tail_every = 0
+    chunk_latency = 0.0
+    requests: List[Dict] = []
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        number = len(self.requests)
+        self.requests.append(request)
+        # Every tail_every-th request (starting with the first) is a slow outlier
+        slow = self.tail_every and number % self.tail_every == 0
+        delay = self.tail_latency if slow else self.latency
+        if delay:
+            time.sleep(delay)
+        content = ("Overall relevance: 7/10\n1. Importance: 7/10\n2. Authors: 6/10\n"
+                   "3. OR relevance: 8/10\n4. User interests: 7/10")
+        if request.get('stream'):
+            self._stream(request, content)
+            return
+        body = json.dumps({
+            'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': int(time.time()),
+            'model': request.get('model', 'fake'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2}
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, request: Dict, content: str):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        pieces = [line + '\n' for line in content.split('\n')]
+        try:
+            for i, piece in enumerate(pieces + [None]):
+                if i and self.chunk_latency:
+                    time.sleep(self.chunk_latency)
+                chunk = {'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk',
+                         'created': int(time.time()), 'model': request.get('model', 'fake'),
+                         'choices': [{'index': 0,
+                                      'delta': {'content': piece} if piece else {},
+                                      'finish_reason': None if piece else 'stop'}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # client stopped reading (deadline or lost hedge)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeOpenAIServer:
+    """
+    Local HTTP server answering /v1/chat/completions with a fixed assessment,
+    streamed when the request asks for it. tail_every/tail_latency make every
+    n-th request a slow outlier; chunk_latency paces streamed chunks.
+    """
+
+    def __init__(self, latency: float = 0.0, tail_latency: float = 0.0, tail_every: int = 0,
+                 chunk_latency: float = 0.0):
+        handler = type('Handler', (_CompletionsHandler,), {
+            'latency': latency, 'tail_latency': tail_latency, 'tail_every': tail_every,
+            'chunk_latency': chunk_latency, 'requests': []
+        })
+        self.requests = handler.requests
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextmanager
+def fake_openai(latency: float = 0.0, **server_options):
+    """Start FakeOpenAIServer and point the assessor at it"""
+    from src.llm import assessor
+    with FakeOpenAIServer(latency, **server_options) as server, \
+         mock.patch.object(assessor, 'OPENAI_BASE_URL', server.base_url), \
+         mock.patch.object(assessor, 'OPENAI_KEY', 'sk-fake'):
+        yield server
@@ -0,0 +1,201 @@
+# run_benchmarks.py
+"""
+Offline benchmark suite. Everything runs against a temporary database and
+the fakes in benchmarks/fakes.py, so results depend only on the code and
+the machine.
+
+    python -m benchmarks.run_benchmarks --scale 10000 --out bench.json
+    python -m benchmarks.run_benchmarks --scale 10000 --compare bench.json
+"""
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+import argparse, json, logging, os, platform, shutil, sqlite3, statistics, subprocess, sys, tempfile, time
+
+from benchmarks.fakes import (
+    FakeSemanticScholarServer, fake_feedparser, fake_openai, fake_scholar, populate_db,
+    synthetic_feed
+)
+from src.arxiv.author_lineup_evaluator import AuthorLineupEvaluator
+from src.arxiv.paper_database import PaperDatabase
+
+
+def _timed(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict:
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        'runs': repeat,
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'max': max(times)
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(scale: int, repeat: int, eval_papers: int, fetch_papers: int,
+        workdir: str, only: Optional[List[str]] = None) -> Dict:
+    """Run every benchmark and return the machine-readable result document"""
+    results: Dict[str, Dict] = {}
+    base_db = os.path.join(workdir, 'base.db')
+    started = time.perf_counter()
+    populate_db(PaperDatabase(base_db), scale)
+    populate_seconds = time.perf_counter() - started
+    # fresh_db() copies only the main file, so fold the WAL into it first
+    with sqlite3.connect(base_db) as conn:
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def fresh_db(name: str) -> PaperDatabase:
+        path = os.path.join(workdir, f'{name}.db')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        shutil.copy(base_db, path)
+        return PaperDatabase(path)
+
+    def wanted(name: str) -> bool:
+        return not only or name in only
+
+    # Ingest: a feed of fetch_papers new entries on top of the populated DB
+    if wanted('fetch_and_store'):
+        feed = synthetic_feed(fetch_papers, seed=1, category='cs.AI',
+                              start=datetime(2030, 1, 1))
+        state = {}
+        with fake_feedparser({'cs.AI': feed}):
+            results['fetch_and_store'] = _timed(
+                lambda: state['db']._fetch_and_store_papers(days=7, limit=fetch_papers),
+                repeat, setup=lambda: state.update(db=fresh_db('ingest'))
+            )
+        results['fetch_and_store']['papers'] = fetch_papers
+
+    db = fresh_db('read')
+
+    if wanted('get_unevaluated_papers'):
+        results['get_unevaluated_papers'] = _timed(lambda: db.get_unevaluated_papers(100), repeat)
+
+    if wanted('get_stats'):
+        results['get_stats'] = _timed(db.get_stats, repeat)
+
+    if wanted('iter_papers'):
+        results['iter_papers'] = _timed(lambda: sum(1 for _ in db.iter_papers()), repeat)
+
+    if wanted('batch_evaluate'):
+        papers = db.get_author_evaluation_queue(eval_papers)
+        with fake_scholar():
+            # New evaluator per run so the metrics cache starts cold
+            results['batch_evaluate'] = _timed(
+                lambda: AuthorLineupEvaluator().batch_evaluate(papers), repeat)
+        results['batch_evaluate']['papers'] = len(papers)
+
+    if wanted('batch_evaluate_s2'):
+        papers = db.get_author_evaluation_queue(eval_papers)
+        # Semantic Scholar knows 90% of the papers; the rest go to Scholar
+        known = {p.arxiv_id: p.authors for i, p in enumerate(papers) if i % 10}
+        with FakeSemanticScholarServer(known) as server, fake_scholar(semantic_scholar=True):
+            from src.arxiv.semantic_scholar import SemanticScholarClient
+            results['batch_evaluate_s2'] = _timed(lambda: AuthorLineupEvaluator(
+                semantic_scholar=SemanticScholarClient(server.base_url, min_interval=0)
+            ).batch_evaluate(papers), repeat)
+        results['batch_evaluate_s2']['papers'] = len(papers)
+
+    if wanted('assess_paper_openai'):
+        paper = db.get_llm_evaluation_queue(1)[0]
+        with fake_openai():
+            from src.llm.assessor import assess_paper_openai
+            results['assess_paper_openai'] = _timed(lambda: assess_paper_openai(
+                {'title': paper.title, 'authors': paper.authors, 'summary': paper.abstract},
+                'optimization'), repeat)
+
+    if wanted('assess_paper_openai_hedged'):
+        # Every third request is a 1s outlier; hedging past p90 caps it near the median
+        paper = db.get_llm_evaluation_queue(1)[0]
+        with fake_openai(latency=0.05, tail_latency=1.0, tail_every=3):
+            from src.llm import assessor
+            tracker = assessor.LatencyTracker()
+            for _ in range(tracker.min_samples):
+                tracker.record(assessor.OPENAI_MODEL_ID, 0.05)
+            with mock.patch.object(assessor, 'latency', tracker):
+                results['assess_paper_openai_hedged'] = _timed(lambda: assessor.assess_paper_openai(
+                    {'title': paper.title, 'authors': paper.authors, 'summary': paper.abstract},
+                    'optimization', hedge_percentile=90), repeat)
+
+    for fmt in ('xlsx', 'csv', 'parquet'):
+        name = 'to_excel' if fmt == 'xlsx' else f'export_{fmt}'
+        if not wanted(name):
+            continue
+        path = os.path.join(workdir, f'export.{fmt}')
+        try:
+            results[name] = _timed(lambda: db.export(path, fmt=fmt), repeat)
+        except ImportError as e:
+            results[name] = {'skipped': str(e)}
+
+    return {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'populate_seconds': populate_seconds,
+        'results': results
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """Lines comparing median times against a previous result file"""
+    lines = [f"{'benchmark':<24} {'baseline':>10} {'current':>10} {'ratio':>7}"]
+    for name, result in current['results'].items():
+        old = baseline.get('results', {}).get(name, {})
+        if 'median' not in result or 'median' not in old:
+            continue
+        ratio = result['median'] / old['median'] if old['median'] else float('inf')
+        flag = '  <-- slower' if ratio > 1.2 else ''
+        lines.append(f"{name:<24} {old['median']:>10.4f} {result['median']:>10.4f} {ratio:>7.2f}{flag}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline performance benchmarks")
+    parser.add_argument('--scale', type=int, default=1000, help="Papers in the synthetic database")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark")
+    parser.add_argument('--eval-papers', type=int, default=200, help="Papers passed to batch_evaluate")
+    parser.add_argument('--fetch-papers', type=int, default=500, help="Entries in the synthetic feed")
+    parser.add_argument('--only', nargs='+', help="Run only these benchmarks")
+    parser.add_argument('--out', help="Write results JSON here")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--keep', action='store_true', help="Keep the temporary work directory")
+    args = parser.parse_args(argv)
+    # Per-author INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+
+    workdir = tempfile.mkdtemp(prefix='arxiv-bench-')
+    try:
+        document = run(args.scale, args.repeat, args.eval_papers, args.fetch_papers,
+                       workdir, args.only)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(document, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output)
+    print(output)
+    if args.compare:
+        with open(args.compare) as f:
+            print('\n'.join(compare(document, json.load(f))), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,87 +1,147 @@
-from src.arxiv.paper_database import PaperDatabase
-from src.arxiv.author_lineup_evaluator import AuthorLineupEvaluator
-from src.llm.assessor import assess_papers
-from src.llm.test_api import check_api_health
-import os, time
+from src.arxiv.paper_database import PaperDatabase, ARXIV_CATEGORY
+from src.pipeline.runner import (
+    PipelineConfig, PipelineRunner, StageSettings, STAGES, build_author_evaluator, print_report
+)
+from src.utils.metrics import metrics
+import argparse, os
 
 
-def main():
-    #check_api_health() # Activate this to ensure OpenAPI is healthy before using LLM agent
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch, evaluate and export arXiv papers")
+    parser.add_argument("--db", default="research_papers.db", help="SQLite database path")
+    parser.add_argument("--categories", nargs="+", default=[ARXIV_CATEGORY],
+                        help="arXiv categories to fetch (e.g. cs.AI cs.LG)")
+    parser.add_argument("--days", type=int, default=7, help="Look-back window on first run")
+    parser.add_argument("--limit", type=int, default=1000, help="Max new papers per category")
+    parser.add_argument("--no-author-eval", action="store_true", help="Skip author lineup evaluation")
+    parser.add_argument("--llm", action="store_true", help="Run LLM assessment on new papers")
+    parser.add_argument("--llm-timeout", type=float,
+                        help="Deadline per LLM assessment in seconds (default LLM_TIMEOUT or 60)")
+    parser.add_argument("--llm-hedge-percentile", type=float,
+                        help="Send a duplicate LLM request once one is slower than this latency "
+                             "percentile of recent requests, e.g. 95 (0 disables)")
+    parser.add_argument("--export", default="research_papers.xlsx",
+                        help="Export path (.xlsx, .csv or .parquet); empty to skip")
+    parser.add_argument("--delta-export", action="store_true",
+                        help="Only export papers changed since the previous export")
+    parser.add_argument("--archive-days", type=int, metavar="N",
+                        help="After each run, compress abstracts and explanations of papers "
+                             "older than N days and return the freed pages")
+    parser.add_argument("--archive-codec", choices=("zlib", "zstd"), default="zlib",
+                        help="Compression for archived text (zstd needs zstandard)")
+    parser.add_argument("--workers", action="append", default=[], metavar="STAGE=N",
+                        help=f"Worker threads per stage, repeatable (stages: {', '.join(STAGES)})")
+    parser.add_argument("--queue-size", type=int, default=100, help="Capacity of each stage queue")
+    parser.add_argument("--backlog", type=int, default=200, metavar="N",
+                        help="Also evaluate up to N stored papers still waiting for author "
+                             "lookup or LLM assessment (0 = new papers only)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Stay resident and poll around arXiv announcement times")
+    parser.add_argument("--status-file", default="daemon_status.json",
+                        help="Health/status JSON written by the daemon")
+    parser.add_argument("--near-interval", type=float, default=5,
+                        help="Daemon poll interval near announcements (minutes)")
+    parser.add_argument("--far-interval", type=float, default=180,
+                        help="Daemon poll interval away from announcements (minutes)")
+    parser.add_argument("--metrics-json", help="Write timing/counter metrics as JSON here")
+    parser.add_argument("--metrics-prom",
+                        help="Write metrics in Prometheus textfile format here (node_exporter)")
+    parser.add_argument("--coauthor-graph", action="store_true",
+                        help="Estimate authors without metrics from their co-authors "
+                             "before falling back to Google Scholar (needs scipy)")
+    parser.add_argument("--refine-authors", type=int, default=0, metavar="N",
+                        help="Afterwards, re-evaluate up to N provisional lineup scores")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="Profile each stage (cProfile, stack samples, allocations) into DIR")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="Serve a read-only JSON API (search, top, authors, stats) on "
+                             "localhost:PORT; alongside --daemon it runs next to ingestion")
+    parser.add_argument("--stats", action="store_true", help="Print database statistics and exit")
+    parser.add_argument("--check-api", action="store_true", help="Check OpenAI API health first")
+    return parser.parse_args(argv)
 
-    db = PaperDatabase("research_papers.db")
-    print(f"Using database at: {os.path.abspath(db.db_path)}")
-    fetch_result  = PaperDatabase.fetch_from_arxiv("research_papers.db", days=7, limit=1000)
-    print("\n=== arXiv Fetch Report ===")
-    print(f"Database contains {fetch_result['stats'].get('total_papers', 0)} papers")
-    print(f"Last paper timestamp: {fetch_result['latest_timestamp']}")   
-    if fetch_result['status'] == 'up_to_date':
-        print("No new papers found - you're up-to-date!")
-    elif fetch_result['status'] == 'new_papers':
-        print(f"Added {fetch_result['new_papers_count']} new papers to database")
 
-    # Test with known author
-    # ===== TEMPORARY TEST CODE =====
-    print("\n=== Running Author Evaluation Test ===")
-    evaluator = AuthorLineupEvaluator()
-    
-    test_cases = [
-        ("Yann LeCun"),
-        ("Andrew Ng")
-    ]
-    
-    for author in test_cases:
-        print(f"\nTesting {author}:")
-        result = evaluator.get_author_metrics(author)
-        print(f"Results: {result}")
-        time.sleep(34)  # Be extra careful during tests
-    
-    # ===== END TEMPORARY TEST CODE =====
+def build_config(args) -> PipelineConfig:
+    workers = {}
+    for spec in args.workers:
+        stage, _, count = spec.partition("=")
+        if stage not in STAGES or not count.isdigit():
+            raise SystemExit(f"Invalid --workers value '{spec}', expected STAGE=N with STAGE in {STAGES}")
+        workers[stage] = int(count)
+    return PipelineConfig(
+        categories=args.categories,
+        days=args.days,
+        limit=args.limit,
+        author_eval=not args.no_author_eval,
+        llm_assess=args.llm,
+        llm_timeout=args.llm_timeout,
+        llm_hedge_percentile=args.llm_hedge_percentile,
+        export_path=args.export or None,
+        delta_export=args.delta_export,
+        coauthor_graph=args.coauthor_graph,
+        archive_after_days=args.archive_days,
+        archive_codec=args.archive_codec,
+        backlog=args.backlog,
+        stages={stage: StageSettings(workers=workers.get(stage, 1), queue_size=args.queue_size)
+                for stage in STAGES}
+    )
+
 
-    exit(0)
-    
-    # Evaluate papers
-    print("\n=== Author Lineup Evaluation ===")
-    unevaluated = db.get_unevaluated_papers()
-    updated_papers, stats = evaluator.batch_evaluate(unevaluated)
-    for paper in updated_papers:
-        db.update_author_evaluation(
-            arxiv_id=paper.arxiv_id,
-            score=paper.author_lineup_score,
-            metrics=paper.author_metrics
-        )
-    evaluator.print_stats(stats)
-    
-    db.to_excel("research_papers.xlsx")
-    print("\nExported papers to research_papers.xlsx")
+def main(argv=None):
+    args = parse_args(argv)
+    config = build_config(args)
+    if args.profile and args.daemon:
+        raise SystemExit("--profile captures a single run and cannot be combined with --daemon")
+    if args.metrics_json or args.metrics_prom:
+        metrics.enable()
+    if args.check_api:
+        from src.llm.test_api import check_api_health
+        check_api_health()
+
+    db = PaperDatabase(args.db)
+    print(f"Using database at: {os.path.abspath(db.db_path)}")
 
+    if args.stats:
+        stats = db.get_stats()
+        print("\n=== Database Statistics ===")
+        for key, value in stats.items():
+            print(f"{key}: {value}")
+        return
 
+    if args.serve is not None:
+        from src.arxiv.query_service import QueryService
+        service = QueryService(db, port=args.serve)
+        if not args.daemon:
+            print(f"Serving read-only API on http://127.0.0.1:{args.serve}/ (Ctrl-C to stop)")
+            service.serve_forever()
+            return
+        service.start()
 
-    #assessment = assess_papers(papers)
-    #print("\n--- Assessment Result ---")
-    #print(assessment)
-    db = PaperDatabase("research_papers.db")
-    report = PaperDatabase.fetch_from_arxiv("research_papers.db", days=7, limit=1000)
-    print(f"Fetched {report['new']} new papers out of {report['fetched']} available")
-    
-    unevaluated = db.get_unevaluated_papers(limit=5)
-    for paper in unevaluated:
-        # Evaluation logic...
-        db.update_user_evaluation(paper.arxiv_id, score, explanation)
-    # Get papers for human evaluation
-    unevaluated = db.get_unevaluated_papers(limit=5)
-    for paper in unevaluated:
-        print(f"\nPaper: {paper.title}")
-        print(f"Abstract: {paper.abstract[:200]}...")
-        # Present to user for evaluation...
-        
-        # Store evaluation
-        db.update_user_evaluation(
-            arxiv_id=paper.arxiv_id,
-            score=8.5,
-            explanation="Highly relevant to our research focus"
-        )
+    if args.daemon:
+        from datetime import timedelta
+        from src.pipeline.daemon import AnnouncementSchedule, PaperDaemon
+        schedule = AnnouncementSchedule(near_interval=timedelta(minutes=args.near_interval),
+                                        far_interval=timedelta(minutes=args.far_interval))
+        PaperDaemon(args.db, config, status_path=args.status_file, schedule=schedule,
+                    metrics_paths=(args.metrics_json, args.metrics_prom)).serve_forever()
+        return
 
+    try:
+        profiler = None
+        if args.profile:
+            from src.utils.profiling import PipelineProfiler
+            profiler = PipelineProfiler(args.profile)
+        report = PipelineRunner(db, config, profiler=profiler).run()
+    finally:
+        metrics.write_files(args.metrics_json, args.metrics_prom)
+    print_report(report)
+    if args.refine_authors:
+        from src.arxiv.evaluation_worker import refine_author_evaluations
+        stats = refine_author_evaluations(db, build_author_evaluator(db, config),
+                                          limit=args.refine_authors)
+        print(f"Refined {stats['refined']} of {stats['total_evaluated']} provisional lineup scores")
+    print(f"Database contains {db.get_stats().get('total_papers', 0)} papers")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,12 +1,48 @@
 from __future__ import annotations
-from typing import List, Dict, Optional, Tuple, DefaultDict
-import time, random, logging
-import numpy as np
-from collections import Counter, defaultdict
-from scholarly import scholarly, ProxyGenerator
+from typing import TYPE_CHECKING, Any, Callable, List, Dict, Optional, Tuple
+import os, time, random, logging, statistics, threading
+from collections import OrderedDict, defaultdict
+from src.arxiv.proxy_pool import ProxyEndpoint, ProxyPool
+from src.arxiv.semantic_scholar import SemanticScholarClient, normalize_name
+from src.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from src.arxiv.paper_database import PaperRecord
+
+# scholarly pulls in selenium, httpx and fake_useragent; it is imported on
+# the first actual lookup (see _load_scholarly) so that fetch-only and
+# stats-only runs never pay for it
+scholarly = None
+ProxyGenerator = None
+# scholarly keeps its sessions and proxy settings in module globals: one
+# lookup (proxy choice, search, fill) at a time, across threads and evaluators
+_scholar_lock = threading.Lock()
+
+# Metric sources in priority order: Semantic Scholar answers a whole batch
+# of papers in one request; the co-author graph (when one is configured)
+# estimates authors from their resolved co-authors; Google Scholar is
+# scraped per author for what is left
+DEFAULT_AUTHOR_SOURCES = ('semantic_scholar', 'coauthor_graph', 'google_scholar')
+
+# Sources of author metrics that are not an answer from a bibliographic
+# source: they lower a lineup's coverage (so it is refined later) and are
+# not reused by later evaluations. Estimates still enter the score.
+ESTIMATED_SOURCES = ('Coauthor Graph',)
+UNRESOLVED_SOURCES = ('Fallback', 'Pending') + ESTIMATED_SOURCES
+
+
+def _load_scholarly():
+    global scholarly, ProxyGenerator
+    if scholarly is None:
+        from scholarly import scholarly as _scholarly, ProxyGenerator as _ProxyGenerator
+        scholarly, ProxyGenerator = _scholarly, _ProxyGenerator
 
 class AuthorLineupEvaluator:
-    def __init__(self, google_scholar_enabled: bool = True):
+    def __init__(self, google_scholar_enabled: bool = True, proxies: Optional[List[str]] = None,
+                 sources: Optional[List[str]] = None,
+                 semantic_scholar: Optional[SemanticScholarClient] = None,
+                 coauthor_graph=None, graph_min_confidence: float = 0.25,
+                 metrics_cache_size: int = 10000, metrics_cache_ttl: float = 7 * 86400):
         # Configure logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -24,85 +60,228 @@ class AuthorLineupEvaluator:
             }
         }
         self._google_scholar_enabled = google_scholar_enabled
+        self._sources = [source for source in (sources or DEFAULT_AUTHOR_SOURCES)
+                         if source != 'google_scholar' or google_scholar_enabled]
+        self._semantic_scholar = semantic_scholar
+        self._coauthor_graph = coauthor_graph   # CoauthorGraph, see src/arxiv/coauthor_graph.py
+        self._graph_min_confidence = graph_min_confidence
+        # arxiv_id -> normalized author name -> metrics, filled by prefetch_papers()
+        self._paper_authors: Dict[str, Dict[str, Dict]] = {}
         
         # Rate limiting
         self._last_request_time = 0
+        self._rate_lock = threading.Lock()
         self._base_delay = random.uniform(30, 60)  # 30-60 second base delay
         self._current_delay = self._base_delay
         
         # Retry configuration
         self._max_retries = 3
         self._timeout = 30  # seconds
+
+        # Resolved author metrics, so a long-running process does not look up
+        # the same author again: least recently used entries beyond
+        # metrics_cache_size are dropped, and entries expire after
+        # metrics_cache_ttl seconds so h-indexes are refreshed now and then
+        self._metrics_cache: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._metrics_cache_size = metrics_cache_size
+        self._metrics_cache_ttl = metrics_cache_ttl
+        self._cache_lock = threading.Lock()
         
-        # Proxy initialization
-        self._init_proxy()
+        # Proxy setup (Tor probe, free-proxy sweep) waits for the first lookup.
+        # Explicit proxy URLs (or comma-separated SCHOLAR_PROXIES) are tried
+        # before Tor, free proxies and a direct connection.
+        if proxies is None:
+            proxies = [p.strip() for p in os.getenv('SCHOLAR_PROXIES', '').split(',') if p.strip()]
+        self._proxy_urls = proxies
+        self._proxy_pool: Optional[ProxyPool] = None
+        self._proxy_ready = False
+        self._proxy_lock = threading.Lock()
 
-    
-        """Initialize proxy with automatic fallback"""
-        try:
-            pg = ProxyGenerator()
-            success = pg.FreeProxies()
-            if success:
-                scholarly.use_proxy(pg)
-                self.logger.info("Using free proxies")
-            else:
-                scholarly.use_proxy(None)
-                self.logger.warning("Failed to get free proxies, continuing without")
-        except Exception as e:
-            scholarly.use_proxy(None)
-            self.logger.error(f"Proxy initialization failed: {str(e)}")
+    def _ensure_proxy(self):
+        """Import scholarly and configure the proxy once, on first use"""
+        if self._proxy_ready:
+            return
+        with self._proxy_lock:
+            if not self._proxy_ready:
+                _load_scholarly()
+                self._init_proxy()
+                self._proxy_ready = True
 
     def _init_proxy(self):
-        """Initialize proxy with improved error handling"""
-        try:
-            # Try to use Tor or free proxies first
+        """Build the proxy pool; endpoints are only set up when first routed to"""
+        self._proxy_pool = ProxyPool(self._proxy_endpoints(), activate=self._activate_proxy)
+
+    @staticmethod
+    def _activate_proxy(generator):
+        # Same generator for both of scholarly's sessions: with no secondary it
+        # builds a FreeProxies one and sends every citations? URL (search and
+        # fill) through that instead of the endpoint the pool chose
+        scholarly.use_proxy(generator, generator)
+
+    def _proxy_endpoints(self) -> List[ProxyEndpoint]:
+        def single(url):
+            def configure():
+                pg = ProxyGenerator()
+                if not pg.SingleProxy(http=url, https=url):
+                    raise RuntimeError(f"proxy {url} does not work")
+                return pg
+            return configure
+
+        def tor():
             pg = ProxyGenerator()
-            
-            # Attempt 1: Try Tor if available
-            try:
-                pg.Tor_External(tor_sock_port=9050, tor_control_port=9051)
-                scholarly.use_proxy(pg)
-                self.logger.info("Using Tor proxy")
-                return
-            except Exception as tor_error:
-                self.logger.warning(f"Tor proxy failed: {str(tor_error)}")
-            
-            # Attempt 2: Try free proxies with timeout
-            try:
-                pg.FreeProxies(timeout=5)  # Shorter timeout for free proxies
-                scholarly.use_proxy(pg)
-                self.logger.info("Using free proxies")
-                return
-            except Exception as free_proxy_error:
-                self.logger.warning(f"Free proxies failed: {str(free_proxy_error)}")
-            
-            # Fallback to no proxy
-            scholarly.use_proxy(None)
-            self.logger.warning("Continuing without proxy")
-            
-        except Exception as e:
-            scholarly.use_proxy(None)
-            self.logger.error(f"Proxy initialization completely failed: {str(e)}")
-            self.logger.warning("Continuing without proxy")
+            result = pg.Tor_External(tor_sock_port=9050, tor_control_port=9051,
+                                     tor_password=os.getenv('TOR_PASSWORD'))
+            if not result.get('proxy_works'):
+                raise RuntimeError("Tor proxy not reachable on port 9050")
+            return pg
+
+        def free_proxies():
+            pg = ProxyGenerator()
+            if not pg.FreeProxies(timeout=5):  # Shorter timeout for free proxies
+                raise RuntimeError("no working free proxies")
+            return pg
+
+        endpoints = [ProxyEndpoint(f"proxy:{url}", single(url)) for url in self._proxy_urls]
+        # use_proxy(None) would keep the previous proxy; an unconfigured
+        # ProxyGenerator is a plain connection
+        endpoints += [ProxyEndpoint('tor', tor), ProxyEndpoint('free', free_proxies),
+                      ProxyEndpoint('direct', lambda: ProxyGenerator())]
+        return endpoints
+
+    def proxy_stats(self) -> List[Dict]:
+        """Per-proxy health, healthiest first (empty before the first lookup)"""
+        return self._proxy_pool.stats() if self._proxy_pool is not None else []
 
     def _enforce_rate_limit(self):
         """Ensure we stay within rate limits"""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._current_delay:
-            wait_time = self._current_delay - elapsed
+        # Reserve the next slot under the lock and sleep outside it, so
+        # concurrent author workers queue up one delay apart
+        with self._rate_lock:
+            now = time.time()
+            wait_time = max(0.0, self._last_request_time + self._current_delay - now)
+            self._last_request_time = now + wait_time
+        if wait_time > 0:
             self.logger.info(f"Rate limiting: Waiting {wait_time:.1f}s")
+            metrics.observe('rate_limit_sleep_seconds', wait_time, source='scholar')
             time.sleep(wait_time)
-        self._last_request_time = time.time()
 
-    def get_author_metrics(self, author_name: str) -> Dict:
-        """Get author metrics with retries and fallbacks"""
+    def get_author_metrics(self, author_name: str, arxiv_id: Optional[str] = None,
+                           estimate: bool = True) -> Dict:
+        """
+        Get author metrics from the first source that knows the author.
+        Semantic Scholar data is matched through the paper (see
+        prefetch_papers), so pass arxiv_id when the author comes from one.
+        estimate=False skips co-author graph estimates (to refine one).
+        """
+        known = self._local_author_metrics(author_name, arxiv_id, estimate)
+        if known is not None:
+            return known
+        if 'google_scholar' not in self._sources:
+            metrics.inc('author_fallbacks')
+            return self._get_fallback_metrics(author_name)
+        result = self._lookup_author_metrics(author_name)
+        if result.get('source') != 'Fallback':
+            self._cache_metrics(author_name, result)
+            metrics.inc('author_source_hits', source='google_scholar')
+        else:
+            metrics.inc('author_fallbacks')
+        return result
+
+    def _local_author_metrics(self, author_name: str, arxiv_id: Optional[str] = None,
+                              estimate: bool = True) -> Optional[Dict]:
+        """Metrics available without a Scholar scrape (prefetched, cached or estimated), else None"""
+        if arxiv_id is not None and 'semantic_scholar' in self._sources:
+            found = self._paper_authors.get(arxiv_id, {}).get(normalize_name(author_name))
+            if found is not None:
+                metrics.inc('author_source_hits', source='semantic_scholar')
+                return found
+        cached = self._cached_metrics(author_name)
+        if cached is not None:
+            metrics.inc('author_cache_hits')
+            return cached
+        if estimate and self._coauthor_graph is not None and 'coauthor_graph' in self._sources:
+            estimated = self._coauthor_graph.estimate(author_name, self._graph_min_confidence)
+            if estimated is not None:
+                metrics.inc('author_source_hits', source='coauthor_graph')
+                return estimated
+        return None
+
+    def _cached_metrics(self, author_name: str) -> Optional[Dict]:
+        with self._cache_lock:
+            entry = self._metrics_cache.get(author_name)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self._metrics_cache_ttl:
+                del self._metrics_cache[author_name]
+                return None
+            self._metrics_cache.move_to_end(author_name)
+            return result
+
+    def _cache_metrics(self, author_name: str, result: Dict):
+        with self._cache_lock:
+            self._metrics_cache[author_name] = (time.monotonic(), result)
+            self._metrics_cache.move_to_end(author_name)
+            while len(self._metrics_cache) > self._metrics_cache_size:
+                self._metrics_cache.popitem(last=False)
+
+    def prefetch_papers(self, papers: List['PaperRecord']):
+        """Resolve the authors of many papers with batched Semantic Scholar requests"""
+        if 'semantic_scholar' not in self._sources:
+            return
+        pending = [p for p in papers if p.authors and p.arxiv_id not in self._paper_authors]
+        if not pending:
+            return
+        if self._semantic_scholar is None:
+            self._semantic_scholar = SemanticScholarClient()
+        with metrics.span('semantic_scholar_batch', papers=len(pending)):
+            found = self._semantic_scholar.paper_authors(p.arxiv_id for p in pending)
+        for paper in pending:
+            s2_authors = found.get(paper.arxiv_id, [])
+            resolved = {normalize_name(a['name']): self._semantic_scholar_metrics(a)
+                        for a in s2_authors if a.get('name') and a.get('hIndex') is not None}
+            if len(s2_authors) == len(paper.authors):
+                # Same lineup length: also match by position (transliterations, initials)
+                for name, author in zip(paper.authors, s2_authors):
+                    if author.get('hIndex') is not None:
+                        resolved.setdefault(normalize_name(name), self._semantic_scholar_metrics(author))
+            self._paper_authors[paper.arxiv_id] = resolved
+
+    def _semantic_scholar_metrics(self, author: Dict) -> Dict:
+        affiliation = ', '.join(author.get('affiliations') or [])
+        return {
+            "h_index": author['hIndex'],
+            "citations": author.get('citationCount') or 0,
+            "affiliation": affiliation,
+            "is_industry": self._is_industry_affiliation(affiliation),
+            "source": "Semantic Scholar"
+        }
+
+    def _lookup_author_metrics(self, author_name: str) -> Dict:
+        """Query Google Scholar with retries"""
+        self._ensure_proxy()
         for attempt in range(self._max_retries):
+            endpoint = None
             try:
                 self._enforce_rate_limit()
-                
-                self.logger.info(f"Attempt {attempt+1} for {author_name}")
-                search_query = scholarly.search_author(author_name)
-                author = next(search_query).fill()
+                with _scholar_lock:
+                    # Route each attempt to the healthiest proxy, so a retry
+                    # after a block goes out through a different one
+                    if self._proxy_pool is not None:
+                        endpoint = self._proxy_pool.acquire()
+
+                    self.logger.info(f"Attempt {attempt+1} for {author_name}")
+                    started = time.monotonic()
+                    with metrics.span('scholar_lookup') as span:
+                        search_query = scholarly.search_author(author_name)
+                        try:
+                            author = next(search_query).fill()
+                        except StopIteration:
+                            span.set(outcome='not_found')
+                            raise
+                        span.set(outcome='found')
+                if endpoint is not None:
+                    self._proxy_pool.record_success(endpoint, time.monotonic() - started)
                 
                 return {
                     "h_index": author.hindex,
@@ -113,42 +292,52 @@ class AuthorLineupEvaluator:
                 }
                 
             except StopIteration:
+                # An empty result is a valid answer: the proxy got through
+                if endpoint is not None:
+                    self._proxy_pool.record_success(endpoint, time.monotonic() - started)
                 self.logger.warning(f"No profile found for {author_name}")
-                return self._get_fallback_metrics(author_name)
+                return self._get_not_found_metrics(author_name)
             except Exception as e:
+                if endpoint is not None:
+                    self._proxy_pool.record_failure(endpoint, e)
                 self.logger.error(f"Attempt {attempt+1} failed: {str(e)}")
                 if attempt == self._max_retries - 1:
                     return self._get_fallback_metrics(author_name)
                 
                 # Exponential backoff
-                self._current_delay = min(600, self._current_delay * 2)
+                metrics.inc('scholar_retries')
+                with self._rate_lock:
+                    self._current_delay = min(600, self._current_delay * 2)
                 time.sleep(5 * (attempt + 1))
 
         return self._get_fallback_metrics(author_name)
 
-    def _get_semantic_scholar_data(self, author_name: str, paper_title: str) -> Dict:
-        """Get data from Semantic Scholar API"""
-        try:
-            # Placeholder for Semantic Scholar API implementation
-            # You would implement actual API calls here
-            return {}
-        except Exception as e:
-            self.logger.error(f"Semantic Scholar failed: {str(e)}")
-            return {}
-
     def _is_industry_affiliation(self, affiliation: str) -> bool:
         """Determine if affiliation is industry (vs academic)"""
         if not affiliation:
             return False
         return not any(x in affiliation.lower() for x in ['university', 'college', 'institute'])
 
-    def _get_fallback_metrics(self, author_name: str) -> Dict:
-        """Provide fallback metrics when all sources fail"""
+    def _get_not_found_metrics(self, author_name: str) -> Dict:
+        """A real answer: Scholar has no profile for this author (h-index 0)"""
         return {
             "h_index": 0,
             "citations": 0,
             "affiliation": "",
             "is_industry": False,
+            "source": "Not Found"
+        }
+
+    def _get_fallback_metrics(self, author_name: str) -> Dict:
+        """
+        Placeholder when every source failed. Metrics are unknown (None), not
+        zero: lineup scoring leaves the author out and lowers coverage.
+        """
+        return {
+            "h_index": None,
+            "citations": None,
+            "affiliation": "",
+            "is_industry": None,
             "source": "Fallback"
         }
 
@@ -166,9 +355,6 @@ class AuthorLineupEvaluator:
         if len(scores) == 1:
             return 0.7  # Single-author papers get decent but not max score
         
-        # Count how many authors are in each tier
-        tier_counts = Counter(scores)
-        
         # Ideal case: 1 prestigious + a few junior authors
         has_prestige = any(s >= self.config['prestige_threshold'] for s in scores)
         num_junior = sum(1 for s in scores if s <= 3)
@@ -179,7 +365,7 @@ class AuthorLineupEvaluator:
             return 0.8
         else:
             # No prestigious authors - score based on average
-            return np.mean(scores) / 10
+            return statistics.fmean(scores) / 10 if scores else 0.0
 
     def _calculate_industry_score(self, author_metrics: List[Dict]) -> float:
         """Calculate score based on industry participation"""
@@ -202,41 +388,124 @@ class AuthorLineupEvaluator:
                      (team_size - self.config['ideal_team_size']) / 
                      (self.config['max_team_size'] - self.config['ideal_team_size']))
 
-    def _calculate_composite_score(self, author_scores: Dict, author_metrics: List) -> float:
-        """Combine all component scores into final 0-1 score"""
-        components = {
+    def _calculate_components(self, author_scores: Dict, author_metrics: List,
+                              team_size: Optional[int] = None) -> Dict[str, float]:
+        """Component scores; team_size defaults to the number of scored authors"""
+        return {
             'prestige': self._calculate_prestige_score(author_scores),
             'balance': self._calculate_balance_score(author_scores),
             'industry': self._calculate_industry_score(author_metrics),
-            'size_penalty': self._calculate_size_penalty(len(author_scores))
+            'size_penalty': self._calculate_size_penalty(
+                len(author_scores) if team_size is None else team_size)
         }
-        
+
+    def _calculate_composite_score(self, author_scores: Dict, author_metrics: List,
+                                   team_size: Optional[int] = None) -> float:
+        """Combine all component scores into final 0-1 score"""
+        components = self._calculate_components(author_scores, author_metrics, team_size)
         return sum(components[k] * self.config['weights'][k] for k in components)
 
-    def _evaluate_lineup(self, title: str, authors: List[str]) -> Dict:
-        """Evaluate an author lineup and return composite score"""
-        author_metrics = [self.get_author_metrics(a) for a in authors]
-        author_scores = {a: m.get('h_index', 0) for a, m in zip(authors, author_metrics)}
-        
+    def _evaluate_lineup(self, title: str, authors: List[str], arxiv_id: Optional[str] = None,
+                         previous: Optional[Dict[str, Dict]] = None, remote: bool = True) -> Dict:
+        """
+        Evaluate an author lineup and return composite score. Only resolved
+        and estimated authors enter the components; 'coverage' is the
+        fraction resolved by a real source. With remote=False no Scholar
+        lookups are made, giving a provisional score from prefetched, cached,
+        estimated and previous results. An author estimated by an earlier
+        evaluation is looked up for real this time.
+        """
+        author_metrics: Dict[str, Optional[Dict]] = {}
+        for author in authors:
+            found = self._previous_author_metrics(previous, author)
+            if found is None:
+                was_estimated = ((previous or {}).get(author) or {}).get('source') in ESTIMATED_SOURCES
+                found = (self.get_author_metrics(author, arxiv_id, estimate=not was_estimated)
+                         if remote else self._local_author_metrics(author, arxiv_id))
+            author_metrics[author] = found
+        return self._score_lineup(author_metrics, len(authors))
+
+    @staticmethod
+    def _previous_author_metrics(previous: Optional[Dict[str, Dict]], author: str) -> Optional[Dict]:
+        """Reuse an author resolved by an earlier (provisional) evaluation"""
+        details = (previous or {}).get(author)
+        if not details or details.get('source') in (None,) + UNRESOLVED_SOURCES:
+            return None
+        return dict(details, affiliation='')
+
+    def _score_lineup(self, author_metrics: Dict[str, Optional[Dict]], team_size: int) -> Dict:
+        """Score the resolved part of a lineup; None entries are still pending"""
+        resolved = {a: m for a, m in author_metrics.items()
+                    if m is not None and m.get('source') != 'Fallback'}
+        measured = [m for m in resolved.values() if m.get('source') not in ESTIMATED_SOURCES]
+        author_scores = {a: m.get('h_index') or 0 for a, m in resolved.items()}
+        details = {
+            a: (self._author_details(m) if m is not None else
+                {'h_index': None, 'citations': None, 'is_industry': None, 'source': 'Pending'})
+            for a, m in author_metrics.items()
+        }
+        coverage = len(measured) / len(author_metrics) if author_metrics else 1.0
+        if not resolved:
+            return {'score': None, 'coverage': 0.0, 'author_scores': {},
+                    'authors': details, 'components': None}
+
+        components = self._calculate_components(author_scores, list(resolved.values()), team_size)
+        score = sum(components[k] * self.config['weights'][k] for k in components)
         return {
-            'score': min(1.0, max(0.0, self._calculate_composite_score(author_scores, author_metrics))),
+            'score': min(1.0, max(0.0, score)),
+            'coverage': round(coverage, 4),
             'author_scores': author_scores,
-            'components': {
-                'prestige': self._calculate_prestige_score(author_scores),
-                'balance': self._calculate_balance_score(author_scores),
-                'industry': self._calculate_industry_score(author_metrics),
-                'size_penalty': self._calculate_size_penalty(len(authors))
-            }
+            'authors': details,
+            'components': components
         }
 
-    def batch_evaluate(self, papers: List['PaperRecord']) -> Tuple[List['PaperRecord'], dict]:
+    @staticmethod
+    def _author_details(found: Dict) -> Dict:
+        """Per-author part of the stored author_metrics"""
+        details = {k: found.get(k) for k in ('h_index', 'citations', 'is_industry', 'source')}
+        if 'confidence' in found:   # co-author graph estimates
+            details['confidence'] = found['confidence']
+        return details
+
+    def batch_evaluate(self, papers: List['PaperRecord'],
+                       on_progress: Optional[Callable[['PaperRecord'], Any]] = None
+                       ) -> Tuple[List['PaperRecord'], dict]:
+        """
+        Score the lineups of papers. Authors resolved by an earlier
+        evaluation (see author_metrics['authors']) are reused, so running
+        this on the refinement queue only looks up the missing ones.
+
+        With on_progress, every paper first gets a provisional score from
+        the authors known without a Scholar scrape; on_progress(paper) is
+        called with it before the slow lookups start, so callers can store
+        it right away.
+        """
         stats = {
             'total_evaluated': 0,
             'papers_by_score': defaultdict(int),
             'processing_times': [],
-            'errors': 0
+            'errors': 0,
+            'partial': 0,        # scored with some authors still unresolved
+            'unresolved': 0      # no author could be resolved, left unscored
         }
         updated_papers = []
+        self.prefetch_papers(papers)
+        if self._coauthor_graph is not None and 'coauthor_graph' in self._sources:
+            self._coauthor_graph.update()
+
+        if on_progress is not None:
+            for paper in papers:
+                if not paper.authors:
+                    continue
+                try:
+                    result = self._evaluate_lineup(paper.title, paper.authors, paper.arxiv_id,
+                                                   self._previous_details(paper), remote=False)
+                    if result['score'] is not None and result['coverage'] < 1:
+                        self._apply_result(paper, result)
+                        on_progress(paper)
+                except Exception as e:
+                    self.logger.error(f"Provisional score for {getattr(paper, 'arxiv_id', 'unknown')} "
+                                      f"failed: {str(e)}")
         
         for paper in papers:
             try:
@@ -247,17 +516,19 @@ class AuthorLineupEvaluator:
                     continue
                     
                 start_time = time.time()
-                result = self._evaluate_lineup(paper.title, paper.authors)
-                
-                paper.author_lineup_score = result['score']
-                paper.author_metrics = {
-                    'author_scores': result['author_scores'],
-                    'components': result['components']
-                }
+                result = self._evaluate_lineup(paper.title, paper.authors, paper.arxiv_id,
+                                               self._previous_details(paper))
+                self._paper_authors.pop(paper.arxiv_id, None)
+                self._apply_result(paper, result)
                 
                 stats['total_evaluated'] += 1
                 stats['processing_times'].append(time.time() - start_time)
-                stats['papers_by_score'][round(result['score'], 1)] += 1
+                metrics.observe('author_evaluation_seconds', stats['processing_times'][-1])
+                if result['score'] is None:
+                    stats['unresolved'] += 1
+                else:
+                    stats['partial'] += int(result['coverage'] < 1)
+                    stats['papers_by_score'][round(result['score'], 1)] += 1
                 updated_papers.append(paper)
                 
             except Exception as e:
@@ -266,12 +537,28 @@ class AuthorLineupEvaluator:
                 continue
                 
         if stats['processing_times']:
-            stats['avg_processing_time'] = np.mean(stats['processing_times'])
+            stats['avg_processing_time'] = statistics.fmean(stats['processing_times'])
         else:
             stats['avg_processing_time'] = 0
+        stats['proxies'] = self.proxy_stats()
             
         return updated_papers, stats
 
+    @staticmethod
+    def _previous_details(paper: 'PaperRecord') -> Optional[Dict[str, Dict]]:
+        previous = getattr(paper, 'author_metrics', None)
+        return previous.get('authors') if isinstance(previous, dict) else None
+
+    @staticmethod
+    def _apply_result(paper: 'PaperRecord', result: Dict):
+        paper.author_lineup_score = result['score']
+        paper.author_metrics = {
+            'author_scores': result['author_scores'],
+            'authors': result['authors'],
+            'components': result['components'],
+            'coverage': result['coverage']
+        }
+
     @staticmethod
     def print_stats(stats: dict):
         """Print evaluation statistics"""
@@ -280,8 +567,20 @@ class AuthorLineupEvaluator:
         if 'avg_processing_time' in stats:
             print(f"Average processing time: {stats['avg_processing_time']:.2f}s per paper")
         print(f"Errors encountered: {stats['errors']}")
+        if stats.get('partial') or stats.get('unresolved'):
+            print(f"Partially resolved lineups: {stats.get('partial', 0)} "
+                  f"(unscored: {stats.get('unresolved', 0)})")
         
         if stats.get('papers_by_score'):
             print("\nScore Distribution:")
             for score, count in sorted(stats['papers_by_score'].items()):
-                print(f"  {score:.1f}: {count} papers")
\ No newline at end of file
+                print(f"  {score:.1f}: {count} papers")
+
+        if stats.get('proxies'):
+            print("\nProxies:")
+            print(f"  {'name':<24} {'ok':>5} {'fail':>5} {'rate':>6} {'latency':>8} {'quarantined':>12}")
+            for proxy in stats['proxies']:
+                latency = f"{proxy['avg_latency']:.2f}s" if proxy['avg_latency'] is not None else '-'
+                marker = ' *' if proxy['active'] else ''
+                print(f"  {proxy['name']:<24} {proxy['successes']:>5} {proxy['failures']:>5} "
+                      f"{proxy['success_rate']:>6.2f} {latency:>8} {proxy['quarantined_for']:>11.0f}s{marker}")
\ No newline at end of file
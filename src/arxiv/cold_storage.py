@@ -0,0 +1,91 @@
+# cold_storage.py
+"""
+Compressed cold tier for the text of old papers.
+
+Archived values are stored as BLOBs in their usual column: one codec byte
+followed by the compressed UTF-8 text. Hot values stay TEXT, so typeof()
+tells the tiers apart and reading a hot row costs nothing extra. Python
+readers pass values through decompress_text(); SQL readers call the
+cold_text() function installed by register_functions().
+"""
+from typing import Any, Callable, Dict, List, Optional
+import sqlite3, threading, zlib
+
+# Text columns moved to the cold tier. author_metrics stays JSON text: its
+# generated columns and indexes read it with json_extract().
+COLD_FIELDS = ('abstract', 'llm_explanation', 'user_explanation')
+
+CODECS = {'zlib': 1, 'zstd': 2}
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 19   # archival: slow once, decompression speed is unaffected
+
+_local = threading.local()
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd cold storage requires zstandard (pip install zstandard)") from e
+    return zstandard
+
+
+def available_codecs() -> List[str]:
+    """Codecs usable in this environment"""
+    try:
+        _zstandard()
+        return list(CODECS)
+    except ImportError:
+        return ['zlib']
+
+
+def _zstd_compressor():
+    # zstandard (de)compressor objects are not thread-safe: one per thread
+    if getattr(_local, 'compressor', None) is None:
+        _local.compressor = _zstandard().ZstdCompressor(level=ZSTD_LEVEL)
+    return _local.compressor
+
+
+def _zstd_decompressor():
+    if getattr(_local, 'decompressor', None) is None:
+        _local.decompressor = _zstandard().ZstdDecompressor()
+    return _local.decompressor
+
+
+_COMPRESS: Dict[str, Callable[[bytes], bytes]] = {
+    'zlib': lambda data: zlib.compress(data, ZLIB_LEVEL),
+    'zstd': lambda data: _zstd_compressor().compress(data),
+}
+_DECOMPRESS: Dict[int, Callable[[bytes], bytes]] = {
+    CODECS['zlib']: zlib.decompress,
+    CODECS['zstd']: lambda data: _zstd_decompressor().decompress(data),
+}
+
+
+def compress_text(text: str, codec: str = 'zlib') -> bytes:
+    """Encode text as a cold-tier BLOB"""
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec '{codec}', expected one of {tuple(CODECS)}")
+    return bytes([CODECS[codec]]) + _COMPRESS[codec](text.encode('utf-8'))
+
+
+def decompress_text(value: Any) -> Any:
+    """Text of a cold-tier BLOB; any other value (TEXT, NULL) is returned as is"""
+    if not isinstance(value, bytes):
+        return value
+    if not value or value[0] not in _DECOMPRESS:
+        raise ValueError(f"Unrecognized cold-tier value (codec byte {value[:1]!r})")
+    return _DECOMPRESS[value[0]](value[1:]).decode('utf-8')
+
+
+def maybe_compress(text: Optional[str], codec: str, min_size: int) -> Optional[bytes]:
+    """Compressed text, or None when it is too short or would not get smaller"""
+    if not isinstance(text, str) or len(text) < min_size:
+        return None
+    blob = compress_text(text, codec)
+    return blob if len(blob) < len(text.encode('utf-8')) else None
+
+
+def register_functions(conn: sqlite3.Connection):
+    """Install cold_text(value) on conn for queries that read cold columns in SQL"""
+    conn.create_function('cold_text', 1, decompress_text, deterministic=True)
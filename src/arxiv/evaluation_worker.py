@@ -0,0 +1,160 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+import os, socket, threading, time, logging, uuid
+
+from src.arxiv.paper_database import PaperDatabase, PaperRecord
+
+
+def default_worker_id() -> str:
+    """host:pid:random, unique per process"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class EvaluationWorker:
+    """
+    Claims papers from an evaluation queue under a lease, processes them and
+    releases the lease. Any number of workers (threads or processes, each with
+    its own proxy or API key) can share one database without duplicating work.
+
+    A background thread renews the current batch's leases every
+    heartbeat_interval seconds so slow batches (Scholar lookups take 30-60 s
+    per author) keep their claim.
+    If a worker dies, its leases expire and other workers reclaim the papers.
+
+    process_batch may return papers that should be retried later; their
+    leases are left to expire instead of being released, which backs off
+    papers that keep failing instead of re-claiming them at once. A batch
+    that raises keeps all its leases the same way, and the worker waits
+    (doubling per consecutive failure, up to lease_seconds) before claiming
+    again, so a persistent error does not spin through the queue.
+    """
+
+    def __init__(self, db: PaperDatabase, queue: str,
+                 process_batch: Callable[[List[PaperRecord]], Optional[List[PaperRecord]]],
+                 worker_id: Optional[str] = None, batch_size: int = 5,
+                 lease_seconds: float = 600, heartbeat_interval: Optional[float] = None):
+        self.db = db
+        self.queue = queue
+        self.process_batch = process_batch
+        self.worker_id = worker_id or default_worker_id()
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval or lease_seconds / 3
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+
+    def run(self, max_batches: Optional[int] = None, idle_timeout: float = 0,
+            poll_interval: float = 5) -> Dict[str, int]:
+        """
+        Process batches until the queue is empty (or max_batches is reached)
+        Args:
+            max_batches: Stop after this many batches
+            idle_timeout: Keep polling an empty queue this long before exiting
+            poll_interval: Seconds between polls of an empty queue
+        Returns:
+            Dictionary with 'batches', 'papers' and 'errors' counts
+        """
+        stats = {'batches': 0, 'papers': 0, 'errors': 0}
+        idle_since = None
+        failures = 0
+        while not self._stop.is_set():
+            if max_batches is not None and stats['batches'] >= max_batches:
+                break
+
+            papers = self.db.claim_papers(self.queue, self.worker_id,
+                                          self.batch_size, self.lease_seconds)
+            if not papers:
+                idle_since = idle_since or time.time()
+                if time.time() - idle_since >= idle_timeout:
+                    break
+                self._stop.wait(poll_interval)
+                continue
+            idle_since = None
+
+            done = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat_loop,
+                                         args=(done, [p.local_id for p in papers]), daemon=True)
+            heartbeat.start()
+            # Until process_batch returns, every lease is kept (left to expire)
+            retry: List[PaperRecord] = papers
+            try:
+                retry = self.process_batch(papers) or []
+                stats['papers'] += len(papers)
+                failures = 0
+            except Exception as e:
+                stats['errors'] += 1
+                failures += 1
+                self.logger.error(f"Worker {self.worker_id} failed on batch: {str(e)}")
+            finally:
+                done.set()
+                heartbeat.join()
+                keep = {p.local_id for p in retry}
+                release = [p.local_id for p in papers if p.local_id not in keep]
+                if release:
+                    self.db.release_papers(self.worker_id, self.queue, release)
+            stats['batches'] += 1
+            if failures:
+                self._stop.wait(min(poll_interval * 2 ** (failures - 1), self.lease_seconds))
+        return stats
+
+    def stop(self):
+        """Ask run() to return after the current batch"""
+        self._stop.set()
+
+    def _heartbeat_loop(self, done: threading.Event, local_ids: List[int]):
+        # Only the batch in progress: earlier failed or retried papers must expire
+        while not done.wait(self.heartbeat_interval):
+            try:
+                self.db.heartbeat(self.worker_id, self.queue, self.lease_seconds, local_ids)
+            except Exception as e:
+                self.logger.warning(f"Heartbeat failed for {self.worker_id}: {str(e)}")
+
+
+def author_evaluation_worker(db: PaperDatabase, evaluator, writer=None,
+                             **kwargs) -> EvaluationWorker:
+    """
+    Worker that runs AuthorLineupEvaluator.batch_evaluate on claimed papers.
+    With a shared EvaluationWriter, results are group-committed and the
+    batch's leases are only released once its writes are durable.
+    """
+    def store(paper: PaperRecord):
+        if writer is None:
+            db.update_author_evaluation(
+                arxiv_id=paper.arxiv_id,
+                score=paper.author_lineup_score,
+                author_metrics=paper.author_metrics
+            )
+            return None
+        return writer.submit_author(paper.arxiv_id, paper.author_lineup_score, paper.author_metrics)
+
+    def process_batch(papers: List[PaperRecord]):
+        # Provisional scores are stored as soon as the cheap sources answer
+        updated_papers, stats = evaluator.batch_evaluate(papers, on_progress=store)
+        futures = [store(paper) for paper in updated_papers]
+        for future in futures:
+            if future is not None:
+                future.result()
+        # No author could be resolved (sources down): retry once the lease expires
+        return [paper for paper in updated_papers if paper.author_lineup_score is None]
+    return EvaluationWorker(db, 'author', process_batch, **kwargs)
+
+
+def refine_author_evaluations(db: PaperDatabase, evaluator, limit: int = 50,
+                              writer=None) -> Dict[str, Any]:
+    """
+    Re-evaluate provisional lineup scores (author_coverage < 1). Authors
+    resolved earlier are reused, so only the missing ones are looked up.
+    """
+    papers = db.get_author_refinement_queue(limit)
+    updated_papers, stats = evaluator.batch_evaluate(papers)
+    for paper in updated_papers:
+        if writer is None:
+            db.update_author_evaluation(paper.arxiv_id, paper.author_lineup_score,
+                                        paper.author_metrics)
+        else:
+            writer.submit_author(paper.arxiv_id, paper.author_lineup_score, paper.author_metrics)
+    if writer is not None:
+        writer.flush()
+    stats['refined'] = sum(1 for p in updated_papers
+                           if (p.author_metrics or {}).get('coverage', 0) >= 1)
+    return stats
@@ -0,0 +1,159 @@
+from __future__ import annotations
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+import queue, sqlite3, threading, time, logging
+
+from src.arxiv.paper_database import BUSY_TIMEOUT, EVALUATION_QUEUES
+from src.utils.metrics import COUNT_BUCKETS, metrics
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+class EvaluationWriter:
+    """
+    Single background thread that owns all evaluation writes.
+
+    Updates are queued by any number of threads and committed in groups:
+    a transaction is closed when max_batch updates are pending or max_delay
+    seconds have passed since the first one, whichever comes first. Each
+    transaction uses one executemany() per kind, so a batch costs a single
+    fsync instead of one per paper.
+
+    Every submit_* call returns a Future that resolves to True once the
+    update is committed (or raises the error that aborted its batch).
+    Updates are serialized by submit_*, so bad input raises there. A Future
+    cancelled before the writer thread picks it up is dropped unwritten.
+    """
+
+    def __init__(self, db, max_batch: int = 200, max_delay: float = 0.5):
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.logger = logging.getLogger(__name__)
+        self._queue: queue.Queue = queue.Queue()
+        # Guards _closed and ordering against _CLOSE: nothing is queued behind it
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {'updates': 0, 'transactions': 0, 'errors': 0}
+        self._thread = threading.Thread(target=self._run, name='evaluation-writer', daemon=True)
+        self._thread.start()
+
+    # Submission
+    def submit_author(self, arxiv_id: str, score: float, metrics: dict) -> Future:
+        """Queue an author lineup update"""
+        return self._submit('author', (arxiv_id, score, metrics))
+
+    def submit_llm(self, arxiv_id: str, score: float, explanation: str) -> Future:
+        """Queue an LLM assessment update"""
+        return self._submit('llm', (arxiv_id, score, explanation))
+
+    def submit_user(self, arxiv_id: str, score: float, explanation: str) -> Future:
+        """Queue a user evaluation update"""
+        return self._submit('user', (arxiv_id, score, explanation))
+
+    def _submit(self, kind: str, update: Tuple) -> Future:
+        # Serialize on the caller's thread: the writer thread only runs SQL
+        prepared = self.db._prepare_evaluation(kind, *update)
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EvaluationWriter is closed")
+            self._queue.put((kind, prepared, future))
+        return future
+
+    # Lifecycle
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Commit everything submitted so far; returns False on timeout"""
+        future: Future = Future()
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._queue.put((_FLUSH, None, future))
+        if closed:
+            # close() already queued the final commit
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        try:
+            future.result(timeout)
+            return True
+        except TimeoutError:
+            return False
+
+    def close(self, timeout: Optional[float] = None):
+        """Commit pending updates and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put((_CLOSE, None, None))
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of committed updates, transactions and failed batches"""
+        return dict(self._stats)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Writer thread
+    def _run(self):
+        conn = sqlite3.connect(self.db.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        try:
+            while True:
+                batch, waiters, stop = self._collect()
+                if batch:
+                    self._commit(conn, batch)
+                for future in waiters:
+                    future.set_result(True)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _collect(self) -> Tuple[List[Tuple[str, Tuple, Future]], List[Future], bool]:
+        """Block for the first update, then gather more until the batch is full or due"""
+        batch: List[Tuple[str, Tuple, Future]] = []
+        waiters: List[Future] = []
+        deadline = None
+        while len(batch) < self.max_batch:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                kind, update, future = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if kind is _CLOSE:
+                return batch, waiters, True
+            if kind is _FLUSH:
+                waiters.append(future)
+                break
+            if not future.set_running_or_notify_cancel():
+                continue        # cancelled while queued: not written
+            batch.append((kind, update, future))
+            if deadline is None:
+                deadline = time.monotonic() + self.max_delay
+        return batch, waiters, False
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Tuple[str, Tuple, Future]]):
+        by_kind: Dict[str, List[Tuple]] = {kind: [] for kind in EVALUATION_QUEUES}
+        for kind, update, _ in batch:
+            by_kind[kind].append(update)
+        metrics.observe('db_group_commit_size', len(batch), buckets=COUNT_BUCKETS)
+        try:
+            with metrics.span('db_group_commit'), conn:
+                for kind, updates in by_kind.items():
+                    if updates:
+                        self.db._apply_evaluations(conn, kind, updates)
+        except Exception as e:
+            self._stats['errors'] += 1
+            self.logger.error(f"Evaluation batch of {len(batch)} failed: {str(e)}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        self._stats['updates'] += len(batch)
+        self._stats['transactions'] += 1
+        for _, _, future in batch:
+            future.set_result(True)
@@ -1,37 +1,315 @@
 import sqlite3
 import json
-import pandas as pd
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Callable, Iterator, Tuple, Union
 from dataclasses import dataclass
-import feedparser
+from src.arxiv.cold_storage import (
+    COLD_FIELDS, compress_text, decompress_text, maybe_compress, register_functions
+)
+from src.arxiv.paper_exporter import PaperExporter
+from src.utils.helpers import split_author_names
+from src.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from src.arxiv.evaluation_writer import EvaluationWriter
+
+ARXIV_CATEGORY = "cs.AI"
+ARXIV_FEED_URL_TEMPLATE = "https://rss.arxiv.org/rss/{}"
+ARXIV_CATEGORY_FEED_URL = ARXIV_FEED_URL_TEMPLATE.format(ARXIV_CATEGORY)
+
+# Seconds a connection waits on a locked database before raising
+BUSY_TIMEOUT = 30
+
+# export_watermarks row recording the previous cold-tier archive run
+COLD_TIER_TARGET = 'cold_tier'
+
+# db_updated is UTC with milliseconds ('YYYY-MM-DD HH:MM:SS.SSS'), so rows
+# changed right after a delta export do not share its watermark's second.
+# Older second-resolution values still sort correctly against it.
+DB_UPDATED_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+def parse_feed_entry(entry, category: str = ARXIV_CATEGORY) -> Optional[Dict]:
+    """Convert a feedparser entry into the dict add_or_update_paper expects"""
+    if not hasattr(entry, 'published_parsed'):
+        return None
+    updated = datetime(*entry.updated_parsed[:6])
+    return {
+        'id': entry.id.split('/')[-1],
+        'title': entry.title,
+        'authors': split_author_names(a.name for a in entry.get('authors', [])),
+        'abstract': entry.summary,
+        'updated': updated.isoformat(),
+        'category': category
+    }
+
+
+class _Lazy:
+    """Marker for a heavy field that has not been read from the database yet"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<lazy>'
+
+LAZY = _Lazy()
+
+# Columns that are only read when first accessed on a lazy PaperRecord
+HEAVY_FIELDS = ('abstract', 'llm_explanation', 'user_explanation', 'author_metrics')
+
+# Evaluation queues: queue name -> score column that is NULL while a paper waits.
+# Each queue has a partial index so dequeueing never touches evaluated rows.
+EVALUATION_QUEUES = {
+    'author': 'author_lineup_score',
+    'llm': 'llm_relevance_score',
+    'user': 'user_relevance_score',
+}
+
+# Lineup component scores exposed as indexed virtual columns over author_metrics.
+# author_coverage is the resolved fraction of the lineup; below 1 the score
+# is provisional and the paper sits in the refinement queue.
+AUTHOR_COMPONENT_COLUMNS = {
+    'author_prestige': '$.components.prestige',
+    'author_balance': '$.components.balance',
+    'author_industry': '$.components.industry',
+    'author_size_penalty': '$.components.size_penalty',
+    'author_coverage': '$.coverage',
+}
+
+# Components of the combined ranking score: column -> (default weight, scale).
+# Each score is divided by its scale so all components lie in 0-1.
+RANKING_COMPONENTS = {
+    'llm_relevance_score': ('llm_weight', 0.3, 10.0),
+    'user_relevance_score': ('user_weight', 0.5, 10.0),
+    'author_lineup_score': ('author_weight', 0.2, 1.0),
+}
+
+
+def _combined_score_sql(row: str) -> str:
+    """
+    SQL expression for the combined score of `row` (a table alias or NEW):
+    the weighted mean of the components that are present, NULL if none are.
+    """
+    weights = '(SELECT {} FROM ranking_weights WHERE id = 1)'
+    numerator = ' + '.join(
+        f"COALESCE({weights.format(w)} * {row}.{col} / {scale}, 0)"
+        for col, (w, _, scale) in RANKING_COMPONENTS.items()
+    )
+    denominator = ' + '.join(
+        f"(CASE WHEN {row}.{col} IS NOT NULL THEN {weights.format(w)} ELSE 0 END)"
+        for col, (w, _, _) in RANKING_COMPONENTS.items()
+    )
+    return f"(({numerator}) / NULLIF({denominator}, 0))"
+
+LIGHT_COLUMNS = ('local_id', 'arxiv_id', 'title', 'arxiv_timestamp',
+                 'llm_relevance_score', 'user_relevance_score', 'author_lineup_score')
+
+
+def _lazy_field(name: str) -> property:
+    slot = '_' + name
+
+    def getter(self):
+        value = getattr(self, slot)
+        if value is LAZY:
+            self._load_heavy_fields()
+            value = getattr(self, slot)
+        return value
+
+    def setter(self, value):
+        setattr(self, slot, value)
+
+    return property(getter, setter, doc=f"{name} (loaded from the database on first access)")
 
-ARXIV_CATEGORY_FEED_URL = "https://rss.arxiv.org/rss/cs.AI"
 
-@dataclass
 class PaperRecord:
-    local_id: int
-    arxiv_id: str
-    title: str
-    authors: List[str]
-    abstract: str
-    arxiv_timestamp: datetime
-    llm_relevance_score: Optional[float] = None
-    llm_explanation: Optional[str] = None
-    user_relevance_score: Optional[float] = None
-    user_explanation: Optional[str] = None
-    author_lineup_score: Optional[float] = None  
-    author_metrics: Optional[Dict[str, Any]] = None  
+    """
+    Compact paper row. Heavy text fields (abstract, explanations, author
+    metrics) may be LAZY, in which case the first access to any of them
+    loads all of them through the loader supplied by PaperDatabase.
+    """
+    __slots__ = ('local_id', 'arxiv_id', 'title', 'authors', 'arxiv_timestamp',
+                 'llm_relevance_score', 'user_relevance_score', 'author_lineup_score',
+                 '_abstract', '_llm_explanation', '_user_explanation', '_author_metrics',
+                 '_loader')
+
+    def __init__(self, local_id: int, arxiv_id: str, title: str, authors: List[str],
+                 abstract: Optional[str], arxiv_timestamp: datetime,
+                 llm_relevance_score: Optional[float] = None,
+                 llm_explanation: Optional[str] = None,
+                 user_relevance_score: Optional[float] = None,
+                 user_explanation: Optional[str] = None,
+                 author_lineup_score: Optional[float] = None,
+                 author_metrics: Optional[Dict[str, Any]] = None,
+                 loader: Optional[Callable[[int], Dict[str, Any]]] = None):
+        self.local_id = local_id
+        self.arxiv_id = arxiv_id
+        self.title = title
+        self.authors = authors
+        self.arxiv_timestamp = arxiv_timestamp
+        self.llm_relevance_score = llm_relevance_score
+        self.user_relevance_score = user_relevance_score
+        self.author_lineup_score = author_lineup_score
+        self._abstract = abstract
+        self._llm_explanation = llm_explanation
+        self._user_explanation = user_explanation
+        self._author_metrics = author_metrics
+        self._loader = loader
+
+    abstract = _lazy_field('abstract')
+    llm_explanation = _lazy_field('llm_explanation')
+    user_explanation = _lazy_field('user_explanation')
+    author_metrics = _lazy_field('author_metrics')
+
+    def _load_heavy_fields(self):
+        """Fill every still-LAZY heavy field with one database read"""
+        if self._loader is None:
+            raise RuntimeError(f"PaperRecord {self.arxiv_id} has lazy fields but no loader")
+        self._set_heavy_fields(self._loader(self.local_id))
+
+    def _set_heavy_fields(self, values: Dict[str, Any]):
+        """Fill every still-LAZY heavy field from values and drop the loader"""
+        for name in HEAVY_FIELDS:
+            if getattr(self, '_' + name) is LAZY:
+                setattr(self, '_' + name, values.get(name))
+        self._loader = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """True once no heavy field is pending a database read"""
+        return all(getattr(self, '_' + name) is not LAZY for name in HEAVY_FIELDS)
+
+    def __eq__(self, other):
+        if not isinstance(other, PaperRecord):
+            return NotImplemented
+        fields = LIGHT_COLUMNS + ('authors',) + HEAVY_FIELDS
+        return all(getattr(self, f) == getattr(other, f) for f in fields)
+
+    def __repr__(self):
+        # Never triggers a load
+        return (f"PaperRecord(local_id={self.local_id!r}, arxiv_id={self.arxiv_id!r}, "
+                f"title={self.title!r}, authors={self.authors!r}, "
+                f"arxiv_timestamp={self.arxiv_timestamp!r}, "
+                f"llm_relevance_score={self.llm_relevance_score!r}, "
+                f"user_relevance_score={self.user_relevance_score!r}, "
+                f"author_lineup_score={self.author_lineup_score!r}, "
+                f"abstract={self._abstract if self._abstract is LAZY else '...'})")
+
+
+@dataclass
+class PaperFilter:
+    """Predicates for iter_papers; None means 'do not filter on this'"""
+    since: Optional[datetime] = None           # arxiv_timestamp >= since
+    until: Optional[datetime] = None           # arxiv_timestamp < until
+    updated_since: Optional[str] = None        # db_updated >= updated_since
+    author_evaluated: Optional[bool] = None
+    llm_evaluated: Optional[bool] = None
+    user_evaluated: Optional[bool] = None
+    arxiv_ids: Optional[List[str]] = None
+    min_prestige: Optional[float] = None
+    min_balance: Optional[float] = None
+    has_industry: Optional[bool] = None        # any industry-affiliated author
+    max_size_penalty: Optional[float] = None
+    min_author_h_index: Optional[int] = None   # at least one author at or above
+    min_author_coverage: Optional[float] = None  # resolved fraction of the lineup
+
+    def to_sql(self) -> Tuple[str, List[Any]]:
+        """Return a WHERE fragment (without 'WHERE') and its parameters"""
+        clauses, params = [], []
+        if self.since is not None:
+            clauses.append('arxiv_timestamp >= ?')
+            params.append(self.since)
+        if self.until is not None:
+            clauses.append('arxiv_timestamp < ?')
+            params.append(self.until)
+        if self.updated_since is not None:
+            clauses.append('db_updated >= ?')
+            params.append(self.updated_since)
+        for column, flag in (('author_lineup_score', self.author_evaluated),
+                             ('llm_relevance_score', self.llm_evaluated),
+                             ('user_relevance_score', self.user_evaluated)):
+            if flag is not None:
+                clauses.append(f"{column} IS {'NOT ' if flag else ''}NULL")
+        if self.arxiv_ids is not None:
+            clauses.append(f"arxiv_id IN ({', '.join('?' * len(self.arxiv_ids))})"
+                           if self.arxiv_ids else '0')
+            params.extend(self.arxiv_ids)
+        for column, op, value in (('author_prestige', '>=', self.min_prestige),
+                                  ('author_balance', '>=', self.min_balance),
+                                  ('author_size_penalty', '<=', self.max_size_penalty),
+                                  ('author_coverage', '>=', self.min_author_coverage)):
+            if value is not None:
+                clauses.append(f'{column} {op} ?')
+                params.append(value)
+        if self.has_industry is not None:
+            clauses.append('author_industry > 0' if self.has_industry else 'author_industry = 0')
+        if self.min_author_h_index is not None:
+            clauses.append('''EXISTS (
+                SELECT 1 FROM authors a
+                WHERE a.paper_id = papers.local_id AND a.h_index >= ?
+            )''')
+            params.append(self.min_author_h_index)
+        return ' AND '.join(clauses) or '1', params
 
 class PaperDatabase:
-    def __init__(self, db_path: str = "research_papers.db"):
+    def __init__(self, db_path: str = "research_papers.db", keep_connections: int = 0):
+        """
+        Args:
+            db_path: SQLite database file
+            keep_connections: Idle connections kept open between calls (see
+                _connection); 0 opens and closes one per call
+        """
         self.db_path = db_path
+        self.keep_connections = keep_connections
+        self._idle: List[sqlite3.Connection] = []
+        self._idle_lock = threading.Lock()
         self._initialize_db()
 
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Connection for one call, used like sqlite3.connect() in a with block:
+        the block's transaction commits on success and rolls back on error.
+        With keep_connections a resident process reuses open connections, so
+        it skips the open and keeps SQLite's schema and page cache warm.
+        """
+        conn = None
+        with self._idle_lock:
+            if self._idle:
+                conn = self._idle.pop()
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        try:
+            with conn:
+                yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            with self._idle_lock:
+                if len(self._idle) < self.keep_connections:
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def close(self):
+        """Close the connections kept open by keep_connections"""
+        with self._idle_lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
     def _initialize_db(self):
         """Initialize database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
+
+            # Only takes effect on a new file; existing databases are converted
+            # by the first incremental_vacuum()
+            cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            # WAL lets evaluation workers write while readers keep reading
+            cursor.execute('PRAGMA journal_mode=WAL')
             
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS papers (
@@ -46,32 +324,311 @@ class PaperDatabase:
                     user_explanation TEXT,
                     author_lineup_score REAL,  
                     author_metrics TEXT,
-                    db_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    db_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    category TEXT
                 )
             ''')
 
+            # Databases created before categories were tracked only ever held
+            # papers from the default feed
+            if self._ensure_column(cursor, 'papers', 'category', 'TEXT'):
+                cursor.execute('UPDATE papers SET category = ?', (ARXIV_CATEGORY,))
+
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS authors (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     paper_id INTEGER NOT NULL,
                     name TEXT NOT NULL,
+                    h_index INTEGER,
+                    citations INTEGER,
+                    is_industry INTEGER,
+                    metrics_source TEXT,
                     FOREIGN KEY (paper_id) REFERENCES papers (local_id),
                     UNIQUE (paper_id, name)
                 )
             ''')
-            
+
+            self._initialize_author_metrics(cursor)
+            if cursor.execute('PRAGMA user_version').fetchone()[0] < 1:
+                self._split_joined_authors(cursor)
+                cursor.execute('PRAGMA user_version = 1')
+
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_arxiv_timestamp 
                 ON papers(arxiv_timestamp)
             ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_category_timestamp
+                ON papers(category, arxiv_timestamp)
+            ''')
             
+            # Superseded by the partial queue indexes below
+            cursor.execute('DROP INDEX IF EXISTS idx_user_evaluated')
+
+            for queue, column in EVALUATION_QUEUES.items():
+                cursor.execute(f'''
+                    CREATE INDEX IF NOT EXISTS idx_{queue}_queue
+                    ON papers(arxiv_timestamp)
+                    WHERE {column} IS NULL
+                ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_db_updated
+                ON papers(db_updated)
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS evaluation_leases (
+                    paper_id INTEGER NOT NULL,
+                    queue TEXT NOT NULL,
+                    worker_id TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (paper_id, queue),
+                    FOREIGN KEY (paper_id) REFERENCES papers (local_id)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_leases_worker
+                ON evaluation_leases(worker_id, queue)
+            ''')
+
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_user_evaluated 
-                ON papers(user_relevance_score)
+                CREATE TABLE IF NOT EXISTS export_watermarks (
+                    target TEXT PRIMARY KEY,
+                    watermark TIMESTAMP,
+                    watermark_id INTEGER,
+                    exported_at TIMESTAMP
+                )
             ''')
+
+            self._initialize_stats(cursor)
+            self._initialize_ranking(cursor)
             conn.commit()
 
+    def _ensure_column(self, cursor: sqlite3.Cursor, table: str, column: str, decl: str) -> bool:
+        """Add a column to an existing table; returns True if it was missing"""
+        existing = {row[1] for row in cursor.execute(f'PRAGMA table_xinfo({table})')}
+        if column in existing:
+            return False
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {decl}')
+        return True
+
+    def _initialize_author_metrics(self, cursor: sqlite3.Cursor):
+        """
+        Structured author metrics: lineup components as virtual columns
+        generated from the author_metrics JSON, and per-author h-index etc.
+        on the authors table, all indexed so filters run in SQL.
+        """
+        for column, path in AUTHOR_COMPONENT_COLUMNS.items():
+            self._ensure_column(
+                cursor, 'papers', column,
+                f"REAL GENERATED ALWAYS AS (json_extract(author_metrics, '{path}')) VIRTUAL"
+            )
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{column} ON papers({column})')
+
+        added = False
+        for column, decl in (('h_index', 'INTEGER'), ('citations', 'INTEGER'),
+                             ('is_industry', 'INTEGER'), ('metrics_source', 'TEXT')):
+            added |= self._ensure_column(cursor, 'authors', column, decl)
+        if added:
+            # Backfill h-indices already recorded in the JSON blobs
+            cursor.execute('''
+                UPDATE authors SET h_index = (
+                    SELECT j.value
+                    FROM papers p, json_each(p.author_metrics, '$.author_scores') j
+                    WHERE p.local_id = authors.paper_id AND j.key = authors.name
+                )
+                WHERE h_index IS NULL
+            ''')
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_authors_h_index ON authors(h_index)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_authors_name ON authors(name)')
+
+    def _split_joined_authors(self, cursor: sqlite3.Cursor):
+        """
+        One-time fix for papers stored before feed lineups were split: arXiv's
+        RSS gives the whole lineup as one name ("A, B and C"), which became a
+        single authors row. Rewrites those lineups as split_author_names()
+        does for new ingests, keeping author order.
+        """
+        paper_ids = [row[0] for row in cursor.execute(
+            "SELECT DISTINCT paper_id FROM authors WHERE name LIKE '%,%' OR name LIKE '% and %'"
+        ).fetchall()]
+        for paper_id in paper_ids:
+            rows = cursor.execute(
+                'SELECT name, h_index, citations, is_industry, metrics_source '
+                'FROM authors WHERE paper_id = ? ORDER BY id', (paper_id,)
+            ).fetchall()
+            # Metrics looked up for a joined "name" belong to nobody; those of
+            # rows that already were single names are kept
+            kept = {row[0]: row[1:] for row in rows if split_author_names([row[0]]) == [row[0]]}
+            cursor.execute('DELETE FROM authors WHERE paper_id = ?', (paper_id,))
+            cursor.executemany(
+                'INSERT INTO authors (paper_id, name, h_index, citations, is_industry, metrics_source) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(paper_id, name, *kept.get(name, (None,) * 4))
+                 for name in split_author_names(row[0] for row in rows)]
+            )
+
+    def _initialize_ranking(self, cursor: sqlite3.Cursor):
+        """
+        Stored, indexed combined_score. A trigger refreshes it whenever one of
+        its component scores changes; changing the weights recomputes every
+        row with one UPDATE statement.
+        """
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS ranking_weights (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                {', '.join(f'{w} REAL NOT NULL DEFAULT {d}' for w, d, _ in RANKING_COMPONENTS.values())}
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO ranking_weights (id) VALUES (1)')
+
+        added = self._ensure_column(cursor, 'papers', 'combined_score', 'REAL')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_combined_score
+            ON papers(combined_score) WHERE combined_score IS NOT NULL
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_category_combined_score
+            ON papers(category, combined_score) WHERE combined_score IS NOT NULL
+        ''')
+
+        components = ', '.join(RANKING_COMPONENTS)
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_ranking_update
+            AFTER UPDATE OF {components} ON papers
+            BEGIN
+                UPDATE papers SET combined_score = {_combined_score_sql('NEW')}
+                WHERE local_id = NEW.local_id;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_ranking_insert
+            AFTER INSERT ON papers
+            WHEN {' OR '.join(f'NEW.{col} IS NOT NULL' for col in RANKING_COMPONENTS)}
+            BEGIN
+                UPDATE papers SET combined_score = {_combined_score_sql('NEW')}
+                WHERE local_id = NEW.local_id;
+            END
+        ''')
+        if added:
+            self._recompute_combined_scores(cursor)
+
+    def _recompute_combined_scores(self, cursor: sqlite3.Cursor):
+        cursor.execute(f'UPDATE papers SET combined_score = {_combined_score_sql("papers")}')
+
+    def _initialize_stats(self, cursor: sqlite3.Cursor):
+        """
+        Materialized statistics kept current by triggers, so get_stats() is a
+        single-row read. Counts are adjusted by +/-1 per change; min/max
+        timestamps use the arxiv_timestamp index when a bound may have moved.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS paper_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_papers INTEGER NOT NULL DEFAULT 0,
+                user_evaluated INTEGER NOT NULL DEFAULT 0,
+                llm_evaluated INTEGER NOT NULL DEFAULT 0,
+                author_evaluated INTEGER NOT NULL DEFAULT 0,
+                oldest_paper TIMESTAMP,
+                newest_paper TIMESTAMP
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS category_stats (
+                category TEXT PRIMARY KEY,
+                total_papers INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_stats_insert AFTER INSERT ON papers
+            BEGIN
+                UPDATE paper_stats SET
+                    total_papers = total_papers + 1,
+                    user_evaluated = user_evaluated + (NEW.user_relevance_score IS NOT NULL),
+                    llm_evaluated = llm_evaluated + (NEW.llm_relevance_score IS NOT NULL),
+                    author_evaluated = author_evaluated + (NEW.author_lineup_score IS NOT NULL),
+                    oldest_paper = CASE WHEN oldest_paper IS NULL OR NEW.arxiv_timestamp < oldest_paper
+                                        THEN NEW.arxiv_timestamp ELSE oldest_paper END,
+                    newest_paper = CASE WHEN newest_paper IS NULL OR NEW.arxiv_timestamp > newest_paper
+                                        THEN NEW.arxiv_timestamp ELSE newest_paper END
+                WHERE id = 1;
+                INSERT INTO category_stats (category, total_papers)
+                VALUES (COALESCE(NEW.category, 'unknown'), 1)
+                ON CONFLICT(category) DO UPDATE SET total_papers = total_papers + 1;
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_stats_delete AFTER DELETE ON papers
+            BEGIN
+                UPDATE paper_stats SET
+                    total_papers = total_papers - 1,
+                    user_evaluated = user_evaluated - (OLD.user_relevance_score IS NOT NULL),
+                    llm_evaluated = llm_evaluated - (OLD.llm_relevance_score IS NOT NULL),
+                    author_evaluated = author_evaluated - (OLD.author_lineup_score IS NOT NULL),
+                    oldest_paper = (SELECT MIN(arxiv_timestamp) FROM papers),
+                    newest_paper = (SELECT MAX(arxiv_timestamp) FROM papers)
+                WHERE id = 1;
+                UPDATE category_stats SET total_papers = total_papers - 1
+                WHERE category = COALESCE(OLD.category, 'unknown');
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_stats_update
+            AFTER UPDATE OF user_relevance_score, llm_relevance_score, author_lineup_score,
+                            arxiv_timestamp, category ON papers
+            BEGIN
+                UPDATE paper_stats SET
+                    user_evaluated = user_evaluated + (NEW.user_relevance_score IS NOT NULL)
+                                                    - (OLD.user_relevance_score IS NOT NULL),
+                    llm_evaluated = llm_evaluated + (NEW.llm_relevance_score IS NOT NULL)
+                                                  - (OLD.llm_relevance_score IS NOT NULL),
+                    author_evaluated = author_evaluated + (NEW.author_lineup_score IS NOT NULL)
+                                                        - (OLD.author_lineup_score IS NOT NULL),
+                    oldest_paper = CASE WHEN NEW.arxiv_timestamp IS OLD.arxiv_timestamp THEN oldest_paper
+                                        ELSE (SELECT MIN(arxiv_timestamp) FROM papers) END,
+                    newest_paper = CASE WHEN NEW.arxiv_timestamp IS OLD.arxiv_timestamp THEN newest_paper
+                                        ELSE (SELECT MAX(arxiv_timestamp) FROM papers) END
+                WHERE id = 1;
+                UPDATE category_stats SET total_papers = total_papers - 1
+                WHERE category = COALESCE(OLD.category, 'unknown')
+                  AND OLD.category IS NOT NEW.category;
+                INSERT INTO category_stats (category, total_papers)
+                SELECT COALESCE(NEW.category, 'unknown'), 1
+                WHERE OLD.category IS NOT NEW.category
+                ON CONFLICT(category) DO UPDATE SET total_papers = total_papers + 1;
+            END
+        ''')
+
+        if cursor.execute('SELECT 1 FROM paper_stats WHERE id = 1').fetchone() is None:
+            self._rebuild_stats(cursor)
+
+    def _rebuild_stats(self, cursor: sqlite3.Cursor):
+        cursor.execute('''
+            INSERT OR REPLACE INTO paper_stats (
+                id, total_papers, user_evaluated, llm_evaluated, author_evaluated,
+                oldest_paper, newest_paper
+            )
+            SELECT 1, COUNT(*), COUNT(user_relevance_score), COUNT(llm_relevance_score),
+                   COUNT(author_lineup_score), MIN(arxiv_timestamp), MAX(arxiv_timestamp)
+            FROM papers
+        ''')
+        cursor.execute('DELETE FROM category_stats')
+        cursor.execute('''
+            INSERT INTO category_stats (category, total_papers)
+            SELECT COALESCE(category, 'unknown'), COUNT(*) FROM papers
+            GROUP BY COALESCE(category, 'unknown')
+        ''')
+
     # Core CRUD Operations
+    @metrics.timed('db_operation', op='add_or_update_paper')
     def add_or_update_paper(self, arxiv_data: Dict):
         """
         Add/update paper using arXiv metadata
@@ -82,23 +639,25 @@ class PaperDatabase:
                 - authors: List of authors
                 - abstract: Paper abstract
                 - updated: arXiv's last updated timestamp (isoformat)
+                - category: arXiv category the paper was listed under (optional)
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             
             updated_time = datetime.fromisoformat(arxiv_data['updated'])
             
-            cursor.execute('''
+            cursor.execute(f'''
                 INSERT OR REPLACE INTO papers (
                     arxiv_id, title, abstract, arxiv_timestamp,
                     llm_relevance_score, llm_explanation,
-                    user_relevance_score, user_explanation
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    user_relevance_score, user_explanation, category, db_updated
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, {DB_UPDATED_NOW})
                 ON CONFLICT(arxiv_id) DO UPDATE SET
                     title = excluded.title,
                     abstract = excluded.abstract,
                     arxiv_timestamp = excluded.arxiv_timestamp,
-                    db_updated = CURRENT_TIMESTAMP
+                    category = COALESCE(excluded.category, category),
+                    db_updated = excluded.db_updated
             ''', (
                 arxiv_data['id'],
                 arxiv_data['title'],
@@ -107,7 +666,8 @@ class PaperDatabase:
                 arxiv_data.get('llm_relevance_score'),
                 arxiv_data.get('llm_explanation'),
                 arxiv_data.get('user_relevance_score'),
-                arxiv_data.get('user_explanation')
+                arxiv_data.get('user_explanation'),
+                arxiv_data.get('category')
             ))
             
             paper_id = cursor.lastrowid if not cursor.rowcount else cursor.execute(
@@ -115,27 +675,46 @@ class PaperDatabase:
                 (arxiv_data['id'],)
             ).fetchone()[0]
             
-            cursor.execute('DELETE FROM authors WHERE paper_id = ?', (paper_id,))
-            for author in arxiv_data['authors']:
-                cursor.execute('''
-                    INSERT INTO authors (paper_id, name)
-                    VALUES (?, ?)
-                ''', (paper_id, author))
-            
+            self._store_authors(cursor, paper_id, arxiv_data['authors'])
             conn.commit()
 
+    @staticmethod
+    def _store_authors(cursor: sqlite3.Cursor, paper_id: int, names: List[str]):
+        """
+        Make paper_id's author rows match names, in order. Metric columns
+        (h_index, citations, is_industry, metrics_source) written by author
+        evaluation are kept for every name that stays on the lineup.
+        """
+        existing = cursor.execute('''
+            SELECT name, h_index, citations, is_industry, metrics_source
+            FROM authors WHERE paper_id = ? ORDER BY id
+        ''', (paper_id,)).fetchall()
+        if [row[0] for row in existing] == list(names):
+            return      # re-ingested unchanged: keep the rows (and their ids) as they are
+        # Row order is lineup order, so a changed lineup is rewritten in full
+        kept = {row[0]: row[1:] for row in existing}
+        cursor.execute('DELETE FROM authors WHERE paper_id = ?', (paper_id,))
+        cursor.executemany('''
+            INSERT INTO authors (paper_id, name, h_index, citations, is_industry, metrics_source)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(paper_id, name, *kept.get(name, (None, None, None, None))) for name in names])
+
     # Fetch Operations
-    def get_latest_arxiv_timestamp(self) -> Optional[datetime]:
+    def get_latest_arxiv_timestamp(self, category: Optional[str] = None) -> Optional[datetime]:
         """Get the most recent arXiv updated timestamp from stored papers"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT MAX(arxiv_timestamp) FROM papers')
+            if category is None:
+                cursor.execute('SELECT MAX(arxiv_timestamp) FROM papers')
+            else:
+                cursor.execute('SELECT MAX(arxiv_timestamp) FROM papers WHERE category = ?', (category,))
             result = cursor.fetchone()[0]
             return datetime.fromisoformat(result) if result else None
 
+    @metrics.timed('db_operation', op='paper_exists')
     def paper_exists(self, arxiv_id: str) -> bool:
         """Check if paper exists in database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT 1 FROM papers WHERE arxiv_id = ?', (arxiv_id,))
             return cursor.fetchone() is not None
@@ -223,26 +802,18 @@ class PaperDatabase:
             report['error'] = str(e)
             return report
 
-    def _fetch_arxiv_papers(self, cutoff: datetime) -> List[Dict]:
+    def _fetch_arxiv_papers(self, cutoff: datetime, category: str = ARXIV_CATEGORY) -> List[Dict]:
         """Internal arXiv API fetcher"""
-        feed = feedparser.parse(ARXIV_CATEGORY_FEED_URL)
+        import feedparser  # deferred: ~35 ms of imports that stats-only runs never need
+        with metrics.span('feed_fetch', category=category):
+            feed = feedparser.parse(ARXIV_FEED_URL_TEMPLATE.format(category))
         papers = []
         
         for entry in feed.entries:
-            if not hasattr(entry, 'published_parsed'):
-                continue
-                
-            updated = datetime(*entry.updated_parsed[:6])
-            if updated <= cutoff:
+            paper = parse_feed_entry(entry, category)
+            if paper is None or datetime.fromisoformat(paper['updated']) <= cutoff:
                 continue
-                
-            papers.append({
-                'id': entry.id.split('/')[-1],
-                'title': entry.title,
-                'authors': [a.name for a in entry.authors],
-                'abstract': entry.summary,
-                'updated': updated.isoformat()
-            })
+            papers.append(paper)
         
         return sorted(papers, key=lambda x: x['updated'], reverse=True)
 
@@ -255,33 +826,362 @@ class PaperDatabase:
         Returns:
             List of PaperRecord objects sorted by oldest first
         """
-        with sqlite3.connect(self.db_path) as conn:
+        return self.get_user_review_queue(limit)
+
+    def get_author_evaluation_queue(self, limit: int = 10) -> List[PaperRecord]:
+        """Get oldest papers without an author lineup score"""
+        return self._dequeue('author', limit)
+
+    def get_llm_evaluation_queue(self, limit: int = 10) -> List[PaperRecord]:
+        """Get oldest papers without an LLM relevance score"""
+        return self._dequeue('llm', limit)
+
+    def get_user_review_queue(self, limit: int = 10) -> List[PaperRecord]:
+        """Get oldest papers without a user relevance score"""
+        return self._dequeue('user', limit)
+
+    @metrics.timed('db_operation', op='get_author_refinement_queue')
+    def get_author_refinement_queue(self, limit: int = 10,
+                                    max_coverage: float = 1.0) -> List[PaperRecord]:
+        """
+        Papers whose lineup score is provisional (some authors unresolved),
+        least covered first, newest first within the same coverage
+        """
+        with self._connection() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-            
+
             cursor.execute('''
-                SELECT * FROM papers 
-                WHERE user_relevance_score IS NULL
+                SELECT * FROM papers INDEXED BY idx_author_coverage
+                WHERE author_coverage < ?
+                ORDER BY author_coverage ASC, arxiv_timestamp DESC
+                LIMIT ?
+            ''', (max_coverage, limit))
+
+            return self._rows_to_paper_records(conn, cursor.fetchall())
+
+    @metrics.timed('db_operation', op='_dequeue')
+    def _dequeue(self, queue: str, limit: int) -> List[PaperRecord]:
+        """
+        Read the head of an evaluation queue. The WHERE clause must match the
+        partial index predicate exactly for SQLite to use idx_<queue>_queue.
+        """
+        column = EVALUATION_QUEUES[queue]
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            cursor.execute(f'''
+                SELECT * FROM papers INDEXED BY idx_{queue}_queue
+                WHERE {column} IS NULL
                 ORDER BY arxiv_timestamp ASC
                 LIMIT ?
             ''', (limit,))
-            
-            return [self._row_to_paper_record(row) for row in cursor.fetchall()]
 
-    def update_author_evaluation(self, arxiv_id: str, score: float, metrics: dict) -> bool:
-        """Update author evaluation fields"""
-        with sqlite3.connect(self.db_path) as conn:
+            return self._rows_to_paper_records(conn, cursor.fetchall())
+
+    def iter_papers(self, filter: Union[PaperFilter, Dict[str, Any], None] = None,
+                    batch_size: int = 500, lazy: bool = True) -> Iterator[PaperRecord]:
+        """
+        Iterate over papers in local_id order without materializing the table
+        Args:
+            filter: PaperFilter (or dict of its fields) restricting the rows
+            batch_size: Rows fetched per keyset page
+            lazy: Leave abstract/explanations/metrics unloaded until accessed.
+                  The first access costs one query per record, so pass
+                  False when a pass reads them for most papers, or collect
+                  the records that need them and call load_heavy_fields().
+        Yields:
+            PaperRecord objects; only one page is held in memory at a time
+        """
+        if isinstance(filter, dict):
+            filter = PaperFilter(**filter)
+        where, params = (filter or PaperFilter()).to_sql()
+        columns = ', '.join(LIGHT_COLUMNS if lazy else LIGHT_COLUMNS + HEAVY_FIELDS)
+
+        last_id = 0
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            while True:
+                # Keyset pagination: each page is an index range scan on local_id
+                rows = conn.execute(f'''
+                    SELECT {columns} FROM papers
+                    WHERE local_id > ? AND ({where})
+                    ORDER BY local_id
+                    LIMIT ?
+                ''', [last_id, *params, batch_size]).fetchall()
+                if not rows:
+                    return
+                last_id = rows[-1]['local_id']
+                yield from self._rows_to_paper_records(conn, rows, lazy=lazy)
+
+    @metrics.timed('db_operation', op='find_papers')
+    def find_papers(self, filter: Union[PaperFilter, Dict[str, Any], None] = None,
+                    limit: int = 100) -> List[PaperRecord]:
+        """
+        Get papers matching a filter, newest first. Author-metric predicates
+        (min_prestige, has_industry, min_author_h_index, ...) are evaluated
+        in SQL against indexed columns.
+        """
+        if isinstance(filter, dict):
+            filter = PaperFilter(**filter)
+        where, params = (filter or PaperFilter()).to_sql()
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f'''
+                SELECT * FROM papers
+                WHERE {where}
+                ORDER BY arxiv_timestamp DESC
+                LIMIT ?
+            ''', [*params, limit]).fetchall()
+            return self._rows_to_paper_records(conn, rows)
+
+    @metrics.timed('db_operation', op='search_papers')
+    def search_papers(self, query: str, limit: int = 50) -> List[PaperRecord]:
+        """
+        Papers whose title or abstract contains every word of query
+        (case-insensitive), newest first. Archived abstracts are searched
+        through cold_text(), so this is a scan; fine for a local database.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        clauses, params = [], []
+        for term in terms:
+            pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            clauses.append("(title LIKE ? ESCAPE '\\' OR cold_text(abstract) LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+        with self._connection() as conn:
+            register_functions(conn)
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f'''
+                SELECT * FROM papers
+                WHERE {' AND '.join(clauses)}
+                ORDER BY arxiv_timestamp DESC
+                LIMIT ?
+            ''', [*params, limit]).fetchall()
+            return self._rows_to_paper_records(conn, rows)
+
+    @metrics.timed('db_operation', op='get_papers_by_author')
+    def get_papers_by_author(self, name: str, limit: int = 100) -> List[PaperRecord]:
+        """Papers listing name as an author, newest first"""
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute('''
+                SELECT p.* FROM authors a
+                JOIN papers p ON p.local_id = a.paper_id
+                WHERE a.name = ?
+                ORDER BY p.arxiv_timestamp DESC
+                LIMIT ?
+            ''', (name, limit)).fetchall()
+            return self._rows_to_paper_records(conn, rows)
+
+    def get_author_stats(self, name: str) -> Optional[Dict[str, Any]]:
+        """Latest recorded metrics and paper count for an author"""
+        with self._connection() as conn:
+            row = conn.execute('''
+                SELECT MAX(h_index), MAX(citations), MAX(is_industry), COUNT(*)
+                FROM authors WHERE name = ?
+            ''', (name,)).fetchone()
+            if not row or row[3] == 0:
+                return None
+            return {'name': name, 'h_index': row[0], 'citations': row[1],
+                    'is_industry': bool(row[2]) if row[2] is not None else None,
+                    'papers': row[3]}
+
+    # Ranking
+    @metrics.timed('db_operation', op='top_papers')
+    def top_papers(self, k: int = 10, since: Optional[datetime] = None,
+                   category: Optional[str] = None) -> List[PaperRecord]:
+        """
+        Get the k best papers by combined_score, read straight off its index
+        Args:
+            k: Number of papers to return
+            since: Only papers with arxiv_timestamp >= since
+            category: Only papers from this arXiv category
+        """
+        clauses, params = ['combined_score IS NOT NULL'], []
+        if category is not None:
+            clauses.append('category = ?')
+            params.append(category)
+        if since is not None:
+            clauses.append('arxiv_timestamp >= ?')
+            params.append(since)
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f'''
+                SELECT * FROM papers
+                WHERE {' AND '.join(clauses)}
+                ORDER BY combined_score DESC
+                LIMIT ?
+            ''', [*params, k]).fetchall()
+            return self._rows_to_paper_records(conn, rows)
+
+    def get_ranking_weights(self) -> Dict[str, float]:
+        """Current weights of the combined score, keyed by component column"""
+        with self._connection() as conn:
+            names = [w for w, _, _ in RANKING_COMPONENTS.values()]
+            row = conn.execute(
+                f"SELECT {', '.join(names)} FROM ranking_weights WHERE id = 1"
+            ).fetchone()
+            return dict(zip(RANKING_COMPONENTS, row))
+
+    @metrics.timed('db_operation', op='set_ranking_weights')
+    def set_ranking_weights(self, llm: Optional[float] = None, user: Optional[float] = None,
+                            author: Optional[float] = None) -> Dict[str, float]:
+        """
+        Change combined score weights and recompute every paper in one UPDATE
+        Args:
+            llm, user, author: New weights; None keeps the current value
+        Returns:
+            The weights now in effect
+        """
+        changes = {name: value for name, value in
+                   (('llm_weight', llm), ('user_weight', user), ('author_weight', author))
+                   if value is not None}
+        if any(value < 0 for value in changes.values()):
+            raise ValueError("Ranking weights must be non-negative")
+        if changes:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"UPDATE ranking_weights SET {', '.join(f'{n} = ?' for n in changes)} WHERE id = 1",
+                    list(changes.values())
+                )
+                self._recompute_combined_scores(cursor)
+                conn.commit()
+        return self.get_ranking_weights()
+
+    # Work Leases
+    @metrics.timed('db_operation', op='claim_papers')
+    def claim_papers(self, queue: str, worker_id: str, limit: int = 10,
+                     lease_seconds: float = 600,
+                     local_ids: Optional[List[int]] = None) -> List[PaperRecord]:
+        """
+        Atomically claim up to `limit` unleased papers from an evaluation queue
+        Args:
+            queue: 'author', 'llm' or 'user'
+            worker_id: Identifier of the claiming worker
+            limit: Maximum number of papers to claim
+            lease_seconds: Lease duration; extend it with heartbeat()
+            local_ids: Only consider these papers (e.g. ones just ingested)
+        Returns:
+            Claimed PaperRecords, oldest first. No other worker can claim them
+            until the lease is released or expires.
+        """
+        column = EVALUATION_QUEUES[queue]
+        now = time.time()
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            # IMMEDIATE takes the write lock up front, so two workers can never
+            # both see the same papers as unleased
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'DELETE FROM evaluation_leases WHERE queue = ? AND expires_at < ?',
+                (queue, now)
+            )
+            only, params = '', [queue]
+            if local_ids is not None:
+                only = f"AND local_id IN ({', '.join('?' * len(local_ids))})"
+                params += local_ids
+            rows = conn.execute(f'''
+                SELECT * FROM papers INDEXED BY idx_{queue}_queue
+                WHERE {column} IS NULL
+                  AND NOT EXISTS (
+                      SELECT 1 FROM evaluation_leases l
+                      WHERE l.paper_id = papers.local_id AND l.queue = ?
+                  )
+                  {only}
+                ORDER BY arxiv_timestamp ASC
+                LIMIT ?
+            ''', [*params, limit]).fetchall()
+            conn.executemany('''
+                INSERT INTO evaluation_leases (paper_id, queue, worker_id, expires_at)
+                VALUES (?, ?, ?, ?)
+            ''', [(row['local_id'], queue, worker_id, now + lease_seconds) for row in rows])
+            conn.execute('COMMIT')
+            return self._rows_to_paper_records(conn, rows)
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    @metrics.timed('db_operation', op='heartbeat')
+    def heartbeat(self, worker_id: str, queue: Optional[str] = None,
+                  lease_seconds: float = 600,
+                  local_ids: Optional[List[int]] = None) -> int:
+        """
+        Extend leases held by worker_id (only those on local_ids when given,
+        so papers left to expire after a failure are not kept alive);
+        returns number of leases renewed
+        """
+        with self._connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE papers
-                SET author_lineup_score = ?,
-                    author_metrics = ?,
-                    db_updated = CURRENT_TIMESTAMP
-                WHERE arxiv_id = ?
-            ''', (score, json.dumps(metrics), arxiv_id))
+            query = 'UPDATE evaluation_leases SET expires_at = ? WHERE worker_id = ?'
+            params: List[Any] = [time.time() + lease_seconds, worker_id]
+            if queue is not None:
+                query += ' AND queue = ?'
+                params.append(queue)
+            if local_ids is not None:
+                query += f" AND paper_id IN ({', '.join('?' * len(local_ids))})"
+                params += local_ids
+            cursor.execute(query, params)
+            conn.commit()
+            return cursor.rowcount
+
+    @metrics.timed('db_operation', op='release_papers')
+    def release_papers(self, worker_id: str, queue: str,
+                       local_ids: Optional[List[int]] = None) -> int:
+        """Release leases held by worker_id (all of them when local_ids is None)"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            if local_ids is None:
+                cursor.execute(
+                    'DELETE FROM evaluation_leases WHERE worker_id = ? AND queue = ?',
+                    (worker_id, queue)
+                )
+            else:
+                cursor.executemany(
+                    'DELETE FROM evaluation_leases WHERE worker_id = ? AND queue = ? AND paper_id = ?',
+                    [(worker_id, queue, local_id) for local_id in local_ids]
+                )
+            conn.commit()
+            return cursor.rowcount
+
+    @metrics.timed('db_operation', op='reclaim_expired_leases')
+    def reclaim_expired_leases(self, queue: Optional[str] = None) -> int:
+        """Drop expired leases so their papers can be claimed again"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            query = 'DELETE FROM evaluation_leases WHERE expires_at < ?'
+            params: List[Any] = [time.time()]
+            if queue is not None:
+                query += ' AND queue = ?'
+                params.append(queue)
+            cursor.execute(query, params)
+            conn.commit()
+            return cursor.rowcount
+
+    @metrics.timed('db_operation', op='update_author_evaluation')
+    def update_author_evaluation(self, arxiv_id: str, score: float, author_metrics: dict) -> bool:
+        """Update author evaluation fields"""
+        with self._connection() as conn:
+            count = self._write_evaluations(conn, 'author', [(arxiv_id, score, author_metrics)])
+            conn.commit()
+            return count > 0
+
+    @metrics.timed('db_operation', op='update_llm_evaluation')
+    def update_llm_evaluation(self, arxiv_id: str, score: float, explanation: str) -> bool:
+        """Update LLM assessment fields"""
+        with self._connection() as conn:
+            count = self._write_evaluations(conn, 'llm', [(arxiv_id, score, explanation)])
             conn.commit()
-            return cursor.rowcount > 0
+            return count > 0
 
+    @metrics.timed('db_operation', op='update_user_evaluation')
     def update_user_evaluation(self, arxiv_id: str, score: float, explanation: str) -> bool:
         """
         Update user evaluation for a specific paper
@@ -292,102 +1192,334 @@ class PaperDatabase:
         Returns:
             True if update was successful, False if paper not found
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE papers
-                SET user_relevance_score = ?,
-                    user_explanation = ?,
-                    db_updated = CURRENT_TIMESTAMP
-                WHERE arxiv_id = ?
-            ''', (score, explanation, arxiv_id))
+        with self._connection() as conn:
+            count = self._write_evaluations(conn, 'user', [(arxiv_id, score, explanation)])
             conn.commit()
-            return cursor.rowcount > 0
+            return count > 0
+
+    def writer(self, max_batch: int = 200, max_delay: float = 0.5) -> 'EvaluationWriter':
+        """
+        Start a background group-commit writer for evaluation results
+        Args:
+            max_batch: Commit once this many updates are pending
+            max_delay: Commit at most this many seconds after the first pending update
+        """
+        from src.arxiv.evaluation_writer import EvaluationWriter
+        return EvaluationWriter(self, max_batch=max_batch, max_delay=max_delay)
+
+    def _write_evaluations(self, conn: sqlite3.Connection, kind: str,
+                           updates: List[Tuple[str, Optional[float], Any]]) -> int:
+        """
+        Apply (arxiv_id, score, payload) updates of one kind on conn without
+        committing. payload is the metrics dict for 'author' and the
+        explanation text for 'llm'/'user'. Returns the number of rows changed.
+        """
+        return self._apply_evaluations(
+            conn, kind, [self._prepare_evaluation(kind, *update) for update in updates])
+
+    def _prepare_evaluation(self, kind: str, arxiv_id: str, score: Optional[float],
+                            payload: Any) -> Tuple[Tuple, List[Tuple]]:
+        """
+        Turn one update into its papers row and its authors rows. Author
+        metrics are serialized here, so a payload that is not JSON fails
+        in the caller instead of inside a group-committed batch.
+        """
+        if kind == 'author':
+            return ((score, json.dumps(payload), arxiv_id),
+                    self._author_metric_rows(arxiv_id, payload))
+        return (score, payload, arxiv_id), []
+
+    def _apply_evaluations(self, conn: sqlite3.Connection, kind: str,
+                           prepared: List[Tuple[Tuple, List[Tuple]]]) -> int:
+        """Write _prepare_evaluation() results of one kind on conn without committing"""
+        score_column = EVALUATION_QUEUES[kind]
+        payload_column = 'author_metrics' if kind == 'author' else f'{kind}_explanation'
+        cursor = conn.executemany(f'''
+            UPDATE papers
+            SET {score_column} = ?,
+                {payload_column} = ?,
+                db_updated = {DB_UPDATED_NOW}
+            WHERE arxiv_id = ?
+        ''', [paper_row for paper_row, _ in prepared])
+        count = cursor.rowcount
+        author_rows = [row for _, rows in prepared for row in rows]
+        if author_rows:
+            conn.executemany('''
+                UPDATE authors
+                SET h_index = ?, citations = ?, is_industry = ?, metrics_source = ?
+                WHERE paper_id = (SELECT local_id FROM papers WHERE arxiv_id = ?)
+                  AND name = ?
+            ''', author_rows)
+        return count
+
+    @staticmethod
+    def _author_metric_rows(arxiv_id: str, author_metrics: Optional[Dict[str, Any]]) -> List[Tuple]:
+        """Per-author (h_index, citations, is_industry, source, arxiv_id, name) rows"""
+        if not author_metrics:
+            return []
+        details = author_metrics.get('authors') or {
+            name: {'h_index': h_index}
+            for name, h_index in author_metrics.get('author_scores', {}).items()
+        }
+        return [
+            (d.get('h_index'), d.get('citations'),
+             None if d.get('is_industry') is None else int(d['is_industry']),
+             d.get('source'), arxiv_id, name)
+            for name, d in details.items()
+        ]
 
     # Reporting
+    @metrics.timed('db_operation', op='get_stats')
     def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Get database statistics from the trigger-maintained stats table"""
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-            
-            stats = {}
-            
-            cursor.execute('SELECT COUNT(*) FROM papers')
-            stats['total_papers'] = cursor.fetchone()[0]
-            
-            cursor.execute('''
-                SELECT COUNT(*) FROM papers 
-                WHERE user_relevance_score IS NOT NULL
-            ''')
-            stats['user_evaluated'] = cursor.fetchone()[0]
-            
-            cursor.execute('''
-                SELECT COUNT(*) FROM papers 
-                WHERE llm_relevance_score IS NOT NULL
-            ''')
-            stats['llm_evaluated'] = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT MIN(arxiv_timestamp) FROM papers')
-            stats['oldest_paper'] = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT MAX(arxiv_timestamp) FROM papers')
-            stats['newest_paper'] = cursor.fetchone()[0]
-            
+
+            row = cursor.execute('''
+                SELECT total_papers, user_evaluated, llm_evaluated, author_evaluated,
+                       oldest_paper, newest_paper
+                FROM paper_stats WHERE id = 1
+            ''').fetchone()
+            stats = dict(row) if row else {}
+            stats['categories'] = dict(cursor.execute(
+                'SELECT category, total_papers FROM category_stats WHERE total_papers > 0'
+            ).fetchall())
             return stats
 
+    @metrics.timed('db_operation', op='rebuild_stats')
+    def rebuild_stats(self) -> Dict[str, Any]:
+        """Recompute the stats tables from scratch to repair any drift"""
+        with self._connection() as conn:
+            self._rebuild_stats(conn.cursor())
+            conn.commit()
+        return self.get_stats()
+
+    # Cold tier
+    @metrics.timed('db_operation', op='archive_cold_papers')
+    def archive_cold_papers(self, older_than_days: int = 180, codec: str = 'zlib',
+                            min_size: int = 200, batch_size: int = 500,
+                            vacuum: bool = True) -> Dict[str, Any]:
+        """
+        Compress abstracts and explanations of papers older than
+        older_than_days into the cold tier; every read path decompresses
+        them transparently. Only rows that crossed the cutoff or changed
+        since the previous run are examined. db_updated is left alone, so
+        archiving does not trigger delta exports.
+        Args:
+            older_than_days: Age (by arxiv_timestamp) at which text goes cold
+            codec: 'zlib', or 'zstd' when zstandard is installed
+            min_size: Shorter values stay uncompressed
+            batch_size: Rows compressed per write transaction
+            vacuum: Return the freed pages with incremental_vacuum() afterwards
+        Returns:
+            Report with papers and values archived and their size before/after
+        """
+        compress_text('', codec)   # fail on an unknown or unavailable codec before scanning
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        report = {'papers': 0, 'values': 0, 'bytes_before': 0, 'bytes_after': 0}
+        with self._connection() as conn:
+            started_at = conn.execute('SELECT CURRENT_TIMESTAMP').fetchone()[0]
+            where, params = ['arxiv_timestamp < ?'], [cutoff]
+            previous = conn.execute(
+                'SELECT watermark, exported_at FROM export_watermarks WHERE target = ?',
+                (COLD_TIER_TARGET,)
+            ).fetchone()
+            if previous:
+                where.append('(arxiv_timestamp >= ? OR db_updated >= ?)')
+                params += list(previous)
+            where.append('(' + ' OR '.join(f"typeof({f}) = 'text'" for f in COLD_FIELDS) + ')')
+
+            last_id = 0
+            while True:
+                rows = conn.execute(f'''
+                    SELECT local_id, {', '.join(COLD_FIELDS)} FROM papers
+                    WHERE {' AND '.join(where)} AND local_id > ?
+                    ORDER BY local_id
+                    LIMIT ?
+                ''', [*params, last_id, batch_size]).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                updates: Dict[str, List[Tuple]] = {field: [] for field in COLD_FIELDS}
+                archived = set()
+                for local_id, *values in rows:
+                    for field, text in zip(COLD_FIELDS, values):
+                        blob = maybe_compress(text, codec, min_size)
+                        if blob is None:
+                            continue
+                        # Matching on the text skips values rewritten since the read
+                        updates[field].append((blob, local_id, text))
+                        archived.add(local_id)
+                        report['bytes_before'] += len(text.encode('utf-8'))
+                        report['bytes_after'] += len(blob)
+                for field, rows_for_field in updates.items():
+                    if rows_for_field:
+                        conn.executemany(
+                            f'UPDATE papers SET {field} = ? WHERE local_id = ? AND {field} = ?',
+                            rows_for_field)
+                        report['values'] += len(rows_for_field)
+                report['papers'] += len(archived)
+                conn.commit()
+
+            conn.execute('''
+                INSERT INTO export_watermarks (target, watermark, exported_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(target) DO UPDATE SET
+                    watermark = excluded.watermark,
+                    exported_at = excluded.exported_at
+            ''', (COLD_TIER_TARGET, cutoff, started_at))
+            conn.commit()
+        if vacuum:
+            report.update(self.incremental_vacuum())
+        return report
+
+    @metrics.timed('db_operation', op='incremental_vacuum')
+    def incremental_vacuum(self, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Return free pages to the operating system so the file (and the page
+        cache it needs) shrinks after archiving or deletes. A database
+        created before auto_vacuum=INCREMENTAL is converted once with a full
+        VACUUM; later calls only move the free pages.
+        """
+        with self._connection() as conn:
+            pages_before = conn.execute('PRAGMA page_count').fetchone()[0]
+            free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                conn.execute('VACUUM')
+                mode = 'full'
+            else:
+                conn.execute(f'PRAGMA incremental_vacuum({int(max_pages or 0)})').fetchall()
+                conn.commit()
+                mode = 'incremental'
+            # Pages leave the file when the WAL is checkpointed
+            conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchall()
+            pages_after = conn.execute('PRAGMA page_count').fetchone()[0]
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        return {'vacuum': mode, 'free_pages': free_pages,
+                'pages_freed': pages_before - pages_after,
+                'file_bytes': pages_after * page_size}
+
     # Utility Methods
     def _row_to_paper_record(self, row) -> PaperRecord:
         """Convert database row to PaperRecord object"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT name FROM authors
-                WHERE paper_id = ?
-                ORDER BY id
-            ''', (row['local_id'],))
-            authors = [author_row[0] for author_row in cursor.fetchall()]
-            
-            return PaperRecord(
+        with self._connection() as conn:
+            return self._rows_to_paper_records(conn, [row])[0]
+
+    def _rows_to_paper_records(self, conn: sqlite3.Connection, rows: List[sqlite3.Row],
+                               lazy: bool = False) -> List[PaperRecord]:
+        """
+        Convert a batch of rows to PaperRecords, loading all their authors
+        with a single query. With lazy=True the heavy fields are left LAZY.
+        """
+        if not rows:
+            return []
+        authors: Dict[int, List[str]] = {row['local_id']: [] for row in rows}
+        placeholders = ', '.join('?' * len(authors))
+        for paper_id, name in conn.execute(f'''
+            SELECT paper_id, name FROM authors
+            WHERE paper_id IN ({placeholders})
+            ORDER BY paper_id, id
+        ''', list(authors)):
+            authors[paper_id].append(name)
+
+        records = []
+        for row in rows:
+            if lazy:
+                heavy = dict.fromkeys(HEAVY_FIELDS, LAZY)
+            else:
+                heavy = self._heavy_values(row)
+            records.append(PaperRecord(
                 local_id=row['local_id'],
                 arxiv_id=row['arxiv_id'],
                 title=row['title'],
-                authors=authors,
-                abstract=row['abstract'],
+                authors=authors[row['local_id']],
                 arxiv_timestamp=datetime.fromisoformat(row['arxiv_timestamp']),
                 llm_relevance_score=row['llm_relevance_score'],
-                llm_explanation=row['llm_explanation'],
                 user_relevance_score=row['user_relevance_score'],
-                user_explanation=row['user_explanation']
-            )
+                author_lineup_score=row['author_lineup_score'],
+                loader=self._load_heavy_fields if lazy else None,
+                **heavy
+            ))
+        return records
 
-    def to_excel(self, output_path: str = "papers_export.xlsx"):
+    @metrics.timed('db_operation', op='load_heavy_fields')
+    def load_heavy_fields(self, records: List[PaperRecord],
+                          batch_size: int = 500) -> List[PaperRecord]:
+        """
+        Load the heavy fields of lazy records with one query per batch_size
+        records, instead of one query per record on first access (e.g. for
+        the papers a re-scoring pass over iter_papers() picked out)
+        Returns:
+            records, with every heavy field loaded
+        """
+        pending = {record.local_id: record for record in records if not record.is_loaded}
+        ids = list(pending)
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            for start in range(0, len(ids), batch_size):
+                chunk = ids[start:start + batch_size]
+                for row in conn.execute(f'''
+                    SELECT local_id, {', '.join(HEAVY_FIELDS)} FROM papers
+                    WHERE local_id IN ({', '.join('?' * len(chunk))})
+                ''', chunk):
+                    pending.pop(row['local_id'])._set_heavy_fields(self._heavy_values(row))
+        for record in pending.values():     # deleted since they were read
+            record._set_heavy_fields({})
+        return records
+
+    def _load_heavy_fields(self, local_id: int) -> Dict[str, Any]:
+        """Loader used by lazy PaperRecords"""
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                f"SELECT {', '.join(HEAVY_FIELDS)} FROM papers WHERE local_id = ?",
+                (local_id,)
+            ).fetchone()
+            return {} if row is None else self._heavy_values(row)
+
+    def _heavy_values(self, row: sqlite3.Row) -> Dict[str, Any]:
+        values = {name: row[name] for name in HEAVY_FIELDS}
+        values['author_metrics'] = self._parse_metrics(values['author_metrics'])
+        for name in COLD_FIELDS:
+            values[name] = decompress_text(values[name])
+        return values
+
+    @staticmethod
+    def _parse_metrics(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+        return json.loads(raw) if raw else None
+
+    def to_excel(self, output_path: str = "papers_export.xlsx") -> Dict[str, Any]:
         """Export database to Excel file"""
-        with sqlite3.connect(self.db_path) as conn:
-            # Include all columns explicitly
-            papers_df = pd.read_sql('''
-                SELECT p.*, 
-                    GROUP_CONCAT(a.name, ', ') as authors
-                FROM papers p
-                LEFT JOIN authors a ON p.local_id = a.paper_id
-                GROUP BY p.local_id
-                ORDER BY p.arxiv_timestamp DESC
-            ''', conn)
-            
-            # Ensure all expected columns exist
-            expected_cols = ['arxiv_id', 'title', 'authors', 'abstract',
-                            'arxiv_timestamp', 'author_lineup_score', 
-                            'author_metrics', 'db_updated']
-            for col in expected_cols:
-                if col not in papers_df.columns:
-                    papers_df[col] = None
-                    
-            papers_df.to_excel(output_path, index=False)
+        return self.export(output_path, fmt='xlsx')
+
+    @metrics.timed('db_operation', op='export')
+    def export(self, output_path: str, fmt: Optional[str] = None,
+               since: Optional[Any] = None, chunk_size: int = 1000) -> Dict[str, Any]:
+        """
+        Stream papers to a CSV, Parquet or Excel file
+        Args:
+            output_path: Destination file (format inferred from extension)
+            fmt: 'csv', 'parquet' or 'xlsx' to override the extension
+            since: Only export rows with db_updated at or after this watermark;
+                   'last' exports the rows changed after the previous export
+                   to output_path. CSV deltas are appended to output_path,
+                   Parquet/Excel deltas written next to it (the report's 'path')
+            chunk_size: Rows fetched from SQLite per batch
+        Returns:
+            Report dictionary with 'rows' written, the file written ('path')
+            and the new 'watermark'
+        """
+        exporter = PaperExporter(self.db_path, chunk_size=chunk_size, timeout=BUSY_TIMEOUT)
+        return exporter.export(output_path, fmt=fmt, since=since)
 
+    def print_schema(self):
         """Debug function to check current schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute("PRAGMA table_info(papers)")
             columns = cursor.fetchall()
             print("Current schema columns:")
             for col in columns:
-                print(f"{col[1]} ({col[2]})")
\ No newline at end of file
+                print(f"{col[1]} ({col[2]})")
@@ -0,0 +1,262 @@
+import csv
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.arxiv.cold_storage import COLD_FIELDS, register_functions
+
+EXPORT_FORMATS = ('csv', 'parquet', 'xlsx')
+
+# db_updated value, or (db_updated, local_id) to resume strictly after a row
+Watermark = Union[str, datetime, Tuple[str, int], None]
+
+
+class PaperExporter:
+    """
+    Streams the papers/authors join out of SQLite in fixed-size chunks.
+
+    Rows are pulled with fetchmany() from a single cursor, so memory use is
+    bounded by chunk_size regardless of database size. Every column of the
+    papers table is exported (including the generated author component
+    columns), with the joined author names after the title.
+
+    Each export records the highest (db_updated, local_id) it wrote; pass
+    since='last' to export only rows changed after the previous export to
+    the same target. The local_id breaks ties, so rows sharing the
+    watermark's db_updated are not written again. A delta export never
+    replaces the full one: CSV deltas are appended to the target, and
+    Parquet/Excel deltas go to a separate file (see delta_path).
+    """
+
+    def __init__(self, db_path: str, chunk_size: int = 1000, timeout: float = 30):
+        self.db_path = db_path
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+
+    # Row streaming
+    def columns(self) -> List[Tuple[str, str]]:
+        """(name, declared type) of each exported column, in output order"""
+        with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
+            # table_xinfo also lists generated columns; hidden = 1 marks
+            # virtual-table hidden columns, which SELECT * leaves out too
+            table = [(row[1], row[2].upper()) for row in conn.execute('PRAGMA table_xinfo(papers)')
+                     if row[6] != 1]
+        title = [name for name, _ in table].index('title')
+        return table[:title + 1] + [('authors', 'TEXT')] + table[title + 1:]
+
+    def iter_chunks(self, since: Watermark = None, order: str = 'arxiv_timestamp DESC',
+                    columns: Optional[List[str]] = None) -> Iterator[List[Tuple]]:
+        """
+        Yield lists of at most chunk_size rows
+        Args:
+            since: Only rows with db_updated >= since, or for a
+                   (db_updated, local_id) watermark only the rows after it
+            order: ORDER BY clause for the papers table
+            columns: Column names to select, in order; defaults to columns()
+        """
+        where, params = '', ()
+        if isinstance(since, tuple):
+            updated, local_id = since
+            where = 'WHERE p.db_updated > ? OR (p.db_updated = ? AND p.local_id > ?)'
+            params = (updated, updated, local_id)
+        elif since is not None:
+            where, params = 'WHERE p.db_updated >= ?', (self._format_watermark(since),)
+
+        if columns is None:
+            columns = [name for name, _ in self.columns()]
+        select = ', '.join(
+            '''(SELECT GROUP_CONCAT(name, ', ') FROM (
+                    SELECT name FROM authors WHERE paper_id = p.local_id ORDER BY id
+                )) AS authors''' if col == 'authors'
+            else f'cold_text(p.{col}) AS {col}' if col in COLD_FIELDS
+            else f'p.{col}'
+            for col in columns
+        )
+        with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
+            register_functions(conn)
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {select}
+                FROM papers p
+                {where}
+                ORDER BY p.{order}
+            ''', params)
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+    # Writers
+    def to_csv(self, output_path: str, since: Watermark = None) -> Dict[str, Any]:
+        """Stream rows into a CSV file; a delta export is appended to it"""
+        since = self._resolve_since(output_path, since)
+        columns = [name for name, _ in self.columns()]
+        report = self._new_report(output_path, output_path, 'csv', since)
+        append = since is not None and os.path.exists(output_path)
+        with open(output_path, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if not append:
+                writer.writerow(columns)
+            for rows in self.iter_chunks(since, columns=columns):
+                writer.writerows(rows)
+                self._track(report, columns, rows)
+        return self._finish(report)
+
+    def to_parquet(self, output_path: str, since: Watermark = None) -> Dict[str, Any]:
+        """Stream rows into a Parquet file, one row group per chunk"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+        table_columns = self.columns()
+        columns = [name for name, _ in table_columns]
+        schema = pa.schema([
+            (name, pa.int64() if decl == 'INTEGER'
+             else pa.float64() if decl in ('REAL', 'FLOAT')
+             else pa.string())
+            for name, decl in table_columns
+        ])
+
+        since = self._resolve_since(output_path, since)
+        path = output_path if since is None else self.delta_path(output_path)
+        report = self._new_report(path, output_path, 'parquet', since)
+        with pq.ParquetWriter(path, schema) as writer:
+            for rows in self.iter_chunks(since, columns=columns):
+                values = list(zip(*rows))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(col, type=field.type) for col, field in zip(values, schema)],
+                    schema=schema
+                ))
+                self._track(report, columns, rows)
+            if report['rows'] == 0:
+                writer.write_table(schema.empty_table())
+        return self._finish(report)
+
+    def to_xlsx(self, output_path: str, since: Watermark = None) -> Dict[str, Any]:
+        """Stream rows into an Excel workbook using openpyxl's write-only mode"""
+        try:
+            from openpyxl import Workbook
+        except ImportError as e:
+            raise ImportError("Excel export requires openpyxl (pip install openpyxl)") from e
+
+        since = self._resolve_since(output_path, since)
+        path = output_path if since is None else self.delta_path(output_path)
+        columns = [name for name, _ in self.columns()]
+        report = self._new_report(path, output_path, 'xlsx', since)
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('papers')
+        sheet.append(columns)
+        for rows in self.iter_chunks(since, columns=columns):
+            for row in rows:
+                sheet.append(row)
+            self._track(report, columns, rows)
+        workbook.save(path)
+        return self._finish(report)
+
+    def export(self, output_path: str, fmt: Optional[str] = None,
+               since: Watermark = None) -> Dict[str, Any]:
+        """
+        Export to csv, parquet or xlsx
+        Args:
+            output_path: Destination file
+            fmt: Output format; inferred from the file extension when omitted
+            since: db_updated watermark, or 'last' to continue after the previous export
+        Returns:
+            Report with rows written, the file written ('path', which differs
+            from output_path for Parquet/Excel deltas) and the new watermark
+        """
+        fmt = (fmt or os.path.splitext(output_path)[1].lstrip('.')).lower()
+        writers = {'csv': self.to_csv, 'parquet': self.to_parquet, 'xlsx': self.to_xlsx}
+        if fmt not in writers:
+            raise ValueError(f"Unsupported export format '{fmt}', expected one of {EXPORT_FORMATS}")
+        return writers[fmt](output_path, since=since)
+
+    @staticmethod
+    def delta_path(output_path: str) -> str:
+        """
+        File a Parquet/Excel delta export to output_path is written to:
+        <name>.delta-<UTC timestamp><ext> next to it. These formats cannot be
+        appended to, and overwriting would replace the full export.
+        """
+        root, ext = os.path.splitext(output_path)
+        return f"{root}.delta-{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}{ext}"
+
+    # Watermarks
+    def get_watermark(self, target: str) -> Watermark:
+        """
+        Get the (db_updated, local_id) watermark recorded by the last export
+        to target; just db_updated for watermarks saved without a local_id
+        """
+        with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
+            row = conn.execute(
+                'SELECT watermark, watermark_id FROM export_watermarks WHERE target = ?',
+                (os.path.abspath(target),)
+            ).fetchone()
+            if not row or row[0] is None:
+                return None
+            return row[0] if row[1] is None else (row[0], row[1])
+
+    def _save_watermark(self, target: str, watermark: Tuple[str, Optional[int]]):
+        with sqlite3.connect(self.db_path, timeout=self.timeout) as conn:
+            conn.execute('''
+                INSERT INTO export_watermarks (target, watermark, watermark_id, exported_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(target) DO UPDATE SET
+                    watermark = excluded.watermark,
+                    watermark_id = excluded.watermark_id,
+                    exported_at = excluded.exported_at
+            ''', (os.path.abspath(target), *watermark))
+            conn.commit()
+
+    def _resolve_since(self, target: str, since: Watermark) -> Watermark:
+        if since == 'last':
+            return self.get_watermark(target)
+        return since
+
+    @staticmethod
+    def _format_watermark(since: Union[str, datetime]) -> str:
+        # db_updated is UTC text, 'YYYY-MM-DD HH:MM:SS.SSS' (older rows without
+        # the milliseconds); a second-resolution bound compares correctly with both
+        if isinstance(since, datetime):
+            return since.strftime('%Y-%m-%d %H:%M:%S')
+        return since
+
+    # Reporting
+    def _new_report(self, path: str, target: str, fmt: str, since: Watermark) -> Dict[str, Any]:
+        if isinstance(since, tuple):
+            since, since_id = since
+        else:
+            since, since_id = (self._format_watermark(since) if since is not None else None), None
+        return {
+            'path': path,
+            'target': target,
+            'format': fmt,
+            'since': since,
+            'since_id': since_id,
+            'rows': 0,
+            'watermark': None,
+            'watermark_id': None
+        }
+
+    @staticmethod
+    def _track(report: Dict[str, Any], columns: List[str], rows: List[Tuple]):
+        db_updated_idx = columns.index('db_updated')
+        local_id_idx = columns.index('local_id')
+        report['rows'] += len(rows)
+        latest = max(((r[db_updated_idx], r[local_id_idx]) for r in rows if r[db_updated_idx]),
+                     default=None)
+        if latest and (report['watermark'] is None
+                       or latest > (report['watermark'], report['watermark_id'])):
+            report['watermark'], report['watermark_id'] = latest
+
+    def _finish(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        # Keep the previous watermark when a delta export was empty
+        if report['watermark'] is None:
+            report['watermark'], report['watermark_id'] = report['since'], report['since_id']
+        if report['watermark'] is not None:
+            self._save_watermark(report['target'], (report['watermark'], report['watermark_id']))
+        return report
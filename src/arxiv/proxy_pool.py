@@ -0,0 +1,168 @@
+# proxy_pool.py
+"""
+Health-scored pool of proxy endpoints for Google Scholar lookups.
+
+Each endpoint knows how to build its scholarly ProxyGenerator (or None for
+a direct connection). The pool routes every lookup to the healthiest
+endpoint that is not quarantined, switching scholarly's active proxy only
+when the choice changes. Endpoints that fail repeatedly are quarantined
+with exponential backoff and re-probed with a single trial lookup once
+the quarantine expires.
+"""
+from typing import Any, Callable, Dict, List, Optional
+import threading, time, logging
+
+from src.utils.metrics import metrics
+
+
+class ProxyEndpoint:
+    """One way of reaching Scholar, with its health record"""
+
+    def __init__(self, name: str, configure: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.configure = configure      # returns a ProxyGenerator; None means direct
+        self.generator: Any = None
+        self.configured = False
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency = None             # EWMA of successful lookup time, seconds
+        self.quarantined_until = 0.0
+        self.quarantines = 0
+        self.probing = False
+        self.last_error: Optional[str] = None
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace prior: untried endpoints start at 0.5 instead of 0 or 1
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    @property
+    def score(self) -> float:
+        return self.success_rate / (1.0 + (self.latency or 0.0))
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'successes': self.successes,
+            'failures': self.failures,
+            'success_rate': round(self.success_rate, 3),
+            'avg_latency': round(self.latency, 3) if self.latency is not None else None,
+            'quarantines': self.quarantines,
+            'quarantined_for': round(max(0.0, self.quarantined_until - now), 1),
+            'last_error': self.last_error
+        }
+
+
+class ProxyPool:
+    """
+    Routes lookups across endpoints by health score.
+
+        endpoint = pool.acquire()
+        try:
+            ...lookup...
+            pool.record_success(endpoint, elapsed)
+        except Exception as e:
+            pool.record_failure(endpoint, e)
+
+    activate(generator) is called with the chosen endpoint's generator
+    whenever the active endpoint changes (scholarly.use_proxy).
+    """
+
+    def __init__(self, endpoints: List[ProxyEndpoint], activate: Callable[[Any], Any],
+                 failure_threshold: int = 2, quarantine_base: float = 300,
+                 quarantine_max: float = 3600, latency_alpha: float = 0.3,
+                 clock: Callable[[], float] = time.monotonic):
+        if not endpoints:
+            raise ValueError("ProxyPool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.activate = activate
+        self.failure_threshold = failure_threshold
+        self.quarantine_base = quarantine_base
+        self.quarantine_max = quarantine_max
+        self.latency_alpha = latency_alpha
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._active: Optional[ProxyEndpoint] = None
+
+    def acquire(self) -> ProxyEndpoint:
+        """Pick the endpoint for the next lookup and make it active"""
+        with self._lock:
+            for _ in range(len(self.endpoints)):
+                endpoint = self._choose()
+                if endpoint is self._active or self._switch_to(endpoint):
+                    return endpoint
+        raise RuntimeError("No proxy endpoint could be set up")
+
+    def record_success(self, endpoint: ProxyEndpoint, latency: float):
+        with self._lock:
+            endpoint.successes += 1
+            endpoint.consecutive_failures = 0
+            endpoint.probing = False
+            endpoint.latency = latency if endpoint.latency is None else (
+                self.latency_alpha * latency + (1 - self.latency_alpha) * endpoint.latency)
+        metrics.inc('proxy_requests', proxy=endpoint.name, outcome='ok')
+
+    def record_failure(self, endpoint: ProxyEndpoint, error: Optional[BaseException] = None):
+        with self._lock:
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            endpoint.last_error = str(error) if error is not None else None
+            # A failed re-probe goes straight back into (longer) quarantine
+            if endpoint.probing or endpoint.consecutive_failures >= self.failure_threshold:
+                self._quarantine(endpoint)
+        metrics.inc('proxy_requests', proxy=endpoint.name, outcome='error')
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint health, healthiest first"""
+        now = self.clock()
+        with self._lock:
+            ranked = sorted(self.endpoints, key=lambda e: e.score, reverse=True)
+            return [dict(e.to_dict(now), active=e is self._active) for e in ranked]
+
+    # Internals (called with the lock held)
+    def _choose(self) -> ProxyEndpoint:
+        now = self.clock()
+        available = [e for e in self.endpoints if e.quarantined_until <= now]
+        if not available:
+            # Everything is quarantined: probe whichever is released first
+            return min(self.endpoints, key=lambda e: e.quarantined_until)
+        for endpoint in available:
+            if endpoint.quarantines and endpoint.consecutive_failures and not endpoint.probing:
+                endpoint.probing = True   # quarantine expired: give it one trial lookup
+                return endpoint
+        # max() keeps the first of equal scores, so the configured order breaks ties
+        return max(available, key=lambda e: e.score)
+
+    def _switch_to(self, endpoint: ProxyEndpoint) -> bool:
+        try:
+            if not endpoint.configured:
+                endpoint.generator = endpoint.configure() if endpoint.configure else None
+                endpoint.configured = True
+            self.activate(endpoint.generator)
+        except Exception as e:
+            self.logger.warning(f"Proxy {endpoint.name} setup failed: {str(e)}")
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            endpoint.last_error = str(e)
+            self._quarantine(endpoint)
+            return False
+        previous = self._active.name if self._active else None
+        self._active = endpoint
+        self.logger.info(f"Routing Scholar lookups via {endpoint.name} (was {previous})")
+        metrics.inc('proxy_switches', proxy=endpoint.name)
+        return True
+
+    def _quarantine(self, endpoint: ProxyEndpoint):
+        duration = min(self.quarantine_max, self.quarantine_base * 2 ** endpoint.quarantines)
+        endpoint.quarantines += 1
+        endpoint.probing = False
+        endpoint.quarantined_until = self.clock() + duration
+        # Rebuild on re-probe: free-proxy lists and Tor circuits go stale
+        endpoint.configured = False
+        endpoint.generator = None
+        if endpoint is self._active:
+            self._active = None
+        self.logger.warning(f"Quarantining proxy {endpoint.name} for {duration:.0f}s "
+                            f"after {endpoint.consecutive_failures} consecutive failures")
@@ -0,0 +1,237 @@
+# query_service.py
+"""
+Read-only HTTP/JSON API over PaperDatabase for dashboards and colleagues,
+instead of re-opening the exported workbook.
+
+    GET /stats
+    GET /papers/top?k=10&since=2025-08-01&category=cs.AI
+    GET /papers/search?q=vehicle+routing&limit=50
+    GET /papers/<arxiv_id>
+    GET /authors/<name>?limit=100
+
+Responses are cached in memory per URL and stay valid until the database
+changes, which is detected with PRAGMA data_version on one long-lived
+connection (the value moves whenever another connection commits). Every
+response carries a content ETag, so pollers sending If-None-Match get an
+empty 304 while nothing they asked for has changed. The database is in WAL
+mode, so these reads never block the pipeline's writers and vice versa.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import hashlib, json, sqlite3, threading, logging
+
+from src.arxiv.paper_database import BUSY_TIMEOUT, PaperDatabase, PaperRecord
+from src.utils.metrics import metrics
+
+DEFAULT_PORT = 8765
+
+
+class QueryError(Exception):
+    """Request that cannot be answered; carries the HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def paper_to_json(paper: PaperRecord, full: bool = False) -> Dict[str, Any]:
+    """JSON-ready paper; full adds the explanations and author metrics"""
+    data = {
+        'arxiv_id': paper.arxiv_id,
+        'title': paper.title,
+        'authors': paper.authors,
+        'arxiv_timestamp': paper.arxiv_timestamp.isoformat(),
+        'llm_relevance_score': paper.llm_relevance_score,
+        'user_relevance_score': paper.user_relevance_score,
+        'author_lineup_score': paper.author_lineup_score,
+        'abstract': paper.abstract,
+    }
+    if full:
+        data.update(llm_explanation=paper.llm_explanation,
+                    user_explanation=paper.user_explanation,
+                    author_metrics=paper.author_metrics)
+    return data
+
+
+class QueryService:
+    """
+    Answers API paths from the database through a data_version-invalidated
+    cache. Usable without HTTP: service.get('/papers/top?k=5') returns
+    (status, etag, body).
+    """
+
+    def __init__(self, db: PaperDatabase, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                 cache_size: int = 256, max_limit: int = 500):
+        self.db = db
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        self.max_limit = max_limit
+        self.logger = logging.getLogger(__name__)
+        self._cache: 'OrderedDict[str, Tuple[int, str, bytes]]' = OrderedDict()
+        self._cache_version: Optional[int] = None
+        self._lock = threading.Lock()
+        # Read-only connection used only to watch for commits by other connections
+        self._watch = sqlite3.connect(f"file:{db.db_path}?mode=ro", uri=True,
+                                      timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes: Dict[str, Callable[[List[str], Dict[str, str]], Any]] = {
+            'stats': self._stats,
+            'papers': self._papers,
+            'authors': self._authors,
+        }
+
+    # Query handling
+    def get(self, target: str) -> Tuple[int, str, bytes]:
+        """Status, ETag and JSON body for a request target (path plus query)"""
+        version = self.data_version()
+        with self._lock:
+            if version != self._cache_version:
+                self._cache.clear()
+                self._cache_version = version
+            cached = self._cache.get(target)
+            if cached is not None:
+                self._cache.move_to_end(target)
+                metrics.inc('api_cache', outcome='hit')
+                return cached
+        metrics.inc('api_cache', outcome='miss')
+
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        route = self._routes.get(parts[0]) if parts else None
+        try:
+            if route is None:
+                raise QueryError(404, f"Unknown endpoint '{url.path}'")
+            status, payload = 200, route(parts[1:], params)
+        except QueryError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            # e.g. the database is locked or corrupt: answer instead of dropping the connection
+            self.logger.exception(f"Query {target} failed")
+            metrics.inc('api_errors')
+            status, payload = 500, {'error': f"Internal error: {type(e).__name__}"}
+        body = json.dumps(payload, default=str).encode()
+        response = (status, '"' + hashlib.sha1(body).hexdigest()[:20] + '"', body)
+
+        # Only cache if nothing was committed while the answer was being built
+        if status == 200 and self.data_version() == version:
+            with self._lock:
+                if self._cache_version == version:
+                    self._cache[target] = response
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        return response
+
+    def data_version(self) -> int:
+        with self._lock:
+            return self._watch.execute('PRAGMA data_version').fetchone()[0]
+
+    def _limit(self, params: Dict[str, str], name: str, default: int) -> int:
+        try:
+            value = int(params.get(name, default))
+        except ValueError:
+            raise QueryError(400, f"'{name}' must be an integer")
+        return max(1, min(value, self.max_limit))
+
+    # Endpoints
+    def _stats(self, parts: List[str], params: Dict[str, str]) -> Dict[str, Any]:
+        return self.db.get_stats()
+
+    def _papers(self, parts: List[str], params: Dict[str, str]) -> Any:
+        if parts == ['top']:
+            since = None
+            if params.get('since'):
+                try:
+                    since = datetime.fromisoformat(params['since'])
+                except ValueError:
+                    raise QueryError(400, "'since' must be an ISO date")
+            papers = self.db.top_papers(self._limit(params, 'k', 10), since=since,
+                                        category=params.get('category'))
+            return [paper_to_json(p) for p in papers]
+        if parts == ['search']:
+            if not params.get('q', '').strip():
+                raise QueryError(400, "'q' is required")
+            return [paper_to_json(p) for p in
+                    self.db.search_papers(params['q'], self._limit(params, 'limit', 50))]
+        if len(parts) == 1:
+            arxiv_id = parts[0]
+            ids = [arxiv_id] if arxiv_id.startswith('oai:') else [arxiv_id, f'oai:arXiv.org:{arxiv_id}']
+            found = self.db.find_papers({'arxiv_ids': ids}, limit=1)
+            if not found:
+                raise QueryError(404, f"No paper '{arxiv_id}'")
+            return paper_to_json(found[0], full=True)
+        raise QueryError(404, f"Unknown endpoint '/papers/{'/'.join(parts)}'")
+
+    def _authors(self, parts: List[str], params: Dict[str, str]) -> Dict[str, Any]:
+        if len(parts) != 1:
+            raise QueryError(404, "Use /authors/<name>")
+        author = self.db.get_author_stats(parts[0])
+        if author is None:
+            raise QueryError(404, f"No author '{parts[0]}'")
+        papers = self.db.get_papers_by_author(parts[0], self._limit(params, 'limit', 100))
+        return {**author, 'papers': [paper_to_json(p) for p in papers]}
+
+    # HTTP
+    def start(self) -> 'QueryService':
+        """Serve in a background thread (e.g. next to the daemon)"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='query-service', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Query service on http://{self.host}:{self.port}/")
+        return self
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted"""
+        self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self._watch.close()
+
+    def _handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with metrics.span('api_request') as span:
+                    status, etag, body = service.get(self.path)
+                    if status == 200 and etag in self._client_etags():
+                        status, body = 304, b''
+                    span.set(status=status)
+                    self.send_response(status)
+                    self.send_header('ETag', etag)
+                    # Clients may keep the body but must revalidate (cheap 304s)
+                    self.send_header('Cache-Control', 'no-cache')
+                    if status != 304:
+                        self.send_header('Content-Type', 'application/json')
+                        self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    if self.command != 'HEAD':
+                        self.wfile.write(body)
+
+            do_HEAD = do_GET
+
+            def _client_etags(self) -> List[str]:
+                header = self.headers.get('If-None-Match', '')
+                return [tag.strip() for tag in header.split(',') if tag.strip()]
+
+            def log_message(self, format, *args):
+                service.logger.debug(format % args)
+
+        return Handler
@@ -1,9 +1,17 @@
-import openai, requests, os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+import os, re, threading, time
 from dotenv import load_dotenv
-from openai import OpenAI
+from src.utils.metrics import metrics
 load_dotenv()  # Loads variables from .env into environment
 OPENAI_KEY = os.getenv("OPENAI_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # None = api.openai.com; set for proxies or local stand-ins
 OPENAI_MODEL_ID = "gpt-4o"
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))    # deadline per assessment, seconds
+# Send a second, hedged request once the first is slower than this latency
+# percentile of recent requests to the same model; 0 disables hedging
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0"))
 
 DEFAULT_PROMPT = """
 You are an expert research assessor. For the following paper, score it from 1-10 in three categories:
@@ -18,10 +26,133 @@ Paper:
 Title: {title}
 Authors: {authors}
 Abstract: {abstract}
+
+Start your answer with a single line of the form "Overall relevance: X/10", then explain the scores.
 """
 
-def assess_paper_openai(paper, user_interests, additional_prompt=None):
-    """OpenAI assessment function """
+DEFAULT_USER_INTERESTS = "operation research, supply chain, transportation, optimization, machine learning"
+
+_OVERALL_SCORE = re.compile(r'overall relevance\W*(\d+(?:\.\d+)?)\s*(?:/\s*10)?', re.IGNORECASE)
+_ANY_SCORE = re.compile(r'(\d+(?:\.\d+)?)\s*/\s*10')
+
+def parse_relevance_score(text):
+    """Extract a 1-10 relevance score from an assessment, or None"""
+    if not text:
+        return None
+    match = _OVERALL_SCORE.search(text)
+    if match:
+        return min(10.0, float(match.group(1)))
+    # Older prompts had no overall line: average the per-category scores
+    scores = [float(s) for s in _ANY_SCORE.findall(text) if float(s) <= 10]
+    return sum(scores) / len(scores) if scores else None
+
+# The score line is only taken once "/10" has arrived, so a streamed "7" is not
+# mistaken for the final "7.5"
+_STREAMED_SCORE = re.compile(r'overall relevance\W*(\d+(?:\.\d+)?)\s*/\s*10', re.IGNORECASE)
+
+
+class LatencyTracker:
+    """Rolling window of request latencies per model, for hedging thresholds"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+
+    def record(self, model: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+        if not metrics.enabled:
+            return
+        for q in (50, 95, 99):
+            metrics.set_gauge(f'llm_latency_p{q}_seconds', self.percentile(model, q, min_samples=1), model=model)
+
+    def percentile(self, model: str, q: float, min_samples: Optional[int] = None) -> Optional[float]:
+        """q-th percentile (nearest rank) of recent latencies, None until enough samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if not samples or len(samples) < (self.min_samples if min_samples is None else min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            models = {model: len(samples) for model, samples in self._samples.items()}
+        return {model: {'count': count, **{f'p{q}': self.percentile(model, q, min_samples=1)
+                                           for q in (50, 90, 95, 99)}}
+                for model, count in models.items()}
+
+
+latency = LatencyTracker()
+
+_clients: Dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client():
+    """Shared OpenAI client, so requests reuse pooled connections"""
+    key = (OPENAI_KEY, OPENAI_BASE_URL)
+    with _clients_lock:
+        if key not in _clients:
+            from openai import OpenAI  # heavy (httpx, pydantic); only loaded when assessing
+            # Retries are replaced by the deadline and hedging below
+            _clients[key] = OpenAI(api_key=OPENAI_KEY, base_url=OPENAI_BASE_URL, max_retries=0)
+        return _clients[key]
+
+
+class _Attempt:
+    """One streamed request; keeps the text received so far"""
+
+    def __init__(self, hedge: bool):
+        self.hedge = hedge
+        self.parts = []
+        self.score = None
+        self.finished = False
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+
+def _stream_attempt(attempt, messages, deadline, cancelled, on_score):
+    start = time.monotonic()
+    stream = _get_client().chat.completions.create(
+        model=OPENAI_MODEL_ID,
+        messages=messages,
+        max_tokens=512,
+        temperature=0.7,
+        stream=True,
+        timeout=max(0.1, deadline - start)
+    )
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                attempt.parts.append(chunk.choices[0].delta.content)
+                if attempt.score is None:
+                    match = _STREAMED_SCORE.search(attempt.text)
+                    if match:
+                        attempt.score = min(10.0, float(match.group(1)))
+                        on_score(attempt.score, attempt.text)
+            if cancelled.is_set() or time.monotonic() > deadline:
+                return attempt
+    finally:
+        stream.close()
+    attempt.finished = True
+    latency.record(OPENAI_MODEL_ID, time.monotonic() - start)
+    return attempt
+
+
+def assess_paper_openai(paper, user_interests, additional_prompt=None, timeout=None,
+                        hedge_percentile=None, on_score: Optional[Callable[[float, str], None]] = None):
+    """
+    OpenAI assessment function. The response is streamed: on_score(score, text_so_far)
+    is called as soon as the overall score line arrives, before the explanation.
+    The call returns within timeout seconds (LLM_TIMEOUT); past the deadline
+    a response that already has its score is returned truncated. With
+    hedge_percentile (LLM_HEDGE_PERCENTILE) set, a request slower than that
+    percentile of recent latencies gets a duplicate and the first to finish wins.
+    """
     prompt = DEFAULT_PROMPT.format(
         user_interests=user_interests,
         title=paper["title"],
@@ -30,28 +161,79 @@ def assess_paper_openai(paper, user_interests, additional_prompt=None):
     )
     if additional_prompt:
         prompt += "\n" + additional_prompt
+    messages = [
+        {"role": "system", "content": "You are a research paper assessment assistant. Your goal is to determine a relevance score for each paper and produce an explanation for the score."},
+        {"role": "user", "content": prompt}
+    ]
+    timeout = LLM_TIMEOUT if timeout is None else timeout
+    hedge_percentile = LLM_HEDGE_PERCENTILE if hedge_percentile is None else hedge_percentile
+    hedge_after = latency.percentile(OPENAI_MODEL_ID, hedge_percentile) if hedge_percentile else None
+    deadline = time.monotonic() + timeout
 
+    scored = threading.Lock()
+    def report_score(score, text):
+        # Only the first attempt to reach its score line reports it
+        if on_score is not None and scored.acquire(blocking=False):
+            on_score(score, text)
+
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='llm')
+    attempts = {}
     try:
-        client = OpenAI(api_key=OPENAI_KEY)
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL_ID,
-            messages=[
-                {"role": "system", "content": "You are a research paper assessment assistant. Your goal is to determine a relevance score for each paper and produce an explanation for the score."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=512,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
-    
+        with metrics.span('llm_request', model=OPENAI_MODEL_ID) as span:
+            def launch(hedge):
+                attempt = _Attempt(hedge)
+                attempts[executor.submit(_stream_attempt, attempt, messages, deadline,
+                                         cancelled, report_score)] = attempt
+
+            launch(hedge=False)
+            if hedge_after is not None:
+                done, _ = wait(attempts, timeout=min(hedge_after, deadline - time.monotonic()))
+                if not done and time.monotonic() < deadline:
+                    metrics.inc('llm_hedged_requests', model=OPENAI_MODEL_ID)
+                    launch(hedge=True)
+
+            winner, error = None, None
+            pending = set(attempts)
+            while pending and winner is None:
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()),
+                                     return_when=FIRST_COMPLETED)
+                if not done:
+                    break   # deadline passed
+                for future in done:
+                    if future.exception() is not None:
+                        error = future.exception()
+                    elif future.result().finished:
+                        winner = future.result()
+            cancelled.set()
+
+            if winner is not None:
+                span.set(outcome='hedged' if winner.hedge else 'ok')
+                return winner.text
+            # Deadline: keep the longest answer that at least has its score
+            partial = max((a for a in attempts.values() if a.score is not None),
+                          key=lambda a: len(a.parts), default=None)
+            if partial is not None:
+                span.set(outcome='truncated')
+                return partial.text
+            span.set(outcome='timeout' if error is None else 'error')
+            if error is not None:
+                raise error
+            latency.record(OPENAI_MODEL_ID, timeout)
+            print(f"OpenAI Error: no score within {timeout:g}s")
+            return None
+
     except Exception as e:
         print(f"OpenAI Error: {str(e)}")
         return None
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False)
 
 def assess_papers(papers):
     """Assess a list of papers using OpenAI"""
     paper_idx = int(input(f"Select paper number (1-{len(papers)}): ")) - 1
-    user_interests = "operation research, supply chain, transportation, optimization, machine learning"
+    user_interests = DEFAULT_USER_INTERESTS
     assessment = assess_paper_openai(
         papers[paper_idx],
         user_interests,
@@ -0,0 +1,201 @@
+from __future__ import annotations
+from datetime import datetime, time as dtime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+import json, os, signal, threading, logging
+
+from src.arxiv.paper_database import PaperDatabase
+from src.pipeline.runner import PipelineConfig, PipelineRunner, build_author_evaluator
+from src.utils.metrics import metrics
+
+try:
+    from zoneinfo import ZoneInfo
+    ARXIV_TZ = ZoneInfo("America/New_York")
+except Exception:  # no tz database on this host
+    ARXIV_TZ = timezone(timedelta(hours=-5), "ET")
+
+
+class AnnouncementSchedule:
+    """
+    Poll schedule around arXiv's announcement time. New listings appear at
+    20:00 US Eastern, Sunday through Thursday. Inside the window around an
+    announcement we poll every near_interval; otherwise every far_interval,
+    but never sleep past the start of the next window.
+    """
+
+    def __init__(self, announce_at: dtime = dtime(20, 0),
+                 window_before: timedelta = timedelta(minutes=10),
+                 window_after: timedelta = timedelta(hours=2),
+                 near_interval: timedelta = timedelta(minutes=5),
+                 far_interval: timedelta = timedelta(hours=3)):
+        self.announce_at = announce_at
+        self.window_before = window_before
+        self.window_after = window_after
+        self.near_interval = near_interval
+        self.far_interval = far_interval
+
+    @staticmethod
+    def is_announcement_day(day: datetime) -> bool:
+        # Monday=0 ... Sunday=6; no mailings on Friday or Saturday evenings
+        return day.weekday() not in (4, 5)
+
+    def _windows(self, now: datetime):
+        """(start, end) of announcement windows from yesterday onwards"""
+        local = now.astimezone(ARXIV_TZ)
+        for offset in range(-1, 8):
+            day = (local + timedelta(days=offset)).date()
+            announce = datetime.combine(day, self.announce_at, tzinfo=ARXIV_TZ)
+            if self.is_announcement_day(announce):
+                yield announce - self.window_before, announce + self.window_after
+
+    def in_window(self, now: datetime) -> bool:
+        return any(start <= now <= end for start, end in self._windows(now))
+
+    def next_poll(self, now: Optional[datetime] = None) -> datetime:
+        """When to poll next, as an aware datetime"""
+        now = now or datetime.now(timezone.utc)
+        if self.in_window(now):
+            return now + self.near_interval
+        next_start = min(start for start, _ in self._windows(now) if start > now)
+        return min(now + self.far_interval, next_start)
+
+
+class PaperDaemon:
+    """
+    Resident process that re-runs the pipeline on the announcement schedule.
+    The database (with db_connections connections kept open), author
+    evaluator (proxies, Scholar session, metrics cache) and the group-commit
+    writer survive between runs, so each poll only pays for the work it
+    actually does. Progress is published to a JSON status
+    file for health checks; metrics_paths=(json_path, prom_path) also
+    refreshes the metrics files after every run.
+    """
+
+    def __init__(self, db_path: str, config: PipelineConfig,
+                 status_path: str = "daemon_status.json",
+                 schedule: Optional[AnnouncementSchedule] = None,
+                 metrics_paths: Tuple[Optional[str], Optional[str]] = (None, None),
+                 db_connections: int = 4):
+        self.db = PaperDatabase(db_path, keep_connections=db_connections)
+        self.config = config
+        self.status_path = status_path
+        self.schedule = schedule or AnnouncementSchedule()
+        self.metrics_paths = metrics_paths
+        self.logger = logging.getLogger(__name__)
+        self._writer = self.db.writer()
+        self._evaluator = None
+        self._runner: Optional[PipelineRunner] = None
+        self._stop = threading.Event()
+        self._status: Dict[str, Any] = {
+            'pid': os.getpid(),
+            'started_at': self._now().isoformat(),
+            'state': 'starting',
+            'runs': 0,
+            'consecutive_errors': 0,
+            'last_run_started': None,
+            'last_run_finished': None,
+            'last_report': None,
+            'last_error': None,
+            'next_poll': None,
+        }
+
+    def serve_forever(self, max_runs: Optional[int] = None):
+        """Poll until stopped (SIGTERM/SIGINT) or max_runs polls have completed"""
+        self._install_signal_handlers()
+        try:
+            while not self._stop.is_set():
+                self.run_once()
+                if max_runs is not None and self._status['runs'] >= max_runs:
+                    break
+                next_poll = self.schedule.next_poll(self._now())
+                if self._status['consecutive_errors']:
+                    # Back off while the feed or the network keeps failing
+                    backoff = min(3600, 60 * 2 ** self._status['consecutive_errors'])
+                    next_poll = max(next_poll, self._now() + timedelta(seconds=backoff))
+                self._update_status(state='idle', next_poll=next_poll.isoformat())
+                self._stop.wait(max(0.0, (next_poll - self._now()).total_seconds()))
+        finally:
+            self._update_status(state='stopped', next_poll=None)
+            self._writer.close()
+            self.db.close()
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        """Run the pipeline once, reusing warm state"""
+        self._update_status(state='running', last_run_started=self._now().isoformat())
+        self._runner = PipelineRunner(self.db, self.config, evaluator=self._get_evaluator(),
+                                      writer=self._writer)
+        try:
+            report = self._runner.run()
+        except Exception as e:
+            self.logger.error(f"Pipeline run failed: {str(e)}")
+            self._update_status(consecutive_errors=self._status['consecutive_errors'] + 1,
+                                last_error=str(e), last_run_finished=self._now().isoformat())
+            return None
+        finally:
+            self._runner = None
+            self._write_metrics()
+        # Fetch failures are recorded per item rather than raised; a run that
+        # could not read some feed still counts as failed for the backoff
+        failed_fetches = report['stages'].get('fetch', {}).get('errors', 0)
+        if failed_fetches:
+            self._update_status(consecutive_errors=self._status['consecutive_errors'] + 1,
+                                last_error=f"{failed_fetches} feed fetch(es) failed")
+        else:
+            self._update_status(consecutive_errors=0)
+        self._update_status(
+            runs=self._status['runs'] + 1,
+            last_run_finished=self._now().isoformat(),
+            last_report={
+                'stages': report['stages'],
+                'exported_rows': (report.get('export') or {}).get('rows'),
+                'archived_texts': (report.get('archive') or {}).get('values'),
+                'elapsed_seconds': round(report['elapsed_seconds'], 2)
+            },
+            stats=self.db.get_stats(),
+            proxies=self._evaluator.proxy_stats() if self._evaluator is not None else None
+        )
+        return report
+
+    def stop(self):
+        """Finish the current run (if any) and exit serve_forever()"""
+        self._update_status(state='stopping')
+        self._stop.set()
+        if self._runner is not None:
+            self._runner.stop()
+
+    # Internals
+    def _get_evaluator(self):
+        if self._evaluator is None and self.config.author_eval:
+            self._evaluator = build_author_evaluator(self.db, self.config)
+        return self._evaluator
+
+    def _write_metrics(self):
+        try:
+            metrics.write_files(*self.metrics_paths)
+        except OSError as e:
+            self.logger.warning(f"Could not write metrics: {str(e)}")
+
+    def _install_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda signum, frame: self.stop())
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def _update_status(self, **changes):
+        self._status.update(changes)
+        self._status['updated_at'] = self._now().isoformat()
+        if not self.status_path:
+            return
+        tmp_path = f"{self.status_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._status, f, indent=2, default=str)
+            os.replace(tmp_path, self.status_path)  # readers never see a partial file
+        except OSError as e:
+            self.logger.warning(f"Could not write status file: {str(e)}")
+
+    def status(self) -> Dict[str, Any]:
+        return dict(self._status)
@@ -0,0 +1,560 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from contextlib import nullcontext
+import queue, threading, time, logging
+
+from src.arxiv.paper_database import (
+    ARXIV_CATEGORY, ARXIV_FEED_URL_TEMPLATE, PaperDatabase, PaperRecord, parse_feed_entry
+)
+from src.utils.metrics import metrics
+
+STAGES = ('fetch', 'ingest', 'dedupe', 'author', 'llm')
+# Stages named after the evaluation queue (EVALUATION_QUEUES) they work off
+EVALUATION_STAGES = ('author', 'llm')
+
+# Stages whose handler takes a list of items: (batch_size, batch_window).
+# Author lookup resolves a whole batch with one Semantic Scholar request.
+BATCHED_STAGES = {'author': (50, 2.0)}
+
+# Sentinel telling a stage worker that its upstream stage has finished
+_DONE = object()
+
+
+@dataclass
+class StageSettings:
+    workers: int = 1
+    queue_size: int = 100   # capacity of the stage's inbox; full inboxes block producers
+    batch_size: Optional[int] = None      # batched stages: most items per handler call
+    batch_window: Optional[float] = None  # batched stages: seconds to wait for a batch to fill
+
+
+@dataclass
+class PipelineConfig:
+    categories: List[str] = field(default_factory=lambda: [ARXIV_CATEGORY])
+    days: int = 7
+    limit: int = 1000                       # max papers taken per category feed
+    author_eval: bool = True
+    llm_assess: bool = False
+    user_interests: Optional[str] = None
+    llm_timeout: Optional[float] = None         # per-assessment deadline; None = LLM_TIMEOUT
+    llm_hedge_percentile: Optional[float] = None  # hedge slower requests; None = LLM_HEDGE_PERCENTILE
+    export_path: Optional[str] = "research_papers.xlsx"
+    delta_export: bool = False              # only export rows changed since the last export
+    coauthor_graph: bool = False            # estimate unresolved authors from their co-authors
+    archive_after_days: Optional[int] = None  # compress text of older papers after each run
+    archive_codec: str = 'zlib'
+    backlog: int = 200                      # stored papers per evaluation queue taken each run
+    lease_seconds: float = 600              # lease on papers being evaluated (see claim_papers)
+    stages: Dict[str, StageSettings] = field(default_factory=dict)
+
+    def settings(self, stage: str) -> StageSettings:
+        return self.stages.get(stage) or StageSettings()
+
+
+class Stage:
+    """A named step with its own inbox and worker threads"""
+
+    def __init__(self, name: str, handler: Callable[[Any], Optional[Iterable[Any]]],
+                 settings: StageSettings):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, settings.workers)
+        self.inbox: queue.Queue = queue.Queue(maxsize=settings.queue_size)
+        # None for stages that handle one item at a time
+        self.batch_size: Optional[int] = None
+        self.batch_window = 0.0
+        if name in BATCHED_STAGES:
+            size, window = BATCHED_STAGES[name]
+            self.batch_size = max(1, settings.batch_size or size)
+            self.batch_window = window if settings.batch_window is None else settings.batch_window
+        self.downstream: Optional[Stage] = None
+        self.stats = {'processed': 0, 'emitted': 0, 'errors': 0, 'busy_seconds': 0.0}
+        self._lock = threading.Lock()
+        self._active = self.workers
+        self._producers = 0
+
+    def add_producer(self):
+        """Register something that feeds the inbox (upstream stage, backlog feeder)"""
+        with self._lock:
+            self._producers += 1
+
+    def producer_finished(self):
+        """The last producer to finish closes the inbox"""
+        with self._lock:
+            self._producers -= 1
+            last = self._producers == 0
+        if last:
+            for _ in range(self.workers):
+                self.inbox.put(_DONE)
+
+    def worker_finished(self):
+        """Called by each worker on exit; the last one closes the downstream stage"""
+        with self._lock:
+            self._active -= 1
+            last = self._active == 0
+        if last and self.downstream is not None:
+            self.downstream.producer_finished()
+
+    def record(self, seconds: float, emitted: int = 0, error: bool = False, items: int = 1):
+        with self._lock:
+            self.stats['processed'] += items
+            self.stats['emitted'] += emitted
+            self.stats['errors'] += items if error else 0
+            self.stats['busy_seconds'] += seconds
+        metrics.observe('stage_item_seconds', seconds / items, stage=self.name)
+        metrics.inc('stage_items', items, stage=self.name, outcome='error' if error else 'ok')
+        metrics.set_gauge('stage_queue_depth', self.inbox.qsize(), stage=self.name)
+
+
+class PipelineRunner:
+    """
+    Runs fetch -> ingest -> dedupe -> author -> llm as concurrent stages
+    joined by bounded queues, then exports. A paper moves on to author
+    lookup as soon as it is stored, instead of waiting for the whole fetch.
+    Full inboxes block upstream workers (backpressure); stop() lets
+    in-flight papers drain and shuts every stage down in order.
+
+    The author and llm stages are also fed from the database's evaluation
+    queues (config.backlog papers each), so papers stored earlier, left
+    over from an interrupted run or whose evaluation failed are picked up.
+    Every evaluated paper is held under a lease (claim_papers) that is
+    renewed while it waits or is being evaluated; leases of failed
+    evaluations are left to expire, which retries them later rather than
+    right away.
+
+        fetch   category name -> the newest `limit` feed entries past the cutoff
+        ingest  feed entry    -> normalized paper dict
+        dedupe  paper dict    -> PaperRecord for papers not yet stored (stores them)
+        author  PaperRecords  -> PaperRecords with lineup scores written, in
+                                 batches of up to 50 (or what arrived in 2s)
+        llm     PaperRecord   -> PaperRecord with LLM score written
+
+    The export is not a stage: it streams the whole table (or the rows
+    changed since the last export) and records a watermark, so it runs
+    once after the evaluation writes of the run are committed.
+
+    Pass a PipelineProfiler to capture cProfile, stack samples and
+    allocations per stage (see src/utils/profiling.py).
+    """
+
+    def __init__(self, db: PaperDatabase, config: Optional[PipelineConfig] = None,
+                 evaluator=None, writer=None, profiler=None):
+        self.db = db
+        self.config = config or PipelineConfig()
+        self.logger = logging.getLogger(__name__)
+        self._evaluator = evaluator
+        self._shared_writer = writer    # None: each run opens and closes its own
+        self._writer = writer
+        self._profiler = profiler
+        self._stopping = threading.Event()
+        self._seen_lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._lease_lock = threading.Lock()
+        self.stages: List[Stage] = []
+        from src.arxiv.evaluation_worker import default_worker_id
+        self.worker_id = default_worker_id()
+        self._reset()
+
+    def _reset(self):
+        """Clear the state of a previous run"""
+        self._seen: set = set()
+        self._ingested: set = set()   # arxiv ids stored by this run's dedupe stage
+        # Per evaluation queue: leased but not yet started, started, being
+        # evaluated right now, and finished (written) paper ids
+        self._held: Dict[str, set] = {}
+        self._started: Dict[str, set] = {}
+        self._in_flight: Dict[str, set] = {}
+        self._finished: Dict[str, set] = {}
+
+    # Public API
+    def run(self) -> Dict[str, Any]:
+        """Run the pipeline to completion and return a per-stage report"""
+        started = time.time()
+        self._reset()
+        self._writer = self._shared_writer or self.db.writer()
+        self.stages = self._build_stages()
+        if self._profiler is not None:
+            self._profiler.start()
+        threads = [
+            threading.Thread(target=self._work, args=(stage,), name=f"{stage.name}-{i}", daemon=True)
+            for stage in self.stages for i in range(stage.workers)
+        ]
+        for stage in self.stages:
+            if stage.name in EVALUATION_STAGES and self.config.backlog > 0:
+                stage.add_producer()
+                threads.append(threading.Thread(target=self._feed_backlog, args=(stage,),
+                                                name=f"{stage.name}-backlog", daemon=True))
+        heartbeat_done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(heartbeat_done,),
+                                     name='lease-heartbeat', daemon=True)
+        heartbeat.start()
+        for thread in threads:
+            thread.start()
+
+        head = self.stages[0]
+        for category in self.config.categories:
+            head.inbox.put(category)
+        for _ in range(head.workers):
+            head.inbox.put(_DONE)
+
+        try:
+            self._join(threads)
+        except KeyboardInterrupt:
+            self.logger.warning("Interrupted: finishing papers already in flight")
+            self.stop()
+            self._join(threads)
+        if self._shared_writer is None:
+            self._writer.close()
+        else:
+            self._writer.flush()
+        heartbeat_done.set()
+        heartbeat.join()
+        self._release_leases()
+
+        with self._profile('export', self._export):
+            export = self._export()
+        archive = None
+        if self.config.archive_after_days is not None:
+            archive = self.db.archive_cold_papers(self.config.archive_after_days,
+                                                  codec=self.config.archive_codec)
+        report = {
+            'stages': {stage.name: dict(stage.stats) for stage in self.stages},
+            'export': export,
+            'archive': archive,
+            'elapsed_seconds': time.time() - started
+        }
+        if self.config.llm_assess:
+            from src.llm.assessor import latency
+            report['llm_latency'] = latency.summary()
+        if self._profiler is not None:
+            report['profile'] = self._profiler.stop()
+        return report
+
+    def stop(self):
+        """Stop fetching; papers already in flight finish and are exported"""
+        self._stopping.set()
+
+    @staticmethod
+    def _join(threads: List[threading.Thread]):
+        # Short timeouts keep the main thread responsive to Ctrl-C
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+
+    # Stage wiring
+    def _build_stages(self) -> List[Stage]:
+        handlers = {
+            'fetch': self._fetch,
+            'ingest': self._ingest,
+            'dedupe': self._dedupe,
+            'author': self._evaluate_authors,
+            'llm': self._assess,
+        }
+        enabled = [name for name in STAGES
+                   if (name != 'author' or self.config.author_eval)
+                   and (name != 'llm' or self.config.llm_assess)]
+        stages = [Stage(name, handlers[name], self.config.settings(name)) for name in enabled]
+        for upstream, downstream in zip(stages, stages[1:]):
+            upstream.downstream = downstream
+            downstream.add_producer()
+        return stages
+
+    def _profile(self, stage: str, handler: Callable):
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.profile_worker(stage, handler)
+
+    def _work(self, stage: Stage):
+        try:
+            with self._profile(stage.name, stage.handler):
+                self._process(stage)
+        finally:
+            stage.worker_finished()
+
+    def _process(self, stage: Stage):
+        done = False
+        while not done:
+            item = stage.inbox.get()
+            if item is _DONE:
+                break
+            items = 1
+            if stage.batch_size is not None:
+                item, done = self._fill_batch(stage, [item])
+                items = len(item)
+            start = time.perf_counter()
+            try:
+                outputs = list(stage.handler(item) or ())
+            except Exception as e:
+                stage.record(time.perf_counter() - start, error=True, items=items)
+                self.logger.error(f"Stage {stage.name} failed on {self._describe(item)}: {str(e)}")
+                continue
+            stage.record(time.perf_counter() - start, emitted=len(outputs), items=items)
+            if stage.downstream is not None:
+                for output in outputs:
+                    stage.downstream.inbox.put(output)
+
+    @staticmethod
+    def _fill_batch(stage: Stage, batch: List[Any]):
+        """Add inbox items to batch until it is full or the window closes; True once _DONE is seen"""
+        deadline = time.monotonic() + stage.batch_window
+        while len(batch) < stage.batch_size:
+            try:
+                item = stage.inbox.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @staticmethod
+    def _describe(item: Any) -> str:
+        if isinstance(item, list):
+            return f"a batch of {len(item)}"
+        if isinstance(item, PaperRecord):
+            return item.arxiv_id
+        if isinstance(item, dict):
+            return str(item.get('id', item.get('title', '?')))
+        return repr(item)[:80]
+
+    # Evaluation queues
+    def _feed_backlog(self, stage: Stage):
+        """Claim stored papers waiting in stage's evaluation queue into its inbox"""
+        taken = 0
+        try:
+            while not self._stopping.is_set() and taken < self.config.backlog:
+                # Claim only as the stage catches up, so leases are not hoarded
+                wanted = stage.workers * (stage.batch_size or 1)
+                if stage.inbox.qsize() >= wanted:
+                    self._stopping.wait(0.1)
+                    continue
+                papers = self.db.claim_papers(stage.name, self.worker_id,
+                                              min(wanted, self.config.backlog - taken),
+                                              self.config.lease_seconds)
+                if not papers:
+                    break
+                with self._lease_lock:
+                    self._held.setdefault(stage.name, set()).update(p.local_id for p in papers)
+                # Papers this run just stored are already on their way from
+                # upstream; their lease is held here until they arrive
+                with self._seen_lock:
+                    backlog = [p for p in papers if p.arxiv_id not in self._ingested]
+                for paper in backlog:
+                    stage.inbox.put(paper)
+                taken += len(papers)
+        except Exception as e:
+            self.logger.error(f"Backlog feed for {stage.name} failed: {str(e)}")
+        finally:
+            stage.producer_finished()
+
+    def _start_evaluation(self, queue_name: str, papers: List[PaperRecord]) -> List[PaperRecord]:
+        """
+        Take the leases on papers for queue_name. Leaves out papers already
+        being evaluated (second copies from the backlog) or leased elsewhere.
+        Pair every call with _end_evaluation() on the papers it returns.
+        """
+        granted, unclaimed = [], []
+        with self._lease_lock:
+            started = self._started.setdefault(queue_name, set())
+            held = self._held.setdefault(queue_name, set())
+            for paper in papers:
+                if paper.local_id in started:
+                    continue
+                if paper.local_id in held:
+                    held.discard(paper.local_id)
+                    started.add(paper.local_id)
+                    granted.append(paper)
+                else:
+                    unclaimed.append(paper)
+        if unclaimed:
+            claimed = {p.local_id for p in self.db.claim_papers(
+                queue_name, self.worker_id, len(unclaimed), self.config.lease_seconds,
+                local_ids=[p.local_id for p in unclaimed])}
+            with self._lease_lock:
+                for paper in unclaimed:
+                    if paper.local_id in claimed and paper.local_id not in started:
+                        started.add(paper.local_id)
+                        granted.append(paper)
+        with self._lease_lock:
+            self._in_flight.setdefault(queue_name, set()).update(p.local_id for p in granted)
+        return granted
+
+    def _end_evaluation(self, queue_name: str, papers: List[PaperRecord]):
+        """Stop renewing the leases of papers whose evaluation returned or raised"""
+        with self._lease_lock:
+            self._in_flight.get(queue_name, set()).difference_update(p.local_id for p in papers)
+
+    def _finish_evaluation(self, queue_name: str, paper: PaperRecord):
+        """Mark paper's lease for release once the run's writes are committed"""
+        with self._lease_lock:
+            self._finished.setdefault(queue_name, set()).add(paper.local_id)
+
+    def _release_leases(self):
+        """Release finished and never-started leases; failed ones expire on their own"""
+        with self._lease_lock:
+            release = {name: self._finished.get(name, set()) | self._held.get(name, set())
+                       for name in EVALUATION_STAGES}
+        for queue_name, local_ids in release.items():
+            if local_ids:
+                self.db.release_papers(self.worker_id, queue_name, sorted(local_ids))
+
+    def _heartbeat(self, done: threading.Event):
+        # Only papers waiting in an inbox or being evaluated: failed ones must expire
+        while not done.wait(self.config.lease_seconds / 3):
+            with self._lease_lock:
+                renew = {name: self._held.get(name, set()) | self._in_flight.get(name, set())
+                         for name in EVALUATION_STAGES}
+            for queue_name, local_ids in renew.items():
+                if not local_ids:
+                    continue
+                try:
+                    self.db.heartbeat(self.worker_id, queue_name, self.config.lease_seconds,
+                                      sorted(local_ids))
+                except Exception as e:
+                    self.logger.warning(f"Lease heartbeat failed: {str(e)}")
+
+    # Stage handlers
+    def _fetch(self, category: str) -> Iterable[Any]:
+        import feedparser
+        if self._stopping.is_set():
+            return []
+        latest = self.db.get_latest_arxiv_timestamp(category)
+        cutoff = latest or (datetime.utcnow() - timedelta(days=self.config.days))
+        with metrics.span('feed_fetch', category=category) as span:
+            feed = feedparser.parse(ARXIV_FEED_URL_TEMPLATE.format(category))
+            span.set(outcome='error' if feed.get('bozo') else 'ok')
+        # feedparser does not raise: network and parse failures set bozo.
+        # Raising makes the failure count as a fetch error in the run report.
+        if feed.get('bozo'):
+            if not feed.entries:
+                raise RuntimeError(f"feed unavailable: {feed.get('bozo_exception')}")
+            self.logger.warning(f"Feed for {category} is malformed, using what parsed: "
+                                f"{feed.get('bozo_exception')}")
+        # The newest `limit` entries past the cutoff (feeds are not in date order)
+        fresh = [entry for entry in feed.entries
+                 if hasattr(entry, 'published_parsed')
+                 and datetime(*entry.updated_parsed[:6]) > cutoff]
+        fresh.sort(key=lambda entry: entry.updated_parsed, reverse=True)
+        return [(category, entry) for entry in fresh[:self.config.limit]]
+
+    def _ingest(self, item) -> Iterable[Dict]:
+        category, entry = item
+        paper = parse_feed_entry(entry, category)
+        return [] if paper is None else [paper]
+
+    def _dedupe(self, paper: Dict) -> Iterable[PaperRecord]:
+        with self._seen_lock:
+            # Cross-listed papers show up in several category feeds
+            if paper['id'] in self._seen:
+                return []
+            self._seen.add(paper['id'])
+        if self.db.paper_exists(paper['id']):
+            return []
+        with self._seen_lock:
+            self._ingested.add(paper['id'])
+        self.db.add_or_update_paper(paper)
+        return self.db.find_papers({'arxiv_ids': [paper['id']]}, limit=1)
+
+    def _evaluate_authors(self, papers: List[PaperRecord]) -> Iterable[PaperRecord]:
+        # Papers scored elsewhere still move on; the llm stage decides for itself
+        batch = self._start_evaluation('author', papers)
+        if not batch:
+            return papers
+
+        def provisional(record: PaperRecord):
+            self._writer.submit_author(record.arxiv_id, record.author_lineup_score,
+                                       record.author_metrics)
+        try:
+            # One call per batch: Semantic Scholar resolves it with a single request
+            updated, _ = self._get_evaluator().batch_evaluate(batch, on_progress=provisional)
+            for record in updated:
+                self._writer.submit_author(record.arxiv_id, record.author_lineup_score,
+                                           record.author_metrics)
+                # Unresolved lineups keep their lease and are retried after it expires
+                if record.author_lineup_score is not None:
+                    self._finish_evaluation('author', record)
+        finally:
+            self._end_evaluation('author', batch)
+        return papers
+
+    def _assess(self, paper: PaperRecord) -> Iterable[PaperRecord]:
+        from src.llm.assessor import assess_paper_openai, parse_relevance_score, DEFAULT_USER_INTERESTS
+        if not self._start_evaluation('llm', [paper]):
+            return []
+
+        def early_score(score: float, text: str):
+            # The score line comes first; store it before the explanation finishes streaming
+            self._writer.submit_llm(paper.arxiv_id, score, text)
+        try:
+            assessment = assess_paper_openai(
+                {'title': paper.title, 'authors': paper.authors, 'summary': paper.abstract},
+                self.config.user_interests or DEFAULT_USER_INTERESTS,
+                timeout=self.config.llm_timeout,
+                hedge_percentile=self.config.llm_hedge_percentile,
+                on_score=early_score
+            )
+            score = parse_relevance_score(assessment)
+            if score is not None:
+                paper.llm_relevance_score = score
+                paper.llm_explanation = assessment
+                self._writer.submit_llm(paper.arxiv_id, score, assessment)
+                self._finish_evaluation('llm', paper)
+        finally:
+            self._end_evaluation('llm', [paper])
+        return [paper]
+
+    def _export(self) -> Optional[Dict[str, Any]]:
+        if not self.config.export_path:
+            return None
+        return self.db.export(self.config.export_path,
+                              since='last' if self.config.delta_export else None)
+
+    def _get_evaluator(self):
+        if self._evaluator is None:
+            with self._init_lock:
+                if self._evaluator is None:
+                    self._evaluator = build_author_evaluator(self.db, self.config)
+        return self._evaluator
+
+
+def build_author_evaluator(db: PaperDatabase, config: PipelineConfig):
+    """AuthorLineupEvaluator configured for config (imported on first use)"""
+    from src.arxiv.author_lineup_evaluator import AuthorLineupEvaluator
+    graph = None
+    if config.coauthor_graph:
+        from src.arxiv.coauthor_graph import CoauthorGraph
+        graph = CoauthorGraph(db.db_path)
+    return AuthorLineupEvaluator(coauthor_graph=graph)
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a pipeline run report"""
+    print("\n=== Pipeline Report ===")
+    print(f"Elapsed: {report['elapsed_seconds']:.1f}s")
+    print(f"{'stage':<8} {'in':>6} {'out':>6} {'errors':>6} {'busy s':>8}")
+    for name, stats in report['stages'].items():
+        print(f"{name:<8} {stats['processed']:>6} {stats['emitted']:>6} "
+              f"{stats['errors']:>6} {stats['busy_seconds']:>8.1f}")
+    if report.get('export'):
+        export = report['export']
+        print(f"\nExported {export['rows']} rows to {export['path']}")
+    if report.get('archive'):
+        archive = report['archive']
+        print(f"Archived {archive['values']} texts of {archive['papers']} papers "
+              f"({archive['bytes_before'] / 1024:.0f} KiB -> {archive['bytes_after'] / 1024:.0f} KiB), "
+              f"{archive.get('pages_freed', 0)} pages freed")
+    if report.get('llm_latency'):
+        print("\n=== LLM latency (s) ===")
+        for model, summary in report['llm_latency'].items():
+            print(f"{model}: n={summary['count']} " + ' '.join(
+                f"{q}={summary[q]:.2f}" for q in ('p50', 'p90', 'p95', 'p99')))
+    if report.get('profile'):
+        print("\n=== Profile (top cumulative per stage) ===")
+        for name, profile in report['profile'].items():
+            # Skip the worker loop itself, which always tops the cumulative list
+            top = [f for f in profile.get('top_functions', []) if '(_process)' not in f['function']]
+            top = top[0] if top else {}
+            print(f"{name:<8} {top.get('function', '-')} "
+                  f"{top.get('cumtime', 0):.2f}s  -> {profile.get('pstats', '')}")
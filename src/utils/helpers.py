@@ -1 +1,19 @@
 # helpers.py
+import re
+from typing import Iterable, List
+
+_AUTHOR_SEPARATOR = re.compile(r',\s*|\s+and\s+')
+
+
+def split_author_names(names: Iterable[str]) -> List[str]:
+    """
+    Split feed author entries into individual names. arXiv's RSS feed puts
+    the whole lineup into a single dc:creator ("A, B and C").
+    """
+    authors = []
+    for name in names:
+        for part in _AUTHOR_SEPARATOR.split(name or ''):
+            part = part.strip()
+            if part and part not in authors:
+                authors.append(part)
+    return authors
@@ -0,0 +1,234 @@
+# metrics.py
+"""
+Lightweight in-process metrics: counters, gauges, histograms and timing
+spans. Disabled by default; while disabled every call returns immediately
+(span() hands back a shared no-op context manager), so instrumentation can
+stay on hot paths. Enable with metrics.enable() or ARXIV_METRICS=1.
+
+    with metrics.span('scholar_lookup'):
+        ...
+    metrics.inc('scholar_fallbacks')
+    metrics.observe('db_group_commit_size', 12, buckets=COUNT_BUCKETS)
+    metrics.write_files('metrics.json', 'arxiv.prom')
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+import functools, json, os, threading, time
+
+# Upper bounds (seconds) of histogram buckets; covers sub-ms DB calls to
+# multi-minute rate-limit waits
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+# Upper bounds for histograms of item counts (batch sizes and the like)
+COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **labels):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('registry', 'name', 'labels', 'start')
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, labels: Dict[str, Any]):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.labels.setdefault('outcome', 'error')
+        self.registry.observe(f"{self.name}_seconds", time.perf_counter() - self.start, **self.labels)
+        return False
+
+    def set(self, **labels):
+        """Attach labels known only after the work started (e.g. outcome)"""
+        self.labels.update(labels)
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', 'min', 'max')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {'count': self.count, 'sum': self.sum,
+                'min': self.min if self.count else None, 'max': self.max if self.count else None,
+                'mean': self.sum / self.count if self.count else None, 'buckets': buckets}
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    # Recording
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increment a counter"""
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to its current value"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._key(labels)] = value
+
+    def observe(self, name: str, value: float, buckets: Optional[Tuple[float, ...]] = None,
+                **labels):
+        """Add a sample to a histogram; buckets (default: the registry's) apply to a new series"""
+        if not self.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(buckets or self.buckets)
+            histogram.observe(value)
+
+    def span(self, name: str, **labels):
+        """Context manager recording the elapsed time into <name>_seconds"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, labels)
+
+    def timed(self, name: str, **labels) -> Callable:
+        """Decorator form of span()"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, name, dict(labels)):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    # Export
+    def snapshot(self) -> Dict[str, Any]:
+        """All series as plain data"""
+        def series(store, convert):
+            return {name: [{'labels': dict(key), **convert(value)} for key, value in values.items()]
+                    for name, values in store.items()}
+        with self._lock:
+            return {
+                'generated_at': time.time(),
+                'counters': series(self._counters, lambda v: {'value': v}),
+                'gauges': series(self._gauges, lambda v: {'value': v}),
+                'histograms': series(self._histograms, lambda h: h.to_dict()),
+            }
+
+    def write_files(self, json_path: Optional[str] = None, prom_path: Optional[str] = None):
+        """Write whichever of the JSON and Prometheus files has a path"""
+        if json_path:
+            self.write_json(json_path)
+        if prom_path:
+            self.write_prometheus(prom_path)
+
+    def write_json(self, path: str):
+        self._atomic_write(path, json.dumps(self.snapshot(), indent=2))
+
+    def write_prometheus(self, path: str, prefix: str = 'arxiv_'):
+        """Write the node_exporter textfile-collector format"""
+        self._atomic_write(path, self.to_prometheus(prefix))
+
+    def to_prometheus(self, prefix: str = 'arxiv_') -> str:
+        def labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(key) + ([extra] if extra else [])
+            if not pairs:
+                return ''
+            escaped = (v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+            return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+        lines = []
+        with self._lock:
+            for name, values in sorted(self._counters.items()):
+                lines.append(f"# TYPE {prefix}{name}_total counter")
+                lines += [f"{prefix}{name}_total{labels(k)} {v}" for k, v in values.items()]
+            for name, values in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {prefix}{name} gauge")
+                lines += [f"{prefix}{name}{labels(k)} {v}" for k, v in values.items()]
+            for name, values in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for key, histogram in values.items():
+                    cumulative = 0
+                    for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                        cumulative += count
+                        lines.append(f"{prefix}{name}_bucket{labels(key, ('le', str(bound)))} {cumulative}")
+                    lines.append(f"{prefix}{name}_sum{labels(key)} {histogram.sum}")
+                    lines.append(f"{prefix}{name}_count{labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _atomic_write(path: str, content: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+# Process-wide registry used by all instrumentation
+metrics = MetricsRegistry(enabled=os.getenv('ARXIV_METRICS', '') not in ('', '0'))
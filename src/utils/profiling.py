@@ -0,0 +1,237 @@
+# profiling.py
+"""
+Opt-in profiling of pipeline stages. Every stage worker thread runs under
+its own cProfile profiler, a sampling thread records the Python stacks of
+the workers, and tracemalloc tracks allocations. A tracemalloc snapshot is
+taken when profiling starts (the baseline) and once per stage, as its last
+worker finishes: attributing a snapshot to a stage walks every live trace,
+so it is not repeated while the stages run. stop() writes, per stage:
+
+    <stage>.pstats      merged cProfile stats (python -m pstats, snakeviz)
+    <stage>.collapsed   collapsed stacks, flamegraph.pl / speedscope ready
+    <stage>.alloc.txt   allocation sites of the stage's code as it finished,
+                        with their growth over the baseline
+
+plus profile_summary.json with the top functions and allocation sites.
+Time spent blocked (queue waits, locks, sleeps) is left out of the top
+functions; the .pstats files still have it.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import cProfile, io, json, logging, os, pstats, sys, threading, tracemalloc
+
+CodeRange = Tuple[str, int, int]
+
+# Standard library functions that block a worker on a queue, lock, event or
+# future; their cumulative time is waiting, not work
+_STDLIB_DIR = os.path.dirname(threading.__file__)
+_BLOCKING_CALLS = {('queue.py', 'get'), ('queue.py', 'put'), ('threading.py', 'wait'),
+                   ('threading.py', 'join'), ('threading.py', 'acquire'), ('_base.py', 'result')}
+_BLOCKING_BUILTINS = {"<method 'acquire' of '_thread.lock' objects>",
+                      "<method 'acquire' of '_thread.RLock' objects>",
+                      '<built-in method time.sleep>'}
+
+
+def _is_blocking(filename: str, name: str) -> bool:
+    if name in _BLOCKING_BUILTINS:
+        return True
+    if not filename.startswith(_STDLIB_DIR):
+        return False
+    return (os.path.basename(filename), name) in _BLOCKING_CALLS
+
+
+def _code_range(fn: Callable) -> Optional[CodeRange]:
+    code = getattr(getattr(fn, '__func__', fn), '__code__', None)
+    if code is None:
+        return None
+    lines = [line for _, _, line in code.co_lines() if line is not None]
+    return code.co_filename, min(lines, default=code.co_firstlineno), max(lines, default=code.co_firstlineno)
+
+
+class PipelineProfiler:
+    """
+    Collects per-stage profiles for one pipeline run.
+
+        profiler = PipelineProfiler('profiles/')
+        PipelineRunner(db, config, profiler=profiler).run()
+        summary = profiler.stop()
+    """
+
+    def __init__(self, output_dir: str, sample_interval: float = 0.005,
+                 trace_frames: int = 64, top: int = 25):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.trace_frames = trace_frames
+        self.top = top
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, List[cProfile.Profile]] = {}
+        self._stacks: Dict[str, Counter] = {}
+        self._code: Dict[str, List[CodeRange]] = {}
+        self._threads: Dict[int, str] = {}
+        self._workers: Counter = Counter()   # stage -> workers currently running
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        # stage -> snapshot taken as its last worker finished
+        self._snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        """Start allocation tracing and the stack sampler"""
+        if self._sampler is not None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracemalloc = True
+        self._baseline = tracemalloc.take_snapshot()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._sampler.start()
+
+    @contextmanager
+    def profile_worker(self, stage: str, handler: Optional[Callable] = None):
+        """Profile the calling thread as part of stage until the block exits"""
+        profile: Optional[cProfile.Profile] = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows only one active cProfile at a time
+            self.logger.warning(f"cProfile busy, {stage} worker runs unprofiled")
+            profile = None
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = stage
+            self._workers[stage] += 1
+            code = _code_range(handler) if handler is not None else None
+            ranges = self._code.setdefault(stage, [])
+            if code is not None and code not in ranges:
+                ranges.append(code)
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            with self._lock:
+                self._workers[stage] -= 1
+                last = self._workers[stage] == 0
+            if last and tracemalloc.is_tracing():
+                # What the stage still holds as it finishes (e.g. its output queued downstream)
+                snapshot = tracemalloc.take_snapshot()
+                with self._lock:
+                    self._snapshots[stage] = snapshot
+            with self._lock:
+                self._threads.pop(ident, None)
+                if profile is not None:
+                    self._profiles.setdefault(stage, []).append(profile)
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop sampling and tracing, write the per-stage files and return the summary"""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary: Dict[str, Any] = {}
+        for stage in sorted(set(self._profiles) | set(self._stacks) | set(self._code)):
+            summary[stage] = {
+                **self._write_pstats(stage),
+                **self._write_collapsed(stage),
+                **self._write_allocations(stage),
+            }
+        with open(os.path.join(self.output_dir, 'profile_summary.json'), 'w') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    # Stack sampling
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, stage in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self._stacks.setdefault(stage, Counter())[';'.join(reversed(stack))] += 1
+
+    # Allocation snapshots
+    def _stage_sites(self, stage: str, snapshot: tracemalloc.Snapshot) -> Dict[Tuple[str, int], List[int]]:
+        """(filename, line) -> [bytes, blocks] of live allocations made under the stage's handler"""
+        ranges = self._code.get(stage) or []
+
+        def in_stage(traceback: tracemalloc.Traceback) -> bool:
+            return any(frame.filename == filename and first <= frame.lineno <= last
+                       for frame in traceback for filename, first, last in ranges)
+
+        sites: Dict[Tuple[str, int], List[int]] = {}
+        for trace in snapshot.traces:
+            if in_stage(trace.traceback):
+                frame = trace.traceback[-1]   # most recent frame: where the allocation happened
+                site = sites.setdefault((frame.filename, frame.lineno), [0, 0])
+                site[0] += trace.size
+                site[1] += 1
+        return sites
+
+    # Output
+    def _write_pstats(self, stage: str) -> Dict[str, Any]:
+        profiles = self._profiles.get(stage)
+        if not profiles:
+            return {}
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        path = os.path.join(self.output_dir, f"{stage}.pstats")
+        stats.dump_stats(path)
+
+        top = []
+        working = [item for item in stats.stats.items() if not _is_blocking(item[0][0], item[0][2])]
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in sorted(
+                working, key=lambda item: item[1][3], reverse=True)[:self.top]:
+            top.append({'function': f"{os.path.basename(filename)}:{line}({name})",
+                        'calls': calls, 'tottime': round(tottime, 6), 'cumtime': round(cumtime, 6)})
+        return {'pstats': path, 'workers': len(profiles), 'top_functions': top}
+
+    def _write_collapsed(self, stage: str) -> Dict[str, Any]:
+        stacks = self._stacks.get(stage)
+        if not stacks:
+            return {}
+        path = os.path.join(self.output_dir, f"{stage}.collapsed")
+        with open(path, 'w') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return {'collapsed': path, 'samples': sum(stacks.values())}
+
+    def _write_allocations(self, stage: str) -> Dict[str, Any]:
+        snapshot = self._snapshots.get(stage)
+        if snapshot is None or not self._code.get(stage):
+            return {}
+        baseline = self._stage_sites(stage, self._baseline) if self._baseline is not None else {}
+        sites = self._stage_sites(stage, snapshot)
+        top = [(filename, line, size, size - baseline.get((filename, line), [0])[0], count)
+               for (filename, line), (size, count) in sorted(
+                   sites.items(), key=lambda item: item[1][0], reverse=True)[:self.top]]
+
+        path = os.path.join(self.output_dir, f"{stage}.alloc.txt")
+        out = io.StringIO()
+        out.write(f"{'held at end':>14} {'vs baseline':>14} {'blocks':>8}  site\n")
+        for filename, line, size, growth, count in top:
+            out.write(f"{size / 1024:10.1f} KiB {growth / 1024:+10.1f} KiB {count:8d}  {filename}:{line}\n")
+        with open(path, 'w') as f:
+            f.write(out.getvalue())
+        return {'allocations': path,
+                'held_kib': round(sum(size for size, _ in sites.values()) / 1024, 1),
+                'top_allocations': [{'site': f"{os.path.basename(filename)}:{line}",
+                                     'kib': round(size / 1024, 1), 'growth_kib': round(growth / 1024, 1),
+                                     'blocks': count}
+                                    for filename, line, size, growth, count in top]}
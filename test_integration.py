@@ -1,17 +1,34 @@
 # test_integration.py
 import pytest
-from datetime import datetime
-from paper_database import PaperDatabase
-from author_lineup_evaluator import AuthorLineupEvaluator
+from unittest import mock
+from datetime import datetime, timedelta
+from src.arxiv.paper_database import PaperDatabase, PaperFilter
+from src.arxiv.author_lineup_evaluator import AuthorLineupEvaluator
+from src.arxiv.semantic_scholar import SemanticScholarClient
+from src.arxiv.coauthor_graph import CoauthorGraph
+from src.arxiv.evaluation_worker import EvaluationWorker
+from src.arxiv.proxy_pool import ProxyEndpoint, ProxyPool
+from src.arxiv.query_service import QueryService
+from benchmarks.fakes import (FakeSemanticScholarServer, fake_feedparser, fake_openai, fake_scholar,
+                              synthetic_feed, synthetic_papers)
+from src.pipeline.runner import PipelineConfig, PipelineRunner
+from src.pipeline.daemon import PaperDaemon
+from src.llm import assessor
 
 @pytest.fixture
-def test_db():
-    """Fixture for temporary in-memory database"""
-    db = PaperDatabase(":memory:")
+def test_db(tmp_path):
+    """Fixture for a temporary on-disk database (each sqlite3 connection to
+    ':memory:' would see a different empty database)"""
+    db = PaperDatabase(str(tmp_path / "papers.db"))
     yield db
-    # Teardown happens automatically for in-memory DB
 
-def test_author_evaluation_flow(test_db):
+@pytest.fixture
+def scholar():
+    """Offline Google Scholar: no proxies, no rate-limit sleeps"""
+    with fake_scholar() as fake:
+        yield fake
+
+def test_author_evaluation_flow(test_db, scholar):
     """End-to-end test of author evaluation pipeline"""
     # 1. Add test paper
     test_data = {
@@ -24,7 +41,7 @@ def test_author_evaluation_flow(test_db):
     test_db.add_or_update_paper(test_data)
     
     # 2. Verify paper exists without evaluation
-    papers = test_db.get_unevaluated_papers()
+    papers = test_db.get_author_evaluation_queue()
     assert len(papers) == 1
     assert papers[0].author_lineup_score is None
     
@@ -37,6 +54,7 @@ def test_author_evaluation_flow(test_db):
     assert updated[0].author_lineup_score is not None
     assert isinstance(updated[0].author_metrics, dict)
     assert stats['total_evaluated'] == 1
+    assert scholar.calls == 2
     
     # 5. Verify database update
     test_db.update_author_evaluation(
@@ -44,5 +62,758 @@ def test_author_evaluation_flow(test_db):
         updated[0].author_lineup_score,
         updated[0].author_metrics
     )
-    updated_paper = test_db.get_unevaluated_papers()
-    assert len(updated_paper) == 0  # Should now be evaluated
\ No newline at end of file
+    updated_paper = test_db.get_author_evaluation_queue()
+    assert len(updated_paper) == 0  # Should now be evaluated
+    assert len(test_db.get_unevaluated_papers()) == 1  # Still awaiting user review
+    assert test_db.get_stats()['author_evaluated'] == 1
+
+def test_delta_export_does_not_repeat_rows(test_db, tmp_path):
+    """Consecutive delta exports write each change once, even when db_updated values tie"""
+    import csv, sqlite3
+    for i in range(3):
+        test_db.add_or_update_paper({'id': f'2401.0005{i}', 'title': f'Paper {i}', 'authors': ['A'],
+                                     'abstract': '', 'updated': datetime(2024, 1, 1 + i).isoformat()})
+    with sqlite3.connect(test_db.db_path) as conn:   # rows written before millisecond timestamps
+        conn.execute("UPDATE papers SET db_updated = '2024-06-01 12:00:00'")
+    path = str(tmp_path / 'delta.csv')
+
+    def exported():
+        with open(path, newline='') as f:
+            return [row['arxiv_id'] for row in csv.DictReader(f)]
+
+    assert test_db.export(path, since='last')['rows'] == 3
+    assert test_db.export(path, since='last')['rows'] == 0
+    test_db.update_user_evaluation('2401.00051', 5, 'ok')
+    report = test_db.export(path, since='last')
+    # The delta is appended after the full export
+    assert exported() == ['2401.00052', '2401.00051', '2401.00050', '2401.00051']
+    assert len(report['watermark']) == len('2024-06-01 12:00:00.000')
+    assert test_db.export(path, since='last')['rows'] == 0
+    assert test_db.export(path, since='2024-06-01 12:00:00')['rows'] == 3   # explicit bound is inclusive
+
+def test_export_columns_and_separate_deltas(test_db, tmp_path):
+    """Exports carry every papers column; Parquet deltas do not replace the full file"""
+    import pyarrow.parquet as pq
+    test_db.add_or_update_paper({'id': '2401.00061', 'title': 'Paper', 'authors': ['A', 'B'],
+                                 'abstract': '', 'updated': datetime(2024, 1, 1).isoformat()})
+    path = str(tmp_path / 'papers.parquet')
+    full = test_db.export(path, since='last')
+    table = pq.read_table(path)
+    assert full['path'] == path and table.num_rows == 1
+    assert {'category', 'combined_score', 'author_prestige', 'author_coverage'} <= set(table.column_names)
+    assert table.column_names[:4] == ['local_id', 'arxiv_id', 'title', 'authors']
+
+    test_db.update_user_evaluation('2401.00061', 5, 'ok')
+    delta = test_db.export(path, since='last')
+    assert delta['path'] != path and delta['target'] == path
+    assert pq.read_table(delta['path']).column('user_relevance_score').to_pylist() == [5.0]
+    assert pq.read_table(path).num_rows == 1
+    assert test_db.export(path, since='last')['rows'] == 0   # watermark kept for the target
+
+def test_iter_papers_pages_filters_and_lazy_fields(test_db):
+    """Keyset pages join up without gaps; heavy fields load on access or in one batch"""
+    for i in range(5):
+        test_db.add_or_update_paper({'id': f'2401.0007{i}', 'title': f'Paper {i}', 'authors': [f'A{i}'],
+                                     'abstract': f'Abstract {i}', 'updated': datetime(2024, 1, 1 + i).isoformat()})
+    for i in (1, 3, 4):
+        test_db.update_llm_evaluation(f'2401.0007{i}', float(i), f'Explanation {i}')
+
+    # batch_size 2 splits the five rows over three pages
+    papers = list(test_db.iter_papers(batch_size=2))
+    assert [p.title for p in papers] == [f'Paper {i}' for i in range(5)]
+    assert [p.authors for p in papers] == [[f'A{i}'] for i in range(5)]
+    filtered = test_db.iter_papers(PaperFilter(llm_evaluated=True, since=datetime(2024, 1, 3)),
+                                   batch_size=1)
+    assert [p.title for p in filtered] == ['Paper 3', 'Paper 4']
+
+    lazy = papers[1]
+    assert not lazy.is_loaded
+    assert lazy.llm_explanation == 'Explanation 1' and lazy.is_loaded
+    assert lazy.abstract == 'Abstract 1'
+    eager = next(test_db.iter_papers({'arxiv_ids': ['2401.00071']}, lazy=False))
+    assert eager.is_loaded and eager == lazy
+
+    # One query per two records instead of one per record on first access
+    rest = [p for p in papers if not p.is_loaded]
+    test_db.load_heavy_fields(rest, batch_size=2)
+    assert all(p.is_loaded for p in rest)
+    assert [p.abstract for p in rest] == ['Abstract 0', 'Abstract 2', 'Abstract 3', 'Abstract 4']
+    assert rest[2].llm_explanation == 'Explanation 3'
+
+def test_queue_queries_use_partial_indexes(test_db):
+    """Every queue read walks its partial index in queue order: no table scan, no sort"""
+    import sqlite3
+    connect, statements = sqlite3.connect, []
+    def tracing_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+    with mock.patch('sqlite3.connect', tracing_connect):
+        for queue in ('author', 'llm', 'user'):
+            test_db._dequeue(queue, 10)
+            test_db.claim_papers(queue, 'w', 10)
+            test_db.claim_papers(queue, 'w', 10, local_ids=[1, 2])
+    selects = [sql for sql in statements if 'FROM papers' in sql]
+    assert len(selects) == 9
+
+    with sqlite3.connect(test_db.db_path) as conn:
+        for sql in selects:
+            queue = next(q for q in ('author', 'llm', 'user') if f'idx_{q}_queue' in sql)
+            plan = ' | '.join(row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql))
+            assert f'SCAN papers USING INDEX idx_{queue}_queue' in plan, plan
+            assert 'TEMP B-TREE' not in plan, plan
+
+def test_evaluation_worker_leases(test_db):
+    """Failed batches keep their leases until they expire; heartbeats extend them"""
+    for i in range(3):
+        test_db.add_or_update_paper({'id': f'2401.0001{i}', 'title': f'Paper {i}', 'authors': ['A'],
+                                     'abstract': '', 'updated': datetime(2024, 1, 1, i).isoformat()})
+    now = [1000.0]
+    with mock.patch('time.time', lambda: now[0]):
+        def fail(papers):
+            raise RuntimeError('sources down')
+        worker = EvaluationWorker(test_db, 'author', fail, worker_id='a', batch_size=2, lease_seconds=60)
+        assert worker.run(max_batches=1, poll_interval=0)['errors'] == 1
+
+        # The failed batch stays claimed: another worker only gets the third paper
+        assert [p.title for p in test_db.claim_papers('author', 'b', 10, 60)] == ['Paper 2']
+        now[0] = 1050
+        assert test_db.heartbeat('a', 'author', 60) == 2      # now expires at 1110
+        now[0] = 1100                                          # 'b' did not renew
+        assert [p.title for p in test_db.claim_papers('author', 'c', 10, 60)] == ['Paper 2']
+        now[0] = 1111
+        assert test_db.reclaim_expired_leases('author') == 2
+        reclaimed = test_db.claim_papers('author', 'c', 10, 60)
+        assert [p.title for p in reclaimed] == ['Paper 0', 'Paper 1']
+
+        # A successful batch releases its leases
+        test_db.release_papers('c', 'author')
+        def score(papers):
+            for paper in papers:
+                test_db.update_author_evaluation(paper.arxiv_id, 1.0, {})
+        stats = EvaluationWorker(test_db, 'author', score, worker_id='c').run()
+        assert stats == {'batches': 1, 'papers': 3, 'errors': 0}
+        assert test_db.release_papers('c', 'author') == 0
+
+def test_heartbeat_keeps_only_the_current_batch(test_db):
+    """Leases of a failed batch expire while the worker heartbeats its next one"""
+    import time
+    for i in range(3):
+        test_db.add_or_update_paper({'id': f'2401.0002{i}', 'title': f'Paper {i}', 'authors': ['A'],
+                                     'abstract': '', 'updated': datetime(2024, 1, 1, i).isoformat()})
+    batches, stolen = [], []
+    def process(papers):
+        batches.append([p.title for p in papers])
+        if len(batches) == 1:
+            raise RuntimeError('sources down')
+        time.sleep(0.6)                     # past the failed batch's 0.4 s lease
+        stolen.extend(p.title for p in test_db.claim_papers('author', 'b', 10, 60))
+    worker = EvaluationWorker(test_db, 'author', process, worker_id='a', batch_size=2,
+                              lease_seconds=0.4, heartbeat_interval=0.05)
+    assert worker.run(max_batches=2, poll_interval=0.01)['errors'] == 1
+    assert batches == [['Paper 0', 'Paper 1'], ['Paper 2']]
+    # The failed papers were free for another worker; the renewed one was not
+    assert stolen == ['Paper 0', 'Paper 1']
+
+def test_evaluation_writer_group_commit(test_db):
+    """Updates commit in groups; close() drains them; failures reach the Futures"""
+    import sqlite3, threading
+    for i in range(5):
+        test_db.add_or_update_paper({'id': f'2401.0003{i}', 'title': f'Paper {i}', 'authors': ['A'],
+                                     'abstract': '', 'updated': datetime(2024, 1, 1 + i).isoformat()})
+    writer = test_db.writer(max_batch=3, max_delay=30)
+    full = [writer.submit_llm(f'2401.0003{i}', i, 'ok') for i in range(3)]
+    assert all(future.result(5) for future in full)          # a full batch commits at once
+    pending = writer.submit_llm('2401.00033', 3, 'ok')
+    assert not pending.done()                                 # waits for more or the delay
+    assert writer.flush(5) and pending.result(0)
+    assert writer.stats() == {'updates': 4, 'transactions': 2, 'errors': 0}
+
+    with pytest.raises(TypeError):                           # serialized by the caller
+        writer.submit_author('2401.00030', 0.5, {'not json': object()})
+    with mock.patch.object(test_db, '_apply_evaluations', side_effect=sqlite3.OperationalError('locked')):
+        failed = writer.submit_author('2401.00030', 0.5, {})
+        assert writer.flush(5)
+    assert isinstance(failed.exception(0), sqlite3.OperationalError)
+
+    # An update cancelled while it waits in the queue is dropped, not written
+    started, release = threading.Event(), threading.Event()
+    apply = test_db._apply_evaluations
+    def blocked(*args):
+        started.set()
+        release.wait(5)
+        return apply(*args)
+    with mock.patch.object(test_db, '_apply_evaluations', side_effect=blocked):
+        first = writer.submit_user('2401.00030', 1, 'ok')
+        writer.flush(0)                                       # commit it now, without waiting
+        assert started.wait(5)
+        cancelled = writer.submit_user('2401.00031', 1, 'never')
+        assert cancelled.cancel() and not first.cancel()
+        release.set()
+        assert writer.flush(5) and first.result(0)
+    assert test_db.get_stats()['user_evaluated'] == 1
+    drained = writer.submit_llm('2401.00034', 4, 'ok')
+    writer.close()
+    assert drained.result(0)
+    assert test_db.get_stats()['llm_evaluated'] == 5
+    with pytest.raises(RuntimeError):
+        writer.submit_llm('2401.00030', 1, 'too late')
+    assert writer.flush(1)
+
+def test_trigger_stats_match_rebuild(test_db):
+    """Trigger-maintained statistics agree with a full recount after every kind of change"""
+    import sqlite3
+    for i in range(6):
+        test_db.add_or_update_paper({'id': f'2401.0002{i}', 'title': f'Paper {i}', 'authors': ['A'],
+                                     'abstract': '', 'updated': datetime(2024, 1, 1 + i).isoformat(),
+                                     'category': 'cs.AI' if i % 2 else 'math.OC'})
+    # Upsert with a new category and title; scores set, changed and cleared
+    test_db.add_or_update_paper({'id': '2401.00020', 'title': 'Paper 0 v2', 'authors': ['A', 'B'],
+                                 'abstract': '', 'updated': datetime(2024, 2, 1).isoformat(),
+                                 'category': 'cs.LG'})
+    test_db.update_author_evaluation('2401.00021', 0.4, {})
+    test_db.update_author_evaluation('2401.00021', 0.6, {})
+    test_db.update_llm_evaluation('2401.00022', 7, 'ok')
+    test_db.update_user_evaluation('2401.00023', 9, 'great')
+    with sqlite3.connect(test_db.db_path) as conn:
+        conn.execute("UPDATE papers SET llm_relevance_score = NULL WHERE arxiv_id = '2401.00022'")
+        conn.execute("UPDATE papers SET category = 'cs.AI' WHERE arxiv_id = '2401.00024'")
+        # Deleting the newest and the oldest paper moves both bounds
+        conn.execute("DELETE FROM papers WHERE arxiv_id IN ('2401.00020', '2401.00021')")
+
+    stats = test_db.get_stats()
+    assert stats['total_papers'] == 4
+    assert stats == test_db.rebuild_stats()
+
+def test_author_metric_filters(test_db):
+    """Lineup filters match the stored metrics, and re-ingesting a paper keeps them"""
+    def add(arxiv_id, authors, day):
+        test_db.add_or_update_paper({'id': arxiv_id, 'title': arxiv_id, 'authors': authors,
+                                     'abstract': '', 'updated': datetime(2024, 1, day).isoformat()})
+    def lineup(prestige, industry, coverage, h_indexes):
+        return {'components': {'prestige': prestige, 'balance': 0.5, 'industry': industry,
+                               'size_penalty': 0.1},
+                'coverage': coverage,
+                'authors': {name: {'h_index': h, 'source': 'Google Scholar', 'is_industry': industry > 0}
+                            for name, h in h_indexes.items()}}
+    add('2401.00081', ['Ada', 'Bob'], 1)
+    add('2401.00082', ['Cy'], 2)
+    add('2401.00083', ['Dee'], 3)                       # not evaluated
+    test_db.update_author_evaluation('2401.00081', 0.8, lineup(0.8, 1.0, 1.0, {'Ada': 40, 'Bob': 5}))
+    test_db.update_author_evaluation('2401.00082', 0.3, lineup(0.2, 0.0, 0.5, {'Cy': 10}))
+
+    def found(**filter):
+        return [p.arxiv_id for p in test_db.find_papers(filter)]
+    assert found(min_prestige=0.5) == ['2401.00081']
+    assert found(has_industry=True) == ['2401.00081']
+    assert found(has_industry=False) == ['2401.00082']
+    assert found(min_author_h_index=30) == ['2401.00081']
+    assert found(min_author_h_index=10) == ['2401.00082', '2401.00081']
+    assert found(min_author_coverage=1.0) == ['2401.00081']
+
+    # The feed lists the paper again, then with a changed lineup
+    add('2401.00081', ['Ada', 'Bob'], 1)
+    assert found(min_author_h_index=30) == ['2401.00081']
+    add('2401.00081', ['Eve', 'Bob', 'Ada'], 1)
+    assert found(min_author_h_index=30) == ['2401.00081']
+    assert test_db.find_papers({'arxiv_ids': ['2401.00081']})[0].authors == ['Eve', 'Bob', 'Ada']
+    assert test_db.get_author_stats('Ada')['h_index'] == 40 and test_db.get_author_stats('Ada')['is_industry']
+
+def test_combined_score_follows_scores_and_weights(test_db):
+    """combined_score is refreshed by triggers and weight changes; top_papers reads its index"""
+    import sqlite3
+    for arxiv_id, category in (('2401.00040', 'cs.AI'), ('2401.00041', 'cs.AI'), ('2401.00042', 'cs.LG')):
+        test_db.add_or_update_paper({'id': arxiv_id, 'title': 'T', 'authors': ['A'], 'abstract': '',
+                                     'updated': datetime(2024, 1, 1).isoformat(), 'category': category})
+
+    def combined():
+        with sqlite3.connect(test_db.db_path) as conn:
+            return dict(conn.execute('SELECT arxiv_id, round(combined_score, 4) FROM papers'))
+
+    test_db.update_llm_evaluation('2401.00040', 8, 'ok')
+    test_db.update_llm_evaluation('2401.00041', 6, 'ok')
+    assert combined() == {'2401.00040': 0.8, '2401.00041': 0.6, '2401.00042': None}
+    test_db.update_author_evaluation('2401.00040', 0.4, {})     # (0.3*0.8 + 0.2*0.4) / 0.5
+    assert combined()['2401.00040'] == 0.64
+    assert [p.arxiv_id for p in test_db.top_papers(5)] == ['2401.00040', '2401.00041']
+
+    test_db.set_ranking_weights(llm=0.1, author=0.9)            # 0.1*0.8 + 0.9*0.4
+    assert combined() == {'2401.00040': 0.44, '2401.00041': 0.6, '2401.00042': None}
+    assert [p.arxiv_id for p in test_db.top_papers(5)] == ['2401.00041', '2401.00040']
+
+    # The queries top_papers sends are answered from the partial indexes
+    statements = []
+    connect = sqlite3.connect
+    def traced(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+    with mock.patch('sqlite3.connect', traced):
+        test_db.top_papers(5)
+        test_db.top_papers(5, category='cs.AI')
+    queries = [s for s in statements if 'ORDER BY combined_score' in s]
+    with sqlite3.connect(test_db.db_path) as conn:
+        plans = [' '.join(row[-1] for row in conn.execute(f'EXPLAIN QUERY PLAN {q}')) for q in queries]
+    assert 'USING INDEX idx_combined_score' in plans[0]
+    assert 'USING INDEX idx_category_combined_score' in plans[1]
+    assert not any('TEMP B-TREE' in plan for plan in plans)
+
+def test_pipeline_evaluates_backlog_and_new_papers(test_db, scholar):
+    """Stored papers still waiting for author lookup are evaluated next to fresh ones"""
+    test_db.add_or_update_paper({
+        'id': 'oai:arXiv.org:2401.00001v1',
+        'title': 'Left Over From A Crashed Run',
+        'authors': ['Backlog Author'],
+        'abstract': 'Test abstract',
+        'updated': (datetime.utcnow() - timedelta(days=30)).isoformat()
+    })
+    feed = synthetic_feed(3, start=datetime.utcnow() - timedelta(days=1))
+    config = PipelineConfig(categories=['cs.AI'], export_path=None)
+    with fake_feedparser({'cs.AI': feed}):
+        report = PipelineRunner(test_db, config).run()
+
+    assert report['stages']['dedupe']['emitted'] == 3
+    assert report['stages']['author']['processed'] == 4
+    assert test_db.get_author_evaluation_queue() == []
+    assert test_db.get_stats()['author_evaluated'] == 4
+    # Finished papers are not left leased
+    assert test_db.claim_papers('author', 'other', 10) == []
+    assert test_db.release_papers(PipelineRunner(test_db).worker_id, 'author') == 0
+
+def test_pipeline_limit_keeps_newest_and_reruns(test_db, scholar):
+    """The per-feed limit keeps the newest entries; a runner can run more than once"""
+    start = datetime.utcnow() - timedelta(days=1)
+    feed = synthetic_feed(5, start=start)               # oldest entry first
+    config = PipelineConfig(categories=['cs.AI'], export_path=None, backlog=0, limit=2)
+    runner = PipelineRunner(test_db, config)
+    with fake_feedparser({'cs.AI': feed}):
+        runner.run()
+    assert sorted(p.arxiv_id for p in test_db.iter_papers()) == [e.id for e in feed.entries[3:]]
+
+    # The first run closed its own writer; the second opens a new one
+    with fake_feedparser({'cs.AI': synthetic_feed(7, start=start)}):
+        report = runner.run()
+    assert report['stages']['dedupe']['emitted'] == 2
+    assert report['stages']['author']['errors'] == 0
+    assert test_db.get_stats()['author_evaluated'] == 4
+
+def test_scholar_rate_limit_reserves_slots():
+    """Concurrent author workers sharing an evaluator queue up one delay apart"""
+    evaluator = AuthorLineupEvaluator()
+    evaluator._current_delay = 10
+    sleeps = []
+    with mock.patch('time.time', return_value=1000.0), \
+         mock.patch('time.sleep', side_effect=sleeps.append):
+        for _ in range(3):
+            evaluator._enforce_rate_limit()     # nobody has slept yet: no time passes
+    assert sleeps == [10, 20]
+
+def test_joined_author_rows_are_split_once(test_db):
+    """Lineups stored as one "A, B and C" row are split when the database is opened"""
+    import sqlite3
+    test_db.add_or_update_paper({
+        'id': '2401.00002', 'title': 'Old Lineup', 'authors': ['Ada Lovelace, Alan Turing and Grace Hopper'],
+        'abstract': 'Test abstract', 'updated': datetime.utcnow().isoformat()
+    })
+    with sqlite3.connect(test_db.db_path) as conn:
+        conn.execute('PRAGMA user_version = 0')
+
+    PaperDatabase(test_db.db_path)
+    with sqlite3.connect(test_db.db_path) as conn:
+        names = [row[0] for row in conn.execute('SELECT name FROM authors ORDER BY id')]
+    assert names == ['Ada Lovelace', 'Alan Turing', 'Grace Hopper']
+    assert test_db.get_author_stats('Alan Turing') is not None
+
+def test_daemon_counts_failed_feeds_as_errors(tmp_path):
+    """A feed feedparser could not fetch (bozo, no entries) makes the run count for backoff"""
+    from feedparser import FeedParserDict
+    config = PipelineConfig(categories=['cs.AI'], author_eval=False, export_path=None)
+    daemon = PaperDaemon(str(tmp_path / 'papers.db'), config,
+                         status_path=str(tmp_path / 'status.json'))
+    down = FeedParserDict(entries=[], bozo=1, bozo_exception=OSError('connection refused'))
+    with fake_feedparser({'cs.AI': down}):
+        report = daemon.run_once()
+        assert report['stages']['fetch']['errors'] == 1
+        daemon.run_once()
+    assert daemon.status()['consecutive_errors'] == 2
+    assert 'feed' in daemon.status()['last_error']
+
+    with fake_feedparser({'cs.AI': synthetic_feed(2, start=datetime.utcnow() - timedelta(days=1))}):
+        daemon.run_once()
+    assert daemon.status()['consecutive_errors'] == 0
+    assert daemon.status()['runs'] == 3
+    daemon._writer.close()
+
+def test_stats_does_not_import_heavy_dependencies(tmp_path):
+    """Importing main and running --stats leaves pandas, scholarly, openai and feedparser unloaded"""
+    import os, subprocess, sys
+    script = (
+        "import sys, main\n"
+        f"main.main(['--db', {str(tmp_path / 'papers.db')!r}, '--stats'])\n"
+        "print(sorted(m for m in ('pandas', 'scholarly', 'openai', 'feedparser') if m in sys.modules))\n"
+    )
+    root = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONPATH': root}, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert 'total_papers: 0' in result.stdout
+    assert result.stdout.splitlines()[-1] == '[]'
+
+def test_profiler_writes_stage_files(test_db, scholar, tmp_path):
+    """A profiled run writes .pstats, .collapsed and .alloc.txt files; waits are not top functions"""
+    import json, pstats, re
+    from src.utils.profiling import PipelineProfiler
+    profiler = PipelineProfiler(str(tmp_path / 'profile'), sample_interval=0.001)
+    config = PipelineConfig(categories=['cs.AI'], export_path=None, backlog=0)
+    with fake_feedparser({'cs.AI': synthetic_feed(5, start=datetime.utcnow() - timedelta(days=1))}):
+        report = PipelineRunner(test_db, config, profiler=profiler).run()
+
+    summary = report['profile']
+    assert summary == json.loads((tmp_path / 'profile' / 'profile_summary.json').read_text())
+    author = summary['author']
+    pstats.Stats(author['pstats'])
+    assert open(author['allocations']).readline().split()[:2] == ['held', 'at']
+    assert all(summary[stage].get('collapsed', '').endswith('.collapsed')
+               for stage in summary if summary[stage].get('samples'))
+    assert any(stage.get('samples') for stage in summary.values())
+    functions = [f['function'] for stage in summary.values() for f in stage.get('top_functions', [])]
+    blocking = re.compile(r"queue\.py:\d+\((get|put)\)|threading\.py:\d+\((wait|join)\)|"
+                          r"'acquire' of '_thread\.lock'|time\.sleep")
+    assert functions and not any(blocking.search(f) for f in functions)
+
+def test_metrics_files_and_disabled_registry(tmp_path):
+    """Recorded series reach the JSON and Prometheus files; a disabled registry records nothing"""
+    import json
+    from src.utils.metrics import COUNT_BUCKETS, MetricsRegistry
+    registry = MetricsRegistry()
+    assert registry.span('db_operation') is registry.span('other')      # shared no-op
+    registry.inc('scholar_fallbacks')
+    registry.observe('db_group_commit_size', 3, buckets=COUNT_BUCKETS)
+    assert registry.timed('db_operation')(lambda: 42)() == 42
+    assert registry.snapshot()['counters'] == registry.snapshot()['histograms'] == {}
+
+    registry.enable()
+    registry.inc('author_source_hits', source='google_scholar')
+    registry.inc('author_source_hits', 2, source='google_scholar')
+    registry.set_gauge('queue_depth', 7, stage='author')
+    registry.observe('db_group_commit_size', 3, buckets=COUNT_BUCKETS)
+    registry.observe('db_group_commit_size', 40)        # buckets are fixed by the first sample
+    with registry.span('db_operation', op='get_stats'):
+        pass
+    registry.write_files(str(tmp_path / 'metrics.json'), str(tmp_path / 'arxiv.prom'))
+
+    snapshot = json.loads((tmp_path / 'metrics.json').read_text())
+    assert snapshot['counters']['author_source_hits'] == [
+        {'labels': {'source': 'google_scholar'}, 'value': 3}]
+    assert snapshot['gauges']['queue_depth'][0]['labels'] == {'stage': 'author'}
+    commit_sizes = snapshot['histograms']['db_group_commit_size'][0]
+    assert commit_sizes['count'] == 2 and commit_sizes['buckets']['5'] == 1
+    assert commit_sizes['buckets']['50'] == commit_sizes['buckets']['+Inf'] == 2
+    assert snapshot['histograms']['db_operation_seconds'][0]['labels'] == {'op': 'get_stats'}
+
+    prom = (tmp_path / 'arxiv.prom').read_text().splitlines()
+    assert '# TYPE arxiv_author_source_hits_total counter' in prom
+    assert 'arxiv_author_source_hits_total{source="google_scholar"} 3' in prom
+    assert 'arxiv_queue_depth{stage="author"} 7' in prom
+    assert 'arxiv_db_group_commit_size_bucket{le="5"} 1' in prom
+    assert 'arxiv_db_group_commit_size_count 2' in prom
+    assert 'arxiv_db_operation_seconds_bucket{op="get_stats",le="+Inf"} 1' in prom
+    assert not list(tmp_path.glob('*.tmp'))
+
+def test_kept_connections_are_reused_and_reset(tmp_path):
+    """keep_connections reuses open connections; each call still gets a clean one"""
+    import sqlite3
+    db = PaperDatabase(str(tmp_path / 'papers.db'), keep_connections=2)
+    with mock.patch('sqlite3.connect', wraps=sqlite3.connect) as connect:
+        for i in range(5):
+            db.add_or_update_paper({
+                'id': f'2401.0010{i}', 'title': f'Paper {i}', 'authors': ['Ada Lovelace'],
+                'abstract': 'Test abstract', 'updated': datetime.utcnow().isoformat()
+            })
+            assert db.top_papers(1) == []
+            assert db.get_stats()['total_papers'] == i + 1
+    assert connect.call_count == 0      # the connection that created the schema is reused
+
+    with pytest.raises(sqlite3.OperationalError):
+        with db._connection() as conn:
+            conn.execute("UPDATE papers SET title = 'Lost'")
+            conn.execute('SELECT * FROM no_such_table')
+    with db._connection() as conn:
+        assert conn.row_factory is None and not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM papers WHERE title = 'Lost'").fetchone()[0] == 0
+    db.close()
+    assert db._idle == []
+
+def test_author_metrics_cache_is_bounded(scholar):
+    """The evaluator's metrics cache drops least recently used and expired authors"""
+    evaluator = AuthorLineupEvaluator(metrics_cache_size=2, metrics_cache_ttl=60)
+    with mock.patch('time.monotonic', return_value=1000.0) as clock:
+        for name in ('Ada Lovelace', 'Alan Turing', 'Ada Lovelace', 'Grace Hopper'):
+            evaluator.get_author_metrics(name)
+        assert scholar.calls == 3
+        assert list(evaluator._metrics_cache) == ['Ada Lovelace', 'Grace Hopper']
+        evaluator.get_author_metrics('Alan Turing')     # evicted: looked up again
+        assert scholar.calls == 4
+        clock.return_value = 1061.0
+        evaluator.get_author_metrics('Grace Hopper')    # expired
+        assert scholar.calls == 5
+        assert 'Grace Hopper' in evaluator._metrics_cache
+
+def test_proxy_pool_quarantine_reprobe_and_rotation():
+    """Failing endpoints are quarantined with backoff, re-probed once, and traffic follows health"""
+    now = [0.0]
+    activated = []
+    tor = ProxyEndpoint('tor', lambda: 'tor-generator')
+    direct = ProxyEndpoint('direct', lambda: 'direct-generator')
+    pool = ProxyPool([tor, direct], activate=activated.append, failure_threshold=2,
+                     quarantine_base=100, clock=lambda: now[0])
+
+    assert pool.acquire() is tor and activated == ['tor-generator']
+    pool.record_failure(tor, RuntimeError('blocked'))
+    assert pool.acquire() is direct and activated[-1] == 'direct-generator'   # rotation
+    assert tor.quarantined_until == 0             # one failure is tolerated
+    pool.record_success(direct, 0.5)
+    pool.record_failure(tor, RuntimeError('blocked'))   # e.g. a lookup still in flight
+    assert tor.quarantined_until == 100
+    now[0] = 99
+    assert pool.acquire() is direct
+
+    now[0] = 101                                  # quarantine over: a single trial lookup
+    assert pool.acquire() is tor and tor.probing
+    assert activated[-1] == 'tor-generator'       # rebuilt after quarantine
+    pool.record_failure(tor, RuntimeError('still blocked'))
+    assert pool.acquire() is direct
+    now[0] = 101 + 199                            # failed probe doubled the quarantine
+    assert pool.acquire() is direct
+    now[0] = 101 + 201
+    assert pool.acquire() is tor
+    pool.record_success(tor, 2.0)
+    assert pool.acquire() is direct               # healthier and faster
+    assert [p['name'] for p in pool.stats()] == ['direct', 'tor']
+
+    # The evaluator routes both of scholarly's sessions through the chosen generator
+    from src.arxiv import author_lineup_evaluator as module
+    with mock.patch.object(module, 'scholarly', mock.MagicMock()) as fake:
+        AuthorLineupEvaluator._activate_proxy('generator')
+    fake.use_proxy.assert_called_once_with('generator', 'generator')
+def test_semantic_scholar_batch_with_scholar_fallback(test_db):
+    """Authors resolve from one Semantic Scholar batch; only misses hit Google Scholar"""
+    known = {f'oai:arXiv.org:2508.0000{i}v1': [f'Known Author {i}', f'Second Author {i}']
+             for i in range(3)}
+    for arxiv_id, authors in known.items():
+        test_db.add_or_update_paper({'id': arxiv_id, 'title': 'Known', 'authors': authors,
+                                     'abstract': '', 'updated': datetime.utcnow().isoformat()})
+    test_db.add_or_update_paper({'id': 'oai:arXiv.org:2508.09999v2', 'title': 'Unknown',
+                                 'authors': ['Missing Author'], 'abstract': '',
+                                 'updated': datetime.utcnow().isoformat()})
+
+    with FakeSemanticScholarServer(known) as server, \
+            fake_scholar(semantic_scholar=True) as scholar:
+        client = SemanticScholarClient(server.base_url, min_interval=0)
+        evaluator = AuthorLineupEvaluator(semantic_scholar=client)
+        updated, stats = evaluator.batch_evaluate(test_db.get_author_evaluation_queue())
+
+    assert stats['total_evaluated'] == 4
+    assert len(server.requests) == 1
+    assert sorted(server.requests[0]) == ['ARXIV:2508.00000', 'ARXIV:2508.00001',
+                                          'ARXIV:2508.00002', 'ARXIV:2508.09999']
+    assert scholar.calls == 1  # only 'Missing Author'
+    sources = {name: details['source'] for paper in updated
+               for name, details in paper.author_metrics['authors'].items()}
+    assert sources.pop('Missing Author') == 'Google Scholar'
+    assert set(sources.values()) == {'Semantic Scholar'}
+
+def test_pipeline_batches_author_lookups(test_db):
+    """Fresh papers reach the evaluator in batches: one Semantic Scholar request for the run"""
+    start = datetime.utcnow() - timedelta(days=1)
+    known = {paper['id']: paper['authors'] for paper in synthetic_papers(5, start=start)}
+    config = PipelineConfig(categories=['cs.AI'], export_path=None, backlog=0)
+    with FakeSemanticScholarServer(known) as server, \
+            fake_scholar(semantic_scholar=True) as scholar, \
+            fake_feedparser({'cs.AI': synthetic_feed(5, start=start)}):
+        evaluator = AuthorLineupEvaluator(
+            semantic_scholar=SemanticScholarClient(server.base_url, min_interval=0))
+        report = PipelineRunner(test_db, config, evaluator=evaluator).run()
+
+    assert report['stages']['author']['processed'] == 5
+    assert len(server.requests) == 1 and len(server.requests[0]) == 5
+    assert scholar.calls == 0
+    assert test_db.get_stats()['author_evaluated'] == 5
+def test_progressive_lineup_scoring(test_db, scholar):
+    """Failed lookups lower coverage instead of counting as h-index 0, and get refined later"""
+    test_db.add_or_update_paper({'id': 'oai:arXiv.org:2508.00001v1', 'title': 'Partial',
+                                 'authors': ['Good Author', 'Broken Author'], 'abstract': '',
+                                 'updated': datetime.utcnow().isoformat()})
+    search = scholar.search_author
+
+    def flaky(name):
+        if name == 'Broken Author':
+            raise ConnectionError('blocked')
+        return search(name)
+
+    progress = []
+    with mock.patch.object(scholar, 'search_author', flaky), mock.patch('time.sleep'):
+        updated, stats = AuthorLineupEvaluator().batch_evaluate(
+            test_db.get_author_evaluation_queue(), on_progress=progress.append)
+    paper = updated[0]
+    assert progress == []  # nothing was known before the lookups
+    assert paper.author_lineup_score is not None
+    assert paper.author_metrics['coverage'] == 0.5
+    assert paper.author_metrics['authors']['Broken Author']['source'] == 'Fallback'
+    assert paper.author_metrics['authors']['Broken Author']['h_index'] is None
+    assert 'Broken Author' not in paper.author_metrics['author_scores']
+    assert stats['partial'] == 1
+
+    test_db.update_author_evaluation(paper.arxiv_id, paper.author_lineup_score, paper.author_metrics)
+    refine = test_db.get_author_refinement_queue()
+    assert [p.arxiv_id for p in refine] == [paper.arxiv_id]
+
+    calls = scholar.calls
+    refined, _ = AuthorLineupEvaluator().batch_evaluate(refine)
+    assert scholar.calls == calls + 1  # only the missing author is looked up again
+    assert refined[0].author_metrics['coverage'] == 1.0
+    test_db.update_author_evaluation(paper.arxiv_id, refined[0].author_lineup_score,
+                                     refined[0].author_metrics)
+    assert test_db.get_author_refinement_queue() == []
+
+def test_coauthor_graph_estimates_skip_scholar(test_db, scholar):
+    """Authors linked to resolved co-authors are estimated from the graph, not scraped"""
+    def add(arxiv_id, authors):
+        test_db.add_or_update_paper({'id': arxiv_id, 'title': 'T', 'authors': authors,
+                                     'abstract': '', 'updated': datetime.utcnow().isoformat()})
+    add('oai:arXiv.org:2508.00001v1', ['Star Author', 'New Author'])
+    test_db.update_author_evaluation('oai:arXiv.org:2508.00001v1', 0.5, {'authors': {
+        'Star Author': {'h_index': 60, 'source': 'Google Scholar'},
+        'New Author': {'h_index': None, 'source': 'Fallback'}}})
+    add('oai:arXiv.org:2508.00002v1', ['New Author', 'Unlinked Author'])
+
+    graph = CoauthorGraph(test_db.db_path)
+    evaluator = AuthorLineupEvaluator(sources=['coauthor_graph', 'google_scholar'],
+                                      coauthor_graph=graph)
+    updated, _ = evaluator.batch_evaluate(test_db.get_author_evaluation_queue())
+
+    details = updated[0].author_metrics['authors']
+    assert details['New Author']['source'] == 'Coauthor Graph'
+    assert 0 < details['New Author']['h_index'] < 60  # discounted share of the star's h-index
+    assert details['Unlinked Author']['source'] == 'Google Scholar'
+    assert scholar.calls == 1
+    # An estimate is not a resolved author: kept with its confidence, the
+    # lineup stays in the refinement queue and is looked up for real next time
+    assert 0 < details['New Author']['confidence'] <= 1
+    assert updated[0].author_metrics['coverage'] == 0.5
+    updated, _ = evaluator.batch_evaluate(updated)
+    assert updated[0].author_metrics['authors']['New Author']['source'] == 'Google Scholar'
+    assert updated[0].author_metrics['coverage'] == 1.0
+    assert scholar.calls == 2
+
+def test_coauthor_graph_reads_known_metrics_incrementally(test_db):
+    """Propagation re-reads author metrics only for papers written since the last read"""
+    import sqlite3
+    connect = sqlite3.connect
+    statements = []
+
+    def traced(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    def evaluate(h_index):
+        test_db.update_author_evaluation('oai:arXiv.org:2508.00001v1', 0.5, {'authors': {
+            'Star Author': {'h_index': h_index, 'source': 'Google Scholar'},
+            'New Author': {'h_index': None, 'source': 'Fallback'}}})
+
+    for arxiv_id, authors in (('oai:arXiv.org:2508.00001v1', ['Star Author', 'New Author']),
+                              ('oai:arXiv.org:2508.00002v1', ['New Author', 'Other Author'])):
+        test_db.add_or_update_paper({'id': arxiv_id, 'title': 'T', 'authors': authors,
+                                     'abstract': '', 'updated': datetime.utcnow().isoformat()})
+    evaluate(40)
+    graph = CoauthorGraph(test_db.db_path)
+    graph.update()
+    first = graph.estimate('New Author')['h_index']
+
+    with mock.patch('sqlite3.connect', side_effect=traced):
+        graph.propagate()
+        assert not any('JOIN authors' in sql for sql in statements)     # nothing written since
+        evaluate(80)
+        statements.clear()
+        graph.propagate()
+    reads = [sql for sql in statements if 'JOIN authors' in sql]
+    assert len(reads) == 1
+    assert graph.estimate('New Author')['h_index'] > first
+    assert graph.estimate('Other Author') is not None
+
+def test_llm_hedging_and_early_score():
+    """A slow outlier request is hedged, and the streamed score arrives before the end"""
+    paper = {'title': 'T', 'authors': ['A'], 'summary': 'Test abstract'}
+    tracker = assessor.LatencyTracker()
+    for _ in range(tracker.min_samples):
+        tracker.record(assessor.OPENAI_MODEL_ID, 0.05)
+    scores = []
+    with fake_openai(latency=0.05, tail_latency=2, tail_every=2, chunk_latency=0.01) as server, \
+         mock.patch.object(assessor, 'latency', tracker):
+        assessment = assessor.assess_paper_openai(paper, 'optimization', timeout=5, hedge_percentile=95,
+                                                  on_score=lambda score, text: scores.append((score, text)))
+    assert len(server.requests) == 2 and all(r['stream'] for r in server.requests)
+    assert assessor.parse_relevance_score(assessment) == 7.0
+    assert scores == [(7.0, 'Overall relevance: 7/10\n')]
+
+    with fake_openai(chunk_latency=0.5):
+        truncated = assessor.assess_paper_openai(paper, 'optimization', timeout=0.8, hedge_percentile=0)
+    assert truncated.startswith('Overall relevance: 7/10') and 'User interests' not in truncated
+
+def test_cold_tier_archive_round_trip(test_db, tmp_path):
+    """Archived text reads back unchanged through records, lazy loads and exports"""
+    abstract = 'We study large-scale vehicle routing with learned heuristics. ' * 10
+    test_db.add_or_update_paper({'id': 'oai:arXiv.org:2001.00001v1', 'title': 'Old', 'authors': ['A'],
+                                 'abstract': abstract, 'updated': '2020-01-01T00:00:00'})
+    test_db.add_or_update_paper({'id': 'oai:arXiv.org:2508.00001v1', 'title': 'New', 'authors': ['B'],
+                                 'abstract': abstract, 'updated': datetime.utcnow().isoformat()})
+    test_db.update_llm_evaluation('oai:arXiv.org:2001.00001v1', 7.0, 'Overall relevance: 7/10\n' * 20)
+
+    report = test_db.archive_cold_papers(older_than_days=365)
+    assert report['papers'] == 1 and report['values'] == 2
+    assert report['bytes_after'] < report['bytes_before']
+    old = test_db.find_papers({'arxiv_ids': ['oai:arXiv.org:2001.00001v1']})[0]
+    assert old.abstract == abstract and old.llm_explanation.startswith('Overall relevance')
+    lazy = next(test_db.iter_papers({'arxiv_ids': ['oai:arXiv.org:2001.00001v1']}))
+    assert lazy.abstract == abstract
+    export = test_db.export(str(tmp_path / 'papers.csv'))
+    assert export['rows'] == 2 and abstract in (tmp_path / 'papers.csv').read_text()
+
+    # Nothing changed since: the second run finds nothing to examine
+    assert test_db.archive_cold_papers(older_than_days=365)['papers'] == 0
+
+def test_query_service_cache_and_etags(test_db):
+    """Cached answers survive until the database changes; unchanged content revalidates with 304"""
+    import json, urllib.error, urllib.request
+    test_db.add_or_update_paper({'id': 'oai:arXiv.org:2508.00001v1', 'title': 'Vehicle Routing',
+                                 'authors': ['Ada Author'], 'abstract': 'Learned heuristics',
+                                 'updated': datetime.utcnow().isoformat()})
+    test_db.update_llm_evaluation('oai:arXiv.org:2508.00001v1', 8.0, 'Overall relevance: 8/10')
+    service = QueryService(test_db, port=0).start()
+    try:
+        status, etag, body = service.get('/papers/top?k=5')
+        assert status == 200 and json.loads(body)[0]['title'] == 'Vehicle Routing'
+        assert service.get('/papers/top?k=5') == (status, etag, body)
+        assert json.loads(service.get('/papers/search?q=routing+heuristics')[2])[0]['authors'] == ['Ada Author']
+        assert json.loads(service.get('/authors/Ada%20Author')[2])['papers'][0]['arxiv_id'].endswith('2508.00001v1')
+        assert service.get('/papers/2508.00001v1')[0] == 200 and service.get('/nope')[0] == 404
+
+        request = urllib.request.Request(f'http://127.0.0.1:{service.port}/papers/top?k=5',
+                                         headers={'If-None-Match': etag})
+        with pytest.raises(urllib.error.HTTPError) as not_modified:
+            urllib.request.urlopen(request)
+        assert not_modified.value.code == 304
+
+        test_db.update_llm_evaluation('oai:arXiv.org:2508.00001v1', 3.0, 'Overall relevance: 3/10')
+        status, new_etag, body = service.get('/papers/top?k=5')
+        assert new_etag != etag and json.loads(body)[0]['llm_relevance_score'] == 3.0
+
+        # Unexpected failures become a JSON 500 instead of a dropped connection
+        with mock.patch.object(test_db, 'get_stats', side_effect=RuntimeError('disk I/O error')):
+            with pytest.raises(urllib.error.HTTPError) as failed:
+                urllib.request.urlopen(f'http://127.0.0.1:{service.port}/stats')
+        assert failed.value.code == 500 and 'error' in json.loads(failed.value.read())
+        assert service.get('/stats')[0] == 200
+    finally:
+        service.close()